@@ -8,6 +8,7 @@ keeping this file focused on CLI wiring and persona-specific logging.
 from __future__ import annotations
 
 import argparse
+import logging
 import os
 import sys
 
@@ -56,6 +57,8 @@ def _build_agent() -> AgentB:
 
 
 def main() -> None:
+    # Parser progress goes through logging; keep INFO and above on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print_launch_banner("🤖 AGENT B - WEB AUTOMATION AGENT", "Mode: RUNTIME FLEXIBLE")
     agent = _build_agent()
 
@@ -14,7 +14,7 @@ from __future__ import annotations
 
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 
 import sys
 from pathlib import Path
@@ -98,7 +98,8 @@ class AgentBase(ABC):
         self.browser = self.BROWSER_CONTROLLER_CLS()
         self.gemini = GeminiClient(gemini_api_key)
         self.task_parser = TaskParser(gemini_api_key=gemini_api_key)
-        self.action_history: List[Dict] = []
+        # Only the steps Gemini sees are kept; see GeminiClient.make_history_buffer
+        self.action_history: Deque[Dict] = GeminiClient.make_history_buffer()
         self.subgoal_manager: Optional[SubGoalManager] = None
         self.previous_step_state: Optional[Dict] = None
 
@@ -145,7 +146,7 @@ class AgentBase(ABC):
             metadata_base=self.METADATA_BASE
         )
 
-        self.action_history = []
+        self.action_history = GeminiClient.make_history_buffer()
         self.subgoal_manager = SubGoalManager(task_config)
         self.previous_step_state = None
 
@@ -198,7 +199,7 @@ class AgentBase(ABC):
             metadata_base=self.METADATA_BASE
         )
 
-        self.action_history = []
+        self.action_history = GeminiClient.make_history_buffer()
         self.subgoal_manager = SubGoalManager(task_config)
         self.previous_step_state = None
 
@@ -32,7 +32,8 @@ def print_multi_task_header(task_config: Dict, header_title: str, extra_lines: L
     for line in extra_lines:
         print(line)
     print(f"Count: {task_config.get('parameters', {}).get('count', 1)}")
-    print(f"Names: {task_config.get('parameters', {}).get('names', [])}")
+    parameters = task_config.get('parameters', {})
+    print(f"Names: {parameters.get('names') or parameters.get('name_pattern') or []}")
     print("=" * 70 + "\n")
 
 
@@ -133,6 +133,8 @@ def execute_single_step(
         action_history=agent_instance.action_history,
         task_parameters=task_config.get("parameters", {}),
         hint=combined_hint,
+        task_config=task_config,
+        page_title=ui_state.get("title", ""),
     )
 
     enrich_action_details(action, annotation_result["bboxes"])
@@ -8,6 +8,7 @@ browser controller so the user never sees annotation overlays.
 from __future__ import annotations
 
 import argparse
+import logging
 import os
 import sys
 
@@ -60,6 +61,8 @@ def _build_agent() -> CleanAgentB:
 
 
 def main() -> None:
+    # Parser progress goes through logging; keep INFO and above on the console
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print_launch_banner("🤖 CLEAN AGENT B - WEB AUTOMATION AGENT", "Mode: CLEAN UI")
     agent = _build_agent()
 
@@ -16,6 +16,7 @@ import base64
 from typing import Dict, List
 from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
 from task_definitions import get_session_file
+from detector import install_ui_change_tracker
 
 from .utils import (
     add_boxes_to_image,
@@ -128,6 +129,8 @@ class CleanBrowserController:
     
     def _setup_page(self) -> bool:
         """Setup the main page and close extra pages"""
+        install_ui_change_tracker(self.context)
+
         existing_pages = self.context.pages
         if existing_pages:
             self.page = existing_pages[0]
@@ -16,6 +16,7 @@ from typing import Dict, List, Optional, Tuple
 
 from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
 from task_definitions import get_session_file
+from detector import install_ui_change_tracker
 
 
 class BrowserController:
@@ -101,7 +102,9 @@ class BrowserController:
                     storage_state=session_file,
                     viewport={'width': 1920, 'height': 1080}
                 )
-            
+
+            install_ui_change_tracker(self.context)
+
             existing_pages = self.context.pages
             if existing_pages:
                 self.page = existing_pages[0]
@@ -10,10 +10,20 @@ from .detector import (
     ui_state_changed,
     get_page_hash,
     detect_loading_state,
-    get_state_changes
+    get_state_changes,
+    install_ui_change_tracker
 )
 from .modal_detector import detect_modals, detect_dropdowns_open
 from .form_detector import get_form_states, summarise_forms, analyze_form_completion, get_fillable_fields
+from .async_detector import (
+    get_complete_ui_state_async,
+    detect_modals_async,
+    get_form_states_async,
+    summarise_forms_async,
+    detect_dropdowns_open_async,
+    detect_loading_state_async,
+    get_page_hash_async
+)
 
 __all__ = [
     "get_complete_ui_state",
@@ -22,10 +32,18 @@ __all__ = [
     "get_page_hash",
     "detect_loading_state",
     "get_state_changes",
+    "install_ui_change_tracker",
     "detect_modals",
     "detect_dropdowns_open", 
     "get_form_states",
     "summarise_forms",
     "analyze_form_completion",
-    "get_fillable_fields"
+    "get_fillable_fields",
+    "get_complete_ui_state_async",
+    "detect_modals_async",
+    "get_form_states_async",
+    "summarise_forms_async",
+    "detect_dropdowns_open_async",
+    "detect_loading_state_async",
+    "get_page_hash_async"
 ]
\ No newline at end of file
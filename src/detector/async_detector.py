@@ -0,0 +1,135 @@
+"""
+Async UI state detection for playwright.async_api pages.
+
+Mirrors the sync detectors, but the independent probes of a full snapshot
+are awaited together so its wall time is the slowest probe rather than
+the sum of all of them.
+"""
+
+import asyncio
+from playwright.async_api import Page
+from typing import Dict, List
+
+from .detector import _LOADING_INDICATORS_JS, _LOADING_SELECTORS, _PAGE_HASH_JS
+from .form_detector import _CHECKBOX_SELECTOR, _FORM_STATES_JS, _SUMMARISE_CHECKBOXES_JS
+from .modal_detector import (
+    _DETECT_DROPDOWNS_JS,
+    _DETECT_MODALS_JS,
+    _DROPDOWN_SCRIPT_ARG,
+    _MODAL_SCRIPT_ARG,
+    _deduplicate_modals
+)
+
+
+async def detect_modals_async(page: Page) -> List[Dict]:
+    """Async variant of detect_modals"""
+    modals = []
+
+    try:
+        modals = await page.evaluate(_DETECT_MODALS_JS, _MODAL_SCRIPT_ARG)
+    except Exception as e:
+        print(f"Warning: Error detecting modals: {e}")
+
+    return _deduplicate_modals(modals)
+
+
+async def get_form_states_async(page: Page) -> List[Dict]:
+    """Async variant of get_form_states"""
+    try:
+        return await page.evaluate(_FORM_STATES_JS)
+    except Exception as e:
+        print(f"Warning: Error getting form states: {e}")
+        return []
+
+
+async def summarise_forms_async(page: Page) -> Dict:
+    """Async variant of summarise_forms"""
+    summary = {
+        "checkbox_count": 0,
+        "filled_count": 0
+    }
+
+    try:
+        handle = await page.evaluate_handle("selector => document.querySelectorAll(selector)", _CHECKBOX_SELECTOR)
+        try:
+            summary.update(await handle.evaluate(_SUMMARISE_CHECKBOXES_JS))
+        finally:
+            await handle.dispose()
+    except Exception:
+        pass
+
+    return summary
+
+
+async def detect_dropdowns_open_async(page: Page) -> List[Dict]:
+    """Async variant of detect_dropdowns_open"""
+    try:
+        return await page.evaluate(_DETECT_DROPDOWNS_JS, _DROPDOWN_SCRIPT_ARG)
+    except Exception as e:
+        print(f"Warning: Error detecting dropdowns: {e}")
+        return []
+
+
+async def detect_loading_state_async(page: Page) -> Dict:
+    """Async variant of detect_loading_state"""
+    loading = {
+        "state": "idle",
+        "is_loading": False,
+        "indicators": []
+    }
+
+    try:
+        indicators = await page.evaluate(_LOADING_INDICATORS_JS, list(_LOADING_SELECTORS))
+        if indicators:
+            loading["state"] = "active"
+            loading["is_loading"] = True
+            loading["indicators"] = indicators
+    except Exception as e:
+        print(f"Warning: Error detecting loading state: {e}")
+
+    return loading
+
+
+async def get_page_hash_async(page: Page) -> str:
+    """Async variant of get_page_hash"""
+    try:
+        return await page.evaluate(_PAGE_HASH_JS)
+    except Exception:
+        return ""
+
+
+async def get_complete_ui_state_async(
+    page: Page,
+    *,
+    modals: bool = True,
+    forms: bool = True,
+    dropdowns: bool = True,
+    loading: bool = True,
+    page_hash: bool = True
+) -> Dict:
+    """
+    Async variant of get_complete_ui_state
+
+    Args:
+        page: playwright.async_api page object
+        modals, forms, dropdowns, loading, page_hash: Set to False to skip
+            that probe; skipped keys are left out of the result
+
+    Returns:
+        UI state dictionary, same shape as the sync snapshot
+    """
+    probes = {"title": page.title()}
+    if modals:
+        probes["modals"] = detect_modals_async(page)
+    if forms:
+        probes["forms"] = get_form_states_async(page)
+        probes["forms_summary"] = summarise_forms_async(page)
+    if dropdowns:
+        probes["dropdowns"] = detect_dropdowns_open_async(page)
+    if loading:
+        probes["loading"] = detect_loading_state_async(page)
+    if page_hash:
+        probes["page_hash"] = get_page_hash_async(page)
+
+    results = await asyncio.gather(*probes.values())
+    return {"url": page.url, **dict(zip(probes, results))}
@@ -5,13 +5,100 @@ This module provides the main interface for detecting UI states,
 combining modal detection, form analysis, loading states, and page changes.
 """
 
-import hashlib
+import copy
+from collections import OrderedDict
 from playwright.sync_api import Page
-from typing import Dict
+from typing import Dict, Set, Tuple
 
 from .modal_detector import detect_modals, detect_dropdowns_open
 from .form_detector import get_form_states, summarise_forms
 
+UI_STATE_CACHE_SIZE = 32
+
+_LOADING_SELECTORS = (
+    '[class*="loading"]',
+    '[class*="spinner"]',
+    '[aria-busy="true"]',
+    '[class*="skeleton"]',
+    '[data-loading="true"]'
+)
+
+# Selectors with at least one visible match
+_LOADING_INDICATORS_JS = """selectors => selectors.filter(
+    (selector) => Array.from(document.querySelectorAll(selector)).some((el) => {
+        const r = el.getBoundingClientRect();
+        return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    })
+)"""
+
+# Init script: flag the document dirty on any DOM mutation, input, scroll or
+# resize, so an unchanged page can be answered from the last snapshot. The
+# annotation overlay (nodes tagged data-agent-mark by mark_page.js) is added
+# and removed every step and does not count as a change
+UI_CHANGE_TRACKER_SCRIPT = """
+(() => {
+    if (window.__ui_tracker) return;
+    window.__ui_tracker = true;
+    window.__ui_dirty = true;
+    const markDirty = () => { window.__ui_dirty = true; };
+    const isOverlay = (node) => {
+        const el = node && node.nodeType === 1 ? node : node && node.parentElement;
+        return !!(el && el.closest && el.closest('[data-agent-mark]'));
+    };
+    const overlayOnly = (record) => record.type === 'childList'
+        ? [...record.addedNodes, ...record.removedNodes].every(isOverlay)
+        : isOverlay(record.target);
+    new MutationObserver((records) => {
+        if (!records.every(overlayOnly)) markDirty();
+    }).observe(document, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+    for (const type of ['input', 'change', 'scroll', 'resize']) {
+        window.addEventListener(type, markDirty, true);
+    }
+})();
+"""
+
+# Read and clear the dirty flag; pages without the tracker always count as dirty
+_CONSUME_UI_DIRTY_JS = """() => {
+    if (!window.__ui_tracker) return true;
+    const dirty = window.__ui_dirty;
+    window.__ui_dirty = false;
+    return dirty;
+}"""
+
+# describe_ui_state fragments
+_PAGE_TMPL = "Page: {}"
+_MODAL_TITLED_TMPL = "{} opened: '{}'"
+_MODAL_OPEN_TMPL = "{} is open"
+_MODALS_OPEN_TMPL = "{} modals/dialogs open"
+_FILLED_FIELDS_TMPL = "{} form field(s) filled"
+_EMPTY_FIELDS_TMPL = "{} empty form field(s) visible"
+_DROPDOWNS_TMPL = "{} dropdown(s) open"
+
+# id(page) -> (page_hash, snapshot) of the last full detection per page
+_UI_STATE_CACHE: "OrderedDict[int, Tuple[str, Dict]]" = OrderedDict()
+_NAVIGATION_HOOKED: Set[int] = set()
+
+# 64-bit cyrb53-style hash of the page text plus field values and checked
+# states (typing does not change innerText), computed in-page
+_PAGE_HASH_JS = """() => {
+    if (!document.body) return '';
+    let text = document.body.innerText || '';
+    for (const el of document.querySelectorAll('input, textarea, select')) {
+        text += '\\u0000' + (el.value || '') + (el.checked ? '1' : '0');
+    }
+    let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+    for (let i = 0; i < text.length; i++) {
+        const ch = text.charCodeAt(i);
+        h1 = Math.imul(h1 ^ ch, 2654435761);
+        h2 = Math.imul(h2 ^ ch, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    return (h2 >>> 0).toString(16).padStart(8, '0') + (h1 >>> 0).toString(16).padStart(8, '0');
+}"""
+
 
 def detect_loading_state(page: Page) -> Dict:
     """
@@ -30,26 +117,13 @@ def detect_loading_state(page: Page) -> Dict:
     }
     
     try:
-        # Check for common loading indicators
-        loading_selectors = [
-            '[class*="loading"]',
-            '[class*="spinner"]',
-            '[aria-busy="true"]',
-            '[class*="skeleton"]',
-            '[data-loading="true"]'
-        ]
-        
-        for selector in loading_selectors:
-            try:
-                elements = page.query_selector_all(selector)
-                for element in elements:
-                    if element.is_visible():
-                        loading["state"] = "active"
-                        loading["is_loading"] = True
-                        loading["indicators"].append(selector)
-                        break
-            except:
-                continue
+        # Check for common loading indicators; some() stops at the first
+        # visible match per selector, all inside one evaluate
+        indicators = page.evaluate(_LOADING_INDICATORS_JS, list(_LOADING_SELECTORS))
+        if indicators:
+            loading["state"] = "active"
+            loading["is_loading"] = True
+            loading["indicators"] = indicators
                 
     except Exception as e:
         print(f"Warning: Error detecting loading state: {e}")
@@ -68,13 +142,9 @@ def get_page_hash(page: Page) -> str:
         Hash string of page content
     """
     try:
-        # Get page content (text only, no HTML)
-        content = page.evaluate('''() => {
-            return document.body.innerText || '';
-        }''')
-        
-        # Create hash
-        return hashlib.md5(content.encode()).hexdigest()
+        # Hash the page text in the browser and ship back 16 hex chars
+        # instead of the whole innerText
+        return page.evaluate(_PAGE_HASH_JS)
     except:
         return ""
 
@@ -94,27 +164,120 @@ def ui_state_changed(page: Page, previous_hash: str) -> bool:
     return current_hash != previous_hash
 
 
-def get_complete_ui_state(page: Page) -> Dict:
+def get_complete_ui_state(
+    page: Page,
+    *,
+    modals: bool = True,
+    forms: bool = True,
+    dropdowns: bool = True,
+    loading: bool = True,
+    page_hash: bool = True
+) -> Dict:
     """
     Get complete UI state snapshot
     Combines all detection methods into one comprehensive state
+
+    With the change tracker installed, an untouched page is answered from
+    the last snapshot without probing. Otherwise the page hash is taken
+    first; if it matches the last snapshot of this page, the cached
+    modal/form/dropdown results are reused and only the URL and loading
+    state are refreshed.
     
     Args:
         page: Playwright page object
+        modals, forms, dropdowns, loading, page_hash: Set to False to skip
+            that probe (forms also covers forms_summary); skipped keys are
+            left out of the result
         
     Returns:
-        Complete UI state dictionary
+        UI state dictionary with the requested fields
     """
-    return {
+    wanted = {
+        "modals": modals,
+        "forms": forms,
+        "forms_summary": forms,
+        "dropdowns": dropdowns,
+        "loading": loading,
+        "page_hash": page_hash
+    }
+    key = id(page)
+    cached = _UI_STATE_CACHE.get(key)
+    dirty = _consume_ui_dirty_flag(page)
+
+    # Nothing touched the DOM since the last snapshot: skip every probe
+    if cached and not dirty:
+        _UI_STATE_CACHE.move_to_end(key)
+        ui_state = {
+            field: copy.deepcopy(value)
+            for field, value in cached[1].items()
+            if wanted.get(field, True)
+        }
+        ui_state["url"] = page.url
+        return ui_state
+
+    current_hash = get_page_hash(page) if page_hash else ""
+    if current_hash and cached and cached[0] == current_hash:
+        _UI_STATE_CACHE.move_to_end(key)
+        ui_state = {
+            field: copy.deepcopy(value)
+            for field, value in cached[1].items()
+            if wanted.get(field, True)
+        }
+        ui_state["url"] = page.url
+        if loading:
+            ui_state["loading"] = detect_loading_state(page)
+        return ui_state
+
+    ui_state = {
         "url": page.url,
-        "title": page.title() if hasattr(page, 'title') else "",
-        "modals": detect_modals(page),
-        "forms": get_form_states(page),
-        "forms_summary": summarise_forms(page),
-        "dropdowns": detect_dropdowns_open(page),
-        "loading": detect_loading_state(page),
-        "page_hash": get_page_hash(page)
+        "title": page.title() if hasattr(page, 'title') else ""
     }
+    if modals:
+        ui_state["modals"] = detect_modals(page)
+    if forms:
+        ui_state["forms"] = get_form_states(page)
+        ui_state["forms_summary"] = summarise_forms(page)
+    if dropdowns:
+        ui_state["dropdowns"] = detect_dropdowns_open(page)
+    if loading:
+        ui_state["loading"] = detect_loading_state(page)
+    if page_hash:
+        ui_state["page_hash"] = current_hash
+
+    # Only full snapshots can answer later partial requests. The dirty flag
+    # was consumed above, so a snapshot that isn't re-cached must not be
+    # served again as if nothing had changed
+    if current_hash and all(wanted.values()):
+        _remember_ui_state(page, current_hash, ui_state)
+    else:
+        _UI_STATE_CACHE.pop(key, None)
+    return ui_state
+
+
+def install_ui_change_tracker(context) -> None:
+    """Register the DOM change tracker on a browser context's future pages"""
+    context.add_init_script(UI_CHANGE_TRACKER_SCRIPT)
+
+
+def _consume_ui_dirty_flag(page: Page) -> bool:
+    """Return whether the page changed since the last call, clearing the flag"""
+    try:
+        return page.evaluate(_CONSUME_UI_DIRTY_JS) is not False
+    except Exception:
+        return True
+
+
+def _remember_ui_state(page: Page, page_hash: str, ui_state: Dict) -> None:
+    """Cache a snapshot, dropping it again as soon as the page navigates"""
+    key = id(page)
+    if key not in _NAVIGATION_HOOKED:
+        page.on("framenavigated", lambda _frame: _UI_STATE_CACHE.pop(key, None))
+        _NAVIGATION_HOOKED.add(key)
+
+    _UI_STATE_CACHE[key] = (page_hash, copy.deepcopy(ui_state))
+    _UI_STATE_CACHE.move_to_end(key)
+    while len(_UI_STATE_CACHE) > UI_STATE_CACHE_SIZE:
+        _UI_STATE_CACHE.popitem(last=False)
 
 
 def describe_ui_state(ui_state: Dict) -> str:
@@ -127,44 +290,39 @@ def describe_ui_state(ui_state: Dict) -> str:
     Returns:
         Human-readable description string
     """
-    descriptions = []
-    
-    # URL
-    descriptions.append(f"Page: {ui_state['url']}")
+    descriptions = [_PAGE_TMPL.format(ui_state['url'])]
     
     # Modals
-    if ui_state['modals']:
-        modal_count = len(ui_state['modals'])
-        if modal_count == 1:
-            modal_type = ui_state['modals'][0].get('type', 'modal')
-            modal_title = ui_state['modals'][0].get('title', '')
-            if modal_title:
-                descriptions.append(f"{modal_type.title()} opened: '{modal_title}'")
-            else:
-                descriptions.append(f"{modal_type.title()} is open")
+    detected_modals = ui_state.get('modals') or []
+    if len(detected_modals) == 1:
+        modal = detected_modals[0]
+        modal_type = modal.get('type', 'modal').title()
+        modal_title = modal.get('title', '')
+        if modal_title:
+            descriptions.append(_MODAL_TITLED_TMPL.format(modal_type, modal_title))
         else:
-            descriptions.append(f"{modal_count} modals/dialogs open")
+            descriptions.append(_MODAL_OPEN_TMPL.format(modal_type))
+    elif detected_modals:
+        descriptions.append(_MODALS_OPEN_TMPL.format(len(detected_modals)))
     
     # Forms
-    filled_forms = [f for f in ui_state['forms'] if f['filled']]
-    empty_forms = [f for f in ui_state['forms'] if not f['filled']]
+    form_fields = ui_state.get('forms') or []
+    filled_count = sum(1 for f in form_fields if f['filled'])
+    empty_count = len(form_fields) - filled_count
     
-    if filled_forms:
-        descriptions.append(f"{len(filled_forms)} form field(s) filled")
-    if empty_forms:
-        descriptions.append(f"{len(empty_forms)} empty form field(s) visible")
+    if filled_count:
+        descriptions.append(_FILLED_FIELDS_TMPL.format(filled_count))
+    if empty_count:
+        descriptions.append(_EMPTY_FIELDS_TMPL.format(empty_count))
     
     # Dropdowns
-    if ui_state['dropdowns']:
-        descriptions.append(f"{len(ui_state['dropdowns'])} dropdown(s) open")
+    if ui_state.get('dropdowns'):
+        descriptions.append(_DROPDOWNS_TMPL.format(len(ui_state['dropdowns'])))
     
     # Loading
-    if ui_state['loading']['is_loading']:
+    if ui_state.get('loading', {}).get('is_loading'):
         descriptions.append("Page is loading...")
     
-    if not descriptions:
-        descriptions.append("Standard page view")
-    
     return " | ".join(descriptions)
 
 
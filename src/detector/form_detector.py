@@ -9,6 +9,48 @@ from playwright.sync_api import Page
 from typing import List, Dict
 
 
+_CHECKBOX_SELECTOR = 'input[type="checkbox"]'
+
+# {checkbox_count, filled_count} for a NodeList of checkboxes
+_SUMMARISE_CHECKBOXES_JS = """nodes => {
+    let filled = 0;
+    for (const node of nodes) if (node.checked) filled++;
+    return {checkbox_count: nodes.length, filled_count: filled};
+}"""
+
+# Every visible field's attributes, value and label in one in-page pass
+# rather than ~8 CDP round-trips per field
+_FORM_STATES_JS = """() => {
+    const fields = [];
+    for (const el of document.querySelectorAll('input, textarea, select')) {
+        const r = el.getBoundingClientRect();
+        if (!r.width || !r.height || getComputedStyle(el).visibility === 'hidden') continue;
+
+        const inputType = el.getAttribute('type') || 'text';
+        if (inputType === 'hidden') continue;
+
+        const id = el.getAttribute('id') || '';
+        const value = el.value || '';
+        const field = {
+            type: el.tagName.toLowerCase(),
+            input_type: inputType,
+            name: el.getAttribute('name') || '',
+            placeholder: el.getAttribute('placeholder') || '',
+            id,
+            aria_label: el.getAttribute('aria-label') || '',
+            value: value.slice(0, 200),
+            filled: value.length > 0
+        };
+        field.state = field.filled ? 'filled' : 'empty';
+
+        const label = id && document.querySelector('label[for="' + CSS.escape(id) + '"]');
+        if (label) field.label = (label.textContent || '').slice(0, 100);
+        fields.push(field);
+    }
+    return fields;
+}"""
+
+
 def get_form_states(page: Page) -> List[Dict]:
     """
     Get all form fields and their current values
@@ -22,79 +64,13 @@ def get_form_states(page: Page) -> List[Dict]:
     form_fields = []
     
     try:
-        # Find all visible input elements
-        inputs = page.query_selector_all('input, textarea, select')
-        
-        for input_element in inputs:
-            try:
-                # Skip if not visible or hidden
-                if not input_element.is_visible():
-                    continue
-                
-                input_type = input_element.get_attribute('type') or 'text'
-                if input_type == 'hidden':
-                    continue
-                
-                # Get field properties
-                field_info = _extract_field_info(input_element, input_type)
-                
-                # Get current value and determine if filled
-                _set_field_value_and_state(input_element, field_info)
-                
-                # Try to find associated label
-                _set_field_label(page, field_info)
-                
-                form_fields.append(field_info)
-                
-            except Exception:
-                continue
-                
+        form_fields = page.evaluate(_FORM_STATES_JS)
     except Exception as e:
         print(f"Warning: Error getting form states: {e}")
     
     return form_fields
 
 
-def _extract_field_info(input_element, input_type: str) -> Dict:
-    """Extract basic field information"""
-    return {
-        "type": input_element.evaluate('el => el.tagName.toLowerCase()'),
-        "input_type": input_type,
-        "name": input_element.get_attribute('name') or '',
-        "placeholder": input_element.get_attribute('placeholder') or '',
-        "id": input_element.get_attribute('id') or '',
-        "aria_label": input_element.get_attribute('aria-label') or '',
-        "value": "",
-        "filled": False
-    }
-
-
-def _set_field_value_and_state(input_element, field_info: Dict) -> None:
-    """Set field value and filled state"""
-    try:
-        if field_info["type"] == "select":
-            value = input_element.input_value() or ""
-        else:
-            value = input_element.input_value() or ""
-        
-        field_info["value"] = value[:200]  # Limit length
-        field_info["filled"] = len(value) > 0
-        field_info["state"] = "filled" if field_info["filled"] else "empty"
-    except Exception:
-        field_info["state"] = "empty"
-
-
-def _set_field_label(page: Page, field_info: Dict) -> None:
-    """Try to find and set associated label"""
-    try:
-        if field_info["id"]:
-            label = page.query_selector(f'label[for="{field_info["id"]}"]')
-            if label:
-                field_info["label"] = (label.text_content() or "")[:100]
-    except Exception:
-        pass
-
-
 def summarise_forms(page: Page) -> Dict:
     """Build lightweight summary statistics for form controls."""
     summary = {
@@ -103,22 +79,13 @@ def summarise_forms(page: Page) -> Dict:
     }
 
     try:
-        checkboxes = page.query_selector_all('input[type="checkbox"]')
-        summary["checkbox_count"] = len(checkboxes)
-
-        filled = 0
-        for checkbox in checkboxes:
-            try:
-                if checkbox.is_checked():
-                    filled += 1
-            except Exception:
-                try:
-                    if checkbox.evaluate("el => !!el.checked"):
-                        filled += 1
-                except Exception:
-                    continue
-
-        summary["filled_count"] = filled
+        # One JSHandle for the node list; a single evaluate marshals the
+        # counts back instead of one ElementHandle per checkbox
+        handle = page.evaluate_handle("selector => document.querySelectorAll(selector)", _CHECKBOX_SELECTOR)
+        try:
+            summary.update(handle.evaluate(_SUMMARISE_CHECKBOXES_JS))
+        finally:
+            handle.dispose()
     except Exception:
         pass
 
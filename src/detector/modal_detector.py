@@ -9,6 +9,124 @@ from playwright.sync_api import Page
 from typing import List, Dict
 
 
+# Selectors, frozen once at import and shared with the async detectors
+_DIALOG_SELECTOR = '[role="dialog"]'
+_MODAL_SELECTORS = (
+    '[class*="modal"][class*="open"]',
+    '[class*="Modal"][class*="visible"]',
+    '[data-state="open"]',
+    '[aria-modal="true"]'
+)
+_OVERLAY_SELECTOR = '[class*="overlay"], [class*="backdrop"]'
+_COMBINED_MODAL_SELECTOR = ", ".join((_DIALOG_SELECTOR, *_MODAL_SELECTORS, _OVERLAY_SELECTOR))
+_DROPDOWN_EXPANDED_SELECTOR = '[aria-expanded="true"]'
+_DROPDOWN_LIST_SELECTOR = '[role="listbox"], [role="menu"]'
+
+# Argument for _DETECT_MODALS_JS
+_MODAL_SCRIPT_ARG = {
+    "dialogSelector": _DIALOG_SELECTOR,
+    "modalSelectors": list(_MODAL_SELECTORS),
+    "overlaySelector": _OVERLAY_SELECTOR,
+    "combined": _COMBINED_MODAL_SELECTOR
+}
+
+_DROPDOWN_SCRIPT_ARG = {
+    "expandedSelector": _DROPDOWN_EXPANDED_SELECTOR,
+    "listSelector": _DROPDOWN_LIST_SELECTOR
+}
+
+# Visible expanded controls, then visible listboxes/menus, in one evaluate
+_DETECT_DROPDOWNS_JS = """({expandedSelector, listSelector}) => {
+    const visible = (el) => {
+        const r = el.getBoundingClientRect();
+        return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const dropdowns = [];
+    for (const el of document.querySelectorAll(expandedSelector)) {
+        if (!visible(el)) continue;
+        dropdowns.push({
+            type: 'expanded',
+            aria_label: el.getAttribute('aria-label') || '',
+            visible: true,
+            state: 'visible'
+        });
+    }
+    for (const el of document.querySelectorAll(listSelector)) {
+        if (visible(el)) dropdowns.push({type: 'listbox', visible: true, state: 'visible'});
+    }
+    return dropdowns;
+}"""
+
+# Dialogs, class-pattern modals and the backdrop overlay in one in-page pass,
+# so a probe costs a single CDP round-trip instead of one per element. One
+# combined querySelectorAll walks the DOM once; el.matches() classifies hits.
+_DETECT_MODALS_JS = """({dialogSelector, modalSelectors, overlaySelector, combined}) => {
+    const visibleBox = (el) => {
+        const r = el.getBoundingClientRect();
+        if (!r.width || !r.height || getComputedStyle(el).visibility === 'hidden') return null;
+        return {x: r.x, y: r.y, width: r.width, height: r.height};
+    };
+    const usable = (bbox) => bbox && bbox.width >= 10 && bbox.height >= 10;
+    // Stable per-element id, so Python dedups on identity, not geometry
+    const elementId = (el) => {
+        if (el.__modalId === undefined) {
+            window.__modalCounter = (window.__modalCounter || 0) + 1;
+            el.__modalId = window.__modalCounter;
+        }
+        return el.__modalId;
+    };
+
+    const modals = [];
+    let modal = null;      // earliest-priority class pattern with a usable match
+    let overlay;           // first overlay/backdrop element in document order
+
+    for (const el of document.querySelectorAll(combined)) {
+        if (overlay === undefined && el.matches(overlaySelector)) overlay = el;
+
+        const isDialog = el.matches(dialogSelector);
+        const index = modalSelectors.findIndex((selector) => el.matches(selector));
+        const wantsModal = index !== -1 && (!modal || index < modal.index);
+        if (!isDialog && !wantsModal) continue;
+
+        const bbox = visibleBox(el);
+        if (!usable(bbox)) continue;
+
+        if (isDialog) {
+            const heading = el.querySelector('h1, h2, h3, [class*="title"], [class*="heading"]');
+            modals.push({
+                type: 'dialog',
+                title: ((heading && heading.textContent) || '').trim().slice(0, 100),
+                visible: true,
+                state: 'visible',
+                bbox,
+                element_id: elementId(el)
+            });
+        }
+        if (wantsModal) modal = {index, bbox, element_id: elementId(el)};
+    }
+
+    if (modal) {
+        modals.push({
+            type: 'modal',
+            selector: modalSelectors[modal.index],
+            visible: true,
+            state: 'visible',
+            bbox: modal.bbox,
+            element_id: modal.element_id
+        });
+    }
+
+    // Backdrop overlay, only when nothing else was detected
+    if (!modals.length && overlay) {
+        const bbox = visibleBox(overlay);
+        if (usable(bbox)) {
+            modals.push({type: 'overlay', visible: true, state: 'visible', bbox, element_id: elementId(overlay)});
+        }
+    }
+    return modals;
+}"""
+
+
 def detect_modals(page: Page) -> List[Dict]:
     """
     Detect if any modal/dialog is currently open on the page
@@ -22,15 +140,7 @@ def detect_modals(page: Page) -> List[Dict]:
     modals = []
     
     try:
-        # Check for ARIA role="dialog"
-        modals.extend(_detect_aria_dialogs(page))
-        
-        # Check for common modal class patterns
-        modals.extend(_detect_modal_classes(page))
-        
-        # Check for overlay (backdrop)
-        modals.extend(_detect_overlays(page, modals))
-            
+        modals = page.evaluate(_DETECT_MODALS_JS, _MODAL_SCRIPT_ARG)
     except Exception as e:
         print(f"Warning: Error detecting modals: {e}")
     
@@ -38,157 +148,19 @@ def detect_modals(page: Page) -> List[Dict]:
     return _deduplicate_modals(modals)
 
 
-def _detect_aria_dialogs(page: Page) -> List[Dict]:
-    """Detect modals with ARIA role='dialog'"""
-    modals = []
-    
-    try:
-        dialogs = page.query_selector_all('[role="dialog"]')
-        for dialog in dialogs:
-            try:
-                if not dialog.is_visible():
-                    continue
-                    
-                bbox = _get_element_bbox(dialog)
-                if not _is_valid_bbox(bbox):
-                    continue
-                    
-                # Try to get modal title
-                title = _extract_modal_title(dialog)
-
-                modals.append({
-                    "type": "dialog",
-                    "title": title.strip()[:100],
-                    "visible": True,
-                    "state": "visible",
-                    "bbox": bbox
-                })
-            except Exception:
-                continue
-    except Exception:
-        pass
-        
-    return modals
-
-
-def _detect_modal_classes(page: Page) -> List[Dict]:
-    """Detect modals using common CSS class patterns"""
-    modals = []
-    
-    modal_selectors = [
-        '[class*="modal"][class*="open"]',
-        '[class*="Modal"][class*="visible"]',
-        '[data-state="open"]',
-        '[aria-modal="true"]'
-    ]
-    
-    for selector in modal_selectors:
-        try:
-            elements = page.query_selector_all(selector)
-            for element in elements:
-                if element.is_visible():
-                    bbox = _get_element_bbox(element)
-                    if not _is_valid_bbox(bbox):
-                        continue
-                        
-                    # Avoid duplicates
-                    if not any(m.get("type") == "modal" for m in modals):
-                        modals.append({
-                            "type": "modal",
-                            "selector": selector,
-                            "visible": True,
-                            "state": "visible",
-                            "bbox": bbox
-                        })
-                    break
-        except:
-            continue
-            
-    return modals
-
-
-def _detect_overlays(page: Page, existing_modals: List[Dict]) -> List[Dict]:
-    """Detect backdrop overlays"""
-    modals = []
-    
-    try:
-        overlay = page.query_selector('[class*="overlay"], [class*="backdrop"]')
-        if overlay and overlay.is_visible():
-            bbox = _get_element_bbox(overlay)
-            if (
-                bbox
-                and _is_valid_bbox(bbox)
-                and not existing_modals  # Only add if no other modals detected
-            ):
-                modals.append({
-                    "type": "overlay",
-                    "visible": True,
-                    "state": "visible",
-                    "bbox": bbox
-                })
-    except:
-        pass
-        
-    return modals
-
-
-def _get_element_bbox(element):
-    """Safely get element bounding box"""
-    try:
-        return element.bounding_box()
-    except Exception:
-        return None
-
-
-def _is_valid_bbox(bbox) -> bool:
-    """Check if bounding box is valid (not too small)"""
-    if not bbox:
-        return False
-    return bbox.get("width", 0) >= 10 and bbox.get("height", 0) >= 10
-
-
-def _extract_modal_title(dialog_element) -> str:
-    """Extract title from a dialog element"""
-    title = ""
-    try:
-        title_element = dialog_element.query_selector('h1, h2, h3, [class*="title"], [class*="heading"]')
-        if title_element:
-            title = title_element.text_content() or ""
-    except Exception:
-        pass
-    return title
-
-
 def _deduplicate_modals(modals: List[Dict]) -> List[Dict]:
-    """Remove duplicate modals based on position and properties"""
+    """Remove entries reported more than once for the same DOM element"""
     if not modals:
         return modals
 
     deduped = []
     seen = set()
-    
-    for modal in modals:
-        bbox = modal.get("bbox") or {}
-        key = None
-        
-        if bbox:
-            key = (
-                round(bbox.get("x", 0), 1),
-                round(bbox.get("y", 0), 1),
-                round(bbox.get("width", 0), 1),
-                round(bbox.get("height", 0), 1),
-            )
-        else:
-            key = modal.get("selector") or modal.get("title") or modal.get("type")
 
+    for modal in modals:
+        key = modal.get("element_id")
         if key in seen:
             continue
         seen.add(key)
-
-        # Skip when width is extremely small (likely invisible artifact)
-        if bbox and (bbox.get("width", 0) < 10 or bbox.get("height", 0) < 10):
-            continue
-
         deduped.append(modal)
 
     return deduped
@@ -207,29 +179,8 @@ def detect_dropdowns_open(page: Page) -> List[Dict]:
     dropdowns = []
     
     try:
-        # Check for ARIA expanded attributes
-        expanded_elements = page.query_selector_all('[aria-expanded="true"]')
-        
-        for element in expanded_elements:
-            if element.is_visible():
-                dropdowns.append({
-                    "type": "expanded",
-                    "aria_label": element.get_attribute('aria-label') or '',
-                    "visible": True,
-                    "state": "visible"
-                })
-        
-        # Check for role="listbox" or role="menu"
-        listboxes = page.query_selector_all('[role="listbox"], [role="menu"]')
-        for listbox in listboxes:
-            if listbox.is_visible():
-                dropdowns.append({
-                    "type": "listbox",
-                    "visible": True,
-                    "state": "visible"
-                })
-                
+        dropdowns = page.evaluate(_DETECT_DROPDOWNS_JS, _DROPDOWN_SCRIPT_ARG)
     except Exception as e:
         print(f"Warning: Error detecting dropdowns: {e}")
     
-    return dropdowns
\ No newline at end of file
+    return dropdowns
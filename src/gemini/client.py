@@ -8,26 +8,64 @@ Handles all AI-related operations:
 - Task completion validation
 """
 
-from typing import Dict, List, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
 import base64
+import copy
+import io
 import re
-
-import google.generativeai as genai
+import sys
 
 from .config import (
     GEMINI_MODEL_NAME,
     MAX_ELEMENTS_FOR_CONTEXT,
     MAX_TEXT_LENGTH,
+    MAX_ELEMENT_TEXT_LENGTH,
     MAX_ARIA_LENGTH, 
     MAX_HREF_LENGTH,
     MAX_OBSERVATION_LENGTH,
     MAX_HISTORY_STEPS,
-    PROMPT_TEMPLATE,
-    TASK_GUIDANCE_TEMPLATES
+    STATIC_PROMPT_HEADER,
+    DYNAMIC_PROMPT_TEMPLATE,
+    SCREENSHOT_OMITTED_NOTE,
+    TASK_GUIDANCE_TEMPLATES,
+    SUBMIT_KEYWORDS,
+    CANCEL_KEYWORDS
 )
 from .retry_logic import handle_gemini_error, log_early_finish_attempt
-from .validation import validate_task_completion
+from .validation import validate_task_completion, completion_evident
 from .parsing import parse_action_response
+from .fingerprint import compute_state_hash, compute_action_cache_key
+from .ranking import select_elements, warm_up as warm_up_ranking
+
+# API key genai was last configured with; configure() is process-wide
+_configured_api_key: Optional[str] = None
+
+# Number of parsed Gemini responses remembered per client
+ACTION_CACHE_SIZE = 64
+
+# Extracts the typed text or clicked label from an observation in one scan
+_OBS_RE = re.compile(r"Typed[^']*'([^']*)|Clicked[^:]*: (.*)")
+
+# Whole-word submit/cancel matches against the clicked element's label
+_SUBMIT_LABEL_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, SUBMIT_KEYWORDS)) + r")\b", re.IGNORECASE)
+_CANCEL_LABEL_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, CANCEL_KEYWORDS)) + r")\b", re.IGNORECASE)
+
+# Clicking these again undoes the first click, so they are never replayed
+TOGGLE_ROLES = frozenset({"checkbox", "switch", "radio", "menuitemcheckbox", "menuitemradio"})
+TOGGLE_TAGS = frozenset({"input", "select", "summary"})
+_TOGGLE_LABEL_RE = re.compile(r"\b(?:toggle|expand|collapse|show|hide)\b", re.IGNORECASE)
+
+
+
+@lru_cache(maxsize=2048)
+def _truncate(value: str, length: int) -> str:
+    """Memoized slice; labels repeat across consecutive steps on a page"""
+    return value[:length]
 
 
 class GeminiClient:
@@ -42,8 +80,35 @@ class GeminiClient:
         Args:
             api_key: Gemini API key
         """
-        genai.configure(api_key=api_key)
+        global _configured_api_key
+
+        # Imported here: the SDK pulls in grpc/protobuf, which callers that
+        # only import this module should not pay for
+        import google.generativeai as genai
+
+        self._genai = genai
+        if _configured_api_key != api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
         self.model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+        # Page state seen on the previous call, used to skip redundant requests
+        self._previous_url = ""
+        self._bbox_signature = None
+        self._unchanged_steps = 0
+        self._skipped_wait = False
+        self._last_state_hash = None
+        self._last_action: Optional[Dict] = None
+        self._state_hits = 0
+        self._force_query = False
+        self._action_cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._parameters_cache: Optional[Tuple[List, str]] = None
+
+        # Prompt building and screenshot decoding run side by side each step
+        self._pool = ThreadPoolExecutor(max_workers=2)
+
+        # Compile the element ranking kernel now rather than on the first step
+        warm_up_ranking()
         print("✅ Gemini client initialized")
         print(f"   Model: {GEMINI_MODEL_NAME}")
     
@@ -53,34 +118,95 @@ class GeminiClient:
         screenshot_b64: str,
         bboxes: List[Dict],
         current_url: str,
-        action_history: List[Dict],
+        action_history: Sequence[Dict],
         task_parameters: Dict = None,
-        hint: Dict = None
+        hint: Dict = None,
+        task_config: Dict = None,
+        page_title: str = ""
     ) -> Dict:
         """
         Ask Gemini to decide the next action
+
+        Steps whose outcome is already structurally evident are answered
+        without a model call: a finish when the last submit click landed on a
+        page matching the task's completion pattern, and a repeated wait when
+        the element list has not changed since Gemini last asked to wait.
         
         Args:
             goal: Task goal description
             screenshot_b64: Base64 encoded screenshot with annotations
             bboxes: List of annotated elements from mark_page.js
             current_url: Current page URL
-            action_history: Previous actions taken
+            action_history: Previous actions taken; pass the bounded deque
+                from make_history_buffer so old steps are not retained
             task_parameters: Extracted parameters from query (e.g., project_name)
             hint: Context hint from subgoal manager
+            task_config: Task configuration, enables deterministic finish detection
+            page_title: Current page title, used with task_config
             
         Returns:
             Structured action dictionary
         """
+        previous_url = self._previous_url
+        self._previous_url = current_url
+        self._track_bbox_changes(bboxes)
+        state_hash = compute_state_hash(screenshot_b64, bboxes)
+
+        if task_config and self._deterministic_finish_ok(
+            task_config, current_url, page_title, action_history, previous_url
+        ):
+            print("⚡ Completion evident from page state - skipping Gemini call")
+            return self._remember_action(state_hash, {
+                "action": "finish",
+                "reasoning": "Deterministic completion",
+                "summary": "Task detected complete"
+            })
+
+        # A wait was just forced on a repeated state: Gemini gets this step
+        force_query = self._force_query
+        self._force_query = False
+
+        if not force_query and self._should_repeat_wait(action_history):
+            print("⚡ Page unchanged since last wait - skipping Gemini call")
+            self._skipped_wait = True
+            # Synthesized waits are never replayed, so don't keep them as the last action
+            self._remember_action(state_hash, None)
+            return {
+                "action": "wait",
+                "reasoning": "Page unchanged since the previous wait"
+            }
+        self._skipped_wait = False
+
+        if not force_query:
+            cached_action = self._reuse_action_for_state(state_hash, bboxes)
+            if cached_action:
+                return cached_action
+
+        # A type action mutates the page in ways the element list may not show
+        cache_key = None
+        if not action_history or action_history[-1].get("action") != "type":
+            cache_key = compute_action_cache_key(
+                goal, current_url, bboxes, action_history, MAX_HISTORY_STEPS, hint
+            )
+            if not force_query and cache_key in self._action_cache:
+                self._action_cache.move_to_end(cache_key)
+                print("⚡ Response cache hit - reusing Gemini action")
+                return self._remember_action(state_hash, self._action_cache[cache_key])
+
         try:
             # Format element list for Gemini with better context
-            elements_text = self._format_elements(bboxes)
+            elements_text = self._format_elements(bboxes, current_url)
 
             # Format action history
             history_text = self._format_history(action_history)
 
-            # Build comprehensive prompt
-            prompt = self._build_prompt(
+            # The screenshot adds nothing Gemini has not seen when the element
+            # list is identical to the previous step's, so send text only
+            include_image = self._unchanged_steps == 0
+
+            # Build the prompt while the screenshot is decoded
+            fut_prompt = self._pool.submit(
+                self._build_prompt,
                 goal,
                 current_url,
                 elements_text,
@@ -88,20 +214,20 @@ class GeminiClient:
                 task_parameters,
                 hint
             )
+            fut_img = self._pool.submit(self._prepare_image, screenshot_b64) if include_image else None
+            prompt = fut_prompt.result()
 
-            # Decode the screenshot into raw bytes for Gemini vision input
-            screenshot_bytes = base64.b64decode(screenshot_b64) if screenshot_b64 else b""
+            if include_image:
+                screenshot_bytes, mime_type = fut_img.result()
+                contents = [prompt, {"mime_type": mime_type, "data": screenshot_bytes}]
+            else:
+                print("⚡ Elements unchanged - sending prompt without screenshot")
+                contents = [prompt + SCREENSHOT_OMITTED_NOTE]
 
-            # Call Gemini with vision
-            response = self.model.generate_content([
-                prompt,
-                {
-                    "mime_type": "image/png",
-                    "data": screenshot_bytes
-                }
-            ])
+            # Call Gemini, streaming so we can stop at the ACTION line
+            response = self.model.generate_content(contents, stream=True)
 
-            response_text = response.text.strip()
+            response_text = self._read_action_text(response)
             
             # Parse and return structured action
             parsed_action = parse_action_response(response_text)
@@ -109,54 +235,223 @@ class GeminiClient:
             if parsed_action.get('action') == 'finish':
                 log_early_finish_attempt(response_text, current_url, action_history)
 
-            return parsed_action
+            if cache_key:
+                self._action_cache[cache_key] = parsed_action
+                if len(self._action_cache) > ACTION_CACHE_SIZE:
+                    self._action_cache.popitem(last=False)
+            self._state_hits = 0
+            return self._remember_action(state_hash, parsed_action)
             
         except Exception as e:
+            # An error fallback is not Gemini's answer for this state
+            self._remember_action(state_hash, None)
             return handle_gemini_error(e)
     
-    def _format_elements(self, bboxes: List[Dict]) -> str:
-        """Format element list for Gemini with enhanced context"""
+    @staticmethod
+    def _read_action_text(response) -> str:
+        """
+        Accumulate streamed chunks until a complete ACTION line arrives
+
+        Anything after that line is never used, so the rest of the stream is
+        abandoned and the connection is released when the iterator is dropped.
+        """
+        buffer = ""
+        for chunk in response:
+            buffer += chunk.text
+            marker = buffer.find("ACTION:")
+            if marker == -1:
+                continue
+            line_end = buffer.find("\n", marker)
+            if line_end != -1:
+                # Drop whatever the last chunk carried past the ACTION line
+                buffer = buffer[:line_end]
+                break
+        return buffer.strip()
+
+    def __del__(self):
+        pool = getattr(self, "_pool", None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    @staticmethod
+    def _prepare_image(screenshot_b64: str) -> Tuple[bytes, str]:
+        """Decode the screenshot into raw bytes for Gemini vision input"""
+        screenshot_bytes = base64.b64decode(screenshot_b64) if screenshot_b64 else b""
+        return screenshot_bytes, "image/png"
+
+    def _remember_action(self, state_hash: str, action: Optional[Dict]) -> Optional[Dict]:
+        """Record the action answered for a page state and return a copy of it"""
+        if state_hash != self._last_state_hash:
+            self._state_hits = 0
+        self._last_state_hash = state_hash
+        self._last_action = action
+        return copy.deepcopy(action)
+
+    def _reuse_action_for_state(self, state_hash: str, bboxes: List[Dict]) -> Optional[Dict]:
+        """
+        Return the previous action when the page state has not changed
+
+        The first repeat replays Gemini's last answer; a second consecutive
+        repeat forces a wait and hands the following step back to Gemini, so
+        a no-op action is not replayed forever. The
+        state hash only covers a screenshot prefix and the leading elements,
+        so typing and toggle-like clicks, which a replay would undo or
+        double, always go back to Gemini.
+        """
+        if (
+            state_hash != self._last_state_hash
+            or not self._last_action
+            or not self._is_replayable(self._last_action, bboxes)
+        ):
+            self._last_state_hash = state_hash
+            self._last_action = None
+            self._state_hits = 0
+            return None
+
+        self._state_hits += 1
+        if self._state_hits >= 2:
+            # Ask Gemini again on the next step rather than waiting forever
+            self._last_action = None
+            self._state_hits = 0
+            self._force_query = True
+            print("⚡ Page state repeated - waiting instead of replaying the action")
+            return {"action": "wait", "reasoning": "Page state unchanged after repeated action", "cached": True}
+
+        print("⚡ Page state unchanged - reusing previous Gemini action")
+        return dict(copy.deepcopy(self._last_action), cached=True)
+
+    @staticmethod
+    def _is_replayable(action: Dict, bboxes: List[Dict]) -> bool:
+        """Whether repeating an action on an unchanged page is harmless"""
+        action_type = action.get("action")
+        if action_type == "type":
+            return False
+        if action_type != "click":
+            return True
+
+        element_id = action.get("element_id")
+        bbox = next((b for b in bboxes if b.get("index") == element_id), None)
+        if bbox is None:
+            return False
+        if (bbox.get("role") or "").lower() in TOGGLE_ROLES:
+            return False
+        if (bbox.get("type") or "").lower() in TOGGLE_TAGS:
+            return False
+        label = f"{bbox.get('text') or ''} {bbox.get('ariaLabel') or ''}"
+        return not _TOGGLE_LABEL_RE.search(label)
+
+    def _track_bbox_changes(self, bboxes: List[Dict]) -> None:
+        """Count consecutive calls that saw the same element list"""
+        signature = tuple((bbox.get("index"), bbox.get("text")) for bbox in bboxes)
+        if signature == self._bbox_signature:
+            self._unchanged_steps += 1
+        else:
+            self._bbox_signature = signature
+            self._unchanged_steps = 0
+
+    def _should_repeat_wait(self, action_history: Sequence[Dict]) -> bool:
+        """Repeat Gemini's last wait once if the element list stayed the same"""
+        if self._skipped_wait or self._unchanged_steps < 1 or not action_history:
+            return False
+        return action_history[-1].get("action") == "wait"
+
+    def _deterministic_finish_ok(
+        self,
+        task_config: Dict,
+        current_url: str,
+        page_title: str,
+        action_history: Sequence[Dict],
+        previous_url: str
+    ) -> bool:
+        """Check whether the last submit click already completed the task"""
+        if not action_history or current_url == previous_url:
+            return False
+
+        last = action_history[-1]
+        if last.get("action") != "click":
+            return False
+        match = _OBS_RE.match(last.get("observation") or "")
+        label = (match.group(2) or "") if match else ""
+        if not _SUBMIT_LABEL_RE.search(label) or _CANCEL_LABEL_RE.search(label):
+            return False
+
+        if not completion_evident(task_config.get("task_id", ""), current_url, page_title):
+            return False
+        return validate_task_completion(task_config, current_url, page_title, {"action": "finish"})
+
+    def _format_elements(self, bboxes: List[Dict], current_url: str = "") -> str:
+        """
+        Format element list for Gemini with enhanced context
+
+        Rows are kept compact: whitespace is collapsed before clipping the
+        text, aria labels and roles that repeat the text or tag are dropped,
+        and same-site hrefs are shown as paths.
+        """
         if not bboxes:
             return "No interactive elements detected."
 
-        lines = []
-        for bbox in bboxes[:MAX_ELEMENTS_FOR_CONTEXT]:
-            text = (bbox.get("text", "") or "").strip()
-            aria = (bbox.get("ariaLabel", "") or "").strip()
+        parts = urlsplit(current_url) if current_url else None
+        origin = f"{parts.scheme}://{parts.netloc}" if parts and parts.netloc else ""
+
+        # Rows are written straight into one buffer instead of a list of strings
+        buf = io.StringIO()
+        for bbox in select_elements(bboxes, MAX_ELEMENTS_FOR_CONTEXT):
+            # Tag names and roles come from a small vocabulary; share one copy
+            # locally and leave the caller's bbox untouched
+            element_type = bbox["type"]
+            if isinstance(element_type, str):
+                element_type = sys.intern(element_type)
             role = bbox.get("role") or ""
+            if isinstance(role, str):
+                role = sys.intern(role)
+
+            text = " ".join((bbox.get("text", "") or "").split())
+            aria = (bbox.get("ariaLabel", "") or "").strip()
             href = bbox.get("href") or ""
 
-            snippet = f"[{bbox['index']}] {bbox['type']}: \"{text[:MAX_TEXT_LENGTH]}\""
+            text_lower = text.lower()
+            if aria.lower() == text_lower:
+                aria = ""
+            if role == element_type or role.lower() == text_lower:
+                role = ""
+            if origin and href.startswith(origin):
+                href = href[len(origin):] or "/"
+
+            buf.write(f"[{bbox['index']}] {element_type}: \"{_truncate(text, MAX_ELEMENT_TEXT_LENGTH)}\"")
             if aria:
-                snippet += f" (aria: {aria[:MAX_ARIA_LENGTH]})"
+                buf.write(f" (aria: {_truncate(aria, MAX_ARIA_LENGTH)})")
             if role:
-                snippet += f" (role: {role})"
+                buf.write(f" (role: {role})")
             if href:
-                snippet += f" (href: {href[:MAX_HREF_LENGTH]})"
-            lines.append(snippet)
+                buf.write(f" (href: {_truncate(href, MAX_HREF_LENGTH)})")
+            buf.write("\n")
 
-        return "\n".join(lines)
+        return buf.getvalue().rstrip("\n")
+
+    @staticmethod
+    def make_history_buffer() -> deque:
+        """Bounded action history holding only the steps shown to Gemini"""
+        return deque(maxlen=MAX_HISTORY_STEPS)
 
-    def _format_history(self, action_history: List[Dict]) -> str:
+    def _format_history(self, action_history: Sequence[Dict]) -> str:
         """Format action history for context with loop-awareness"""
         if not action_history:
             return "RECENT ACTIONS: None (first step)\n"
 
         lines = ["RECENT ACTIONS (what you just did):"]
-        for entry in action_history[-MAX_HISTORY_STEPS:]:
+        # islice works for both lists and deques without copying a slice
+        start = max(0, len(action_history) - MAX_HISTORY_STEPS)
+        for entry in islice(action_history, start, None):
             step = entry.get("step")
             action = entry.get("action", "unknown")
             observation = entry.get("observation", "")
 
             detail = ""
-            if "Typed" in observation:
-                parts = observation.split("'")
-                typed = parts[1] if len(parts) > 1 else ""
-                detail = f"typed \"{typed}\""
-            elif "Clicked" in observation:
-                parts = observation.split(": ")
-                clicked = parts[1] if len(parts) > 1 else observation
-                detail = f"clicked \"{clicked[:MAX_TEXT_LENGTH]}\""
+            match = _OBS_RE.search(observation)
+            if match and match.group(1) is not None:
+                detail = f"typed \"{match.group(1)}\""
+            elif match and match.group(2) is not None:
+                detail = f"clicked \"{match.group(2)[:MAX_TEXT_LENGTH]}\""
             elif observation:
                 detail = observation[:MAX_OBSERVATION_LENGTH]
 
@@ -165,7 +460,53 @@ class GeminiClient:
             else:
                 lines.append(f"  Step {step}: {action}")
 
-        return "\n".join(lines) + "\n"
+        # Empty sentinel yields the trailing newline without a second concat
+        lines.append("")
+        return "\n".join(lines)
+
+    def _format_parameters(self, task_parameters: Dict = None) -> str:
+        """
+        Build the task parameters and guidance section of the prompt
+
+        Parameters stay the same for every step of a task, so the rendered
+        section is reused while the parameter items compare equal.
+        """
+        if not task_parameters:
+            return ""
+
+        # Lists are snapshotted so in-place edits invalidate the cache
+        items = [(k, tuple(v) if isinstance(v, list) else v) for k, v in task_parameters.items()]
+        if self._parameters_cache and self._parameters_cache[0] == items:
+            return self._parameters_cache[1]
+
+        parameters_text = "\n\n🎯 TASK PARAMETERS (use these exact values):\n"
+        guidance_lines = []
+        for key, value in task_parameters.items():
+            if value is None or value == "":
+                continue
+            if isinstance(value, list):
+                display_value = ", ".join(str(v) for v in value)
+            else:
+                display_value = value
+            parameters_text += f"  - {key}: {display_value}\n"
+        
+        # Provide explicit instructions for known structured parameters
+        param_lower = {k: (v.lower() if isinstance(v, str) else v) for k, v in task_parameters.items()}
+        
+        for param, template in TASK_GUIDANCE_TEMPLATES.items():
+            if param == "project_name" and "project_name" in task_parameters:
+                guidance_lines.append(template.format(value=task_parameters['project_name']))
+                guidance_lines.append("After the creation modal is open, stay inside it (look for 'New project') and avoid clicking the main 'Add project' button again.")
+            elif param in param_lower:
+                guidance_lines.append(template)
+        
+        if guidance_lines:
+            parameters_text += "\nTASK-SPECIFIC INSTRUCTIONS:\n"
+            for line in guidance_lines:
+                parameters_text += f"  - {line}\n"
+
+        self._parameters_cache = (items, parameters_text)
+        return parameters_text
 
     def _build_prompt(
         self,
@@ -178,40 +519,14 @@ class GeminiClient:
     ) -> str:
         """Build the comprehensive prompt for Gemini"""
         
-        # Build parameters section
-        parameters_text = ""
-        if task_parameters:
-            parameters_text = "\n\n🎯 TASK PARAMETERS (use these exact values):\n"
-            guidance_lines = []
-            for key, value in task_parameters.items():
-                if value is None or value == "":
-                    continue
-                if isinstance(value, list):
-                    display_value = ", ".join(str(v) for v in value)
-                else:
-                    display_value = value
-                parameters_text += f"  - {key}: {display_value}\n"
-            
-            # Provide explicit instructions for known structured parameters
-            param_lower = {k: (v.lower() if isinstance(v, str) else v) for k, v in task_parameters.items()}
-            
-            for param, template in TASK_GUIDANCE_TEMPLATES.items():
-                if param == "project_name" and "project_name" in task_parameters:
-                    guidance_lines.append(template.format(value=task_parameters['project_name']))
-                    guidance_lines.append("After the creation modal is open, stay inside it (look for 'New project') and avoid clicking the main 'Add project' button again.")
-                elif param in param_lower:
-                    guidance_lines.append(template)
-            
-            if guidance_lines:
-                parameters_text += "\nTASK-SPECIFIC INSTRUCTIONS:\n"
-                for line in guidance_lines:
-                    parameters_text += f"  - {line}\n"
+        parameters_text = self._format_parameters(task_parameters)
 
         hint_text = ""
         if hint and hint.get("message"):
             hint_text = f"\n💡 CONTEXT HINT:\n  - {hint['message']}\n"
 
-        return PROMPT_TEMPLATE.format(
+        # The static header is prepended as-is; only the tail is formatted
+        return STATIC_PROMPT_HEADER + DYNAMIC_PROMPT_TEMPLATE.format(
             goal=goal,
             current_url=current_url,
             elements_text=elements_text,
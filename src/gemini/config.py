@@ -9,7 +9,9 @@ and prompt templates used by the GeminiClient.
 GEMINI_MODEL_NAME = "gemini-2.0-flash-exp"
 
 # Response parsing constants
-SUBMIT_KEYWORDS = ["create", "submit", "save", "add", "confirm", "done", "finish", "publish"]
+# Matched as whole words against a clicked label; "add" is left out because
+# "Add project"/"Add filter" open a form rather than submit one
+SUBMIT_KEYWORDS = ["create", "submit", "save", "confirm", "done", "finish", "publish"]
 CANCEL_KEYWORDS = ["cancel", "close", "discard"]
 
 # Maximum number of elements to process for context
@@ -17,6 +19,7 @@ MAX_ELEMENTS_FOR_CONTEXT = 40
 
 # Text length limits for response formatting
 MAX_TEXT_LENGTH = 50
+MAX_ELEMENT_TEXT_LENGTH = 30
 MAX_ARIA_LENGTH = 40
 MAX_HREF_LENGTH = 60
 MAX_OBSERVATION_LENGTH = 60
@@ -25,17 +28,8 @@ MAX_OBSERVATION_LENGTH = 60
 MAX_HISTORY_STEPS = 5
 
 # Prompt templates and instructions
-PROMPT_TEMPLATE = """You are a web automation agent. Your goal: {goal}
-
-Current URL: {current_url}
-
-This screenshot has RED NUMBERED BOXES in the TOP-LEFT corner of interactive elements.
-
-Available interactive elements:
-{elements_text}
-
-Previous actions:
-{history_text}{parameters_text}{hint_text}
+# The static header never changes between steps; per-step context follows it
+STATIC_PROMPT_HEADER = """You are a web automation agent. Each step you get a screenshot with RED NUMBERED BOXES in the TOP-LEFT corner of interactive elements, and you choose one action.
 
 🚨 CRITICAL RULES TO PREVENT LOOPS:
 1. DON'T REPEAT YOURSELF
@@ -72,7 +66,24 @@ ACTION: <action>
 Examples:
 - ACTION: click [56]
 - ACTION: type [12]; second task
-- ACTION: finish; Created project and updated status"""
+- ACTION: finish; Created project and updated status
+"""
+
+DYNAMIC_PROMPT_TEMPLATE = """
+Your goal: {goal}
+
+Current URL: {current_url}
+
+Available interactive elements (hrefs on this site are shown as paths):
+{elements_text}
+
+{history_text}{parameters_text}{hint_text}
+Respond with a single line: ACTION: <action>"""
+
+PROMPT_TEMPLATE = STATIC_PROMPT_HEADER + DYNAMIC_PROMPT_TEMPLATE
+
+# Appended when the screenshot is left out because the page elements are unchanged
+SCREENSHOT_OMITTED_NOTE = "\n(No screenshot this step: the interactive elements are unchanged since the previous screenshot.)"
 
 # Task-specific guidance templates
 TASK_GUIDANCE_TEMPLATES = {
@@ -0,0 +1,67 @@
+"""
+Page state fingerprinting for the Gemini client.
+
+Produces cheap, stable digests of the annotated page so repeated
+requests for an unchanged page can be answered without the model.
+"""
+
+from hashlib import blake2b
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+
+# Only a prefix of the screenshot and the leading elements are hashed
+SCREENSHOT_PREFIX_LENGTH = 4096
+MAX_FINGERPRINT_ELEMENTS = 40
+FINGERPRINT_TEXT_LENGTH = 20
+CACHE_KEY_TEXT_LENGTH = 30
+
+
+def compute_state_hash(screenshot_b64: str, bboxes: List[Dict]) -> str:
+    """
+    Digest the screenshot prefix and element list into a state key
+
+    Args:
+        screenshot_b64: Base64 encoded screenshot
+        bboxes: List of annotated elements from mark_page.js
+
+    Returns:
+        Hex digest identifying the page state
+    """
+    state_hash = blake2b(digest_size=16)
+    state_hash.update((screenshot_b64 or "")[:SCREENSHOT_PREFIX_LENGTH].encode())
+    state_hash.update(str(len(bboxes)).encode())
+    for bbox in bboxes[:MAX_FINGERPRINT_ELEMENTS]:
+        text = (bbox.get("text") or "")[:FINGERPRINT_TEXT_LENGTH]
+        state_hash.update(f"{bbox.get('index')}{bbox.get('type')}{text}".encode())
+    return state_hash.hexdigest()
+
+
+def compute_action_cache_key(
+    goal: str,
+    current_url: str,
+    bboxes: List[Dict],
+    action_history: Iterable[Dict],
+    history_steps: int,
+    hint: Optional[Dict] = None
+) -> str:
+    """
+    Digest the inputs that decide Gemini's next action
+
+    The element list stands in for the screenshot, and step numbers are left
+    out of the history tail so the same situation reached later still hits.
+
+    Returns:
+        Hex digest usable as a response cache key
+    """
+    key = blake2b(digest_size=16)
+    key.update(f"{goal}\n{current_url}\n".encode())
+    key.update("\n".join(
+        f"{bbox.get('index')}:{(bbox.get('text') or '')[:CACHE_KEY_TEXT_LENGTH]}"
+        for bbox in bboxes[:MAX_FINGERPRINT_ELEMENTS]
+    ).encode())
+    history = list(action_history or [])
+    for entry in islice(history, max(0, len(history) - history_steps), None):
+        key.update(f"\n{entry.get('action')}|{entry.get('observation', '')}".encode())
+    if hint and hint.get("message"):
+        key.update(f"\n{hint['message']}".encode())
+    return key.hexdigest()
@@ -7,6 +7,17 @@ This module contains functions for parsing Gemini API responses into structured
 from typing import Dict, List, Optional
 import re
 
+_BRACKETED_ID_RE = re.compile(r"\[(\d+)\]")
+_BARE_ID_RE = re.compile(r"(\d+)")
+
+# Parses a well-formed action line (after "ACTION:") in one pass: the action,
+# the part before ";" and the text/summary after it. Element ids and scroll
+# direction are read from the main part with the same rules as the legacy path
+_ACTION_RE = re.compile(
+    r"(?P<main>(?P<act>click|type|scroll|finish|wait)(?![^\s;])[^;]*)(?:;(?P<arg>.*))?",
+    re.IGNORECASE | re.DOTALL
+)
+
 
 def parse_action_response(response_text: str) -> Dict:
     """
@@ -29,6 +40,10 @@ def parse_action_response(response_text: str) -> Dict:
     
     # Remove any markdown formatting
     action_line = action_line.replace("`", "").strip()
+
+    match = _ACTION_RE.fullmatch(action_line)
+    if match:
+        return _build_action(match, action_line, response_text, reasoning_text)
     
     # Parse action
     parts = action_line.split(";", 1)
@@ -52,14 +67,9 @@ def parse_action_response(response_text: str) -> Dict:
     }
     
     # Parse based on action type
-    if action_type == "click":
-        result.update(parse_click_action(main_part))
-    elif action_type == "type":
-        result.update(parse_type_action(main_part, parts))
-    elif action_type == "scroll":
-        result.update(parse_scroll_action(action_line))
-    elif action_type == "finish":
-        result.update(parse_finish_action(parts))
+    handler = _ACTION_PARSERS.get(action_type)
+    if handler:
+        result.update(handler(main_part, parts, action_line))
     else:
         # Handle cases where Gemini returns JSON-like shorthand
         result = handle_alternative_formats(action_type, main_part, parts, result)
@@ -67,6 +77,28 @@ def parse_action_response(response_text: str) -> Dict:
     return result
 
 
+def _build_action(match: "re.Match", action_line: str, response_text: str, reasoning_text: str) -> Dict:
+    """Turn an _ACTION_RE match into the structured action dictionary"""
+    action_type = match["act"].lower()
+    result = {
+        "action": action_type,
+        "raw_response": response_text,
+        "reasoning": reasoning_text
+    }
+
+    arg = match["arg"]
+    if action_type in ("click", "type"):
+        element_id = extract_element_id(match["main"])
+        result["element_id"] = element_id if element_id is not None else 0
+        if action_type == "type":
+            result["text"] = arg.strip() if arg is not None else ""
+    elif action_type == "scroll":
+        result.update(parse_scroll_action(action_line))
+    elif action_type == "finish":
+        result["summary"] = arg.strip() if arg is not None else "Task completed"
+    return result
+
+
 def handle_alternative_formats(action_type: str, main_part: str, parts: List[str], result: Dict) -> Dict:
     """Handle alternative response formats from Gemini"""
     normalized = action_type.strip()
@@ -86,16 +118,11 @@ def handle_alternative_formats(action_type: str, main_part: str, parts: List[str
             result.update(parse_type_action(main_part, parts))
         else:
             result["action"] = "wait"
-    elif normalized in {"wait", "finish", "click", "type", "scroll"}:
+    elif normalized == "wait" or normalized in _ACTION_PARSERS:
         result["action"] = normalized
-        if normalized == "finish":
-            result.update(parse_finish_action(parts))
-        elif normalized == "click":
-            result.update(parse_click_action(main_part))
-        elif normalized == "type":
-            result.update(parse_type_action(main_part, parts))
-        elif normalized == "scroll":
-            result.update(parse_scroll_action(main_part))
+        handler = _ACTION_PARSERS.get(normalized)
+        if handler:
+            result.update(handler(main_part, parts, main_part))
     else:
         result["action"] = "wait"
         result["reasoning"] = "Unrecognized action payload, defaulting to wait"
@@ -127,9 +154,9 @@ def parse_type_action(main_part: str, parts: List[str]) -> Dict:
 
 def extract_element_id(text: str) -> Optional[int]:
     """Extract a numeric element identifier from Gemini output."""
-    match = re.search(r"\[(\d+)\]", text)
+    match = _BRACKETED_ID_RE.search(text)
     if not match:
-        match = re.search(r"(\d+)", text)
+        match = _BARE_ID_RE.search(text)
     if not match:
         return None
     number_text = next(group for group in match.groups() if group)
@@ -152,4 +179,13 @@ def parse_finish_action(parts: List[str]) -> Dict:
     if len(parts) > 1:
         return {"summary": parts[1].strip()}
     else:
-        return {"summary": "Task completed"}
\ No newline at end of file
+        return {"summary": "Task completed"}
+
+
+# Action parsers keyed by action type, all taking (main_part, parts, action_line)
+_ACTION_PARSERS = {
+    "click": lambda main_part, parts, action_line: parse_click_action(main_part),
+    "type": lambda main_part, parts, action_line: parse_type_action(main_part, parts),
+    "scroll": lambda main_part, parts, action_line: parse_scroll_action(action_line),
+    "finish": lambda main_part, parts, action_line: parse_finish_action(parts),
+}
@@ -0,0 +1,106 @@
+"""
+Element ranking for the Gemini prompt.
+
+When a page exposes more elements than fit in the prompt, the ones
+closest to the viewport center are kept. The distance loop is compiled
+with numba when numpy/numba are installed and falls back to plain
+Python otherwise.
+"""
+
+from typing import Dict, List
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMBA_AVAILABLE = False
+
+# Matches the browser viewport configured in the controllers
+VIEWPORT_CENTER_X = 960.0
+VIEWPORT_CENTER_Y = 540.0
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _rank_bboxes(indices, xywh, vx, vy):
+        # xywh rows hold the element center, see _bbox_center
+        out = np.empty(indices.shape[0], np.float32)
+        for i in range(indices.shape[0]):
+            dx = xywh[i, 0] - vx
+            dy = xywh[i, 1] - vy
+            out[i] = dx * dx + dy * dy
+        return out
+
+
+def _bbox_center(bbox: Dict):
+    """
+    Return the (x, y) center of an annotated element
+
+    mark_page_clean.js reports x/y as the top-left corner and the center in
+    centerX/centerY; without those the center is derived from the size.
+    """
+    if "centerX" in bbox and "centerY" in bbox:
+        return bbox["centerX"], bbox["centerY"]
+    return (
+        bbox.get("x", 0) + bbox.get("width", 0) / 2,
+        bbox.get("y", 0) + bbox.get("height", 0) / 2,
+    )
+
+
+def bboxes_to_soa(bboxes: List[Dict]):
+    """
+    Convert bbox dicts into (indices, xywh) numpy arrays
+
+    Args:
+        bboxes: List of annotated elements from mark_page_clean.js
+
+    Returns:
+        Tuple of int32 indices and float32 [center_x, center_y, width, height] rows
+    """
+    indices = np.empty(len(bboxes), np.int32)
+    xywh = np.empty((len(bboxes), 4), np.float32)
+    for i, bbox in enumerate(bboxes):
+        indices[i] = bbox.get("index", i)
+        xywh[i, 0], xywh[i, 1] = _bbox_center(bbox)
+        xywh[i, 2] = bbox.get("width", 0)
+        xywh[i, 3] = bbox.get("height", 0)
+    return indices, xywh
+
+
+def warm_up() -> None:
+    """Compile the ranking kernel ahead of the first request"""
+    if NUMBA_AVAILABLE:
+        _rank_bboxes(np.zeros(1, np.int32), np.zeros((1, 4), np.float32), VIEWPORT_CENTER_X, VIEWPORT_CENTER_Y)
+
+
+def select_elements(bboxes: List[Dict], limit: int) -> List[Dict]:
+    """
+    Keep the `limit` elements nearest the viewport center
+
+    Selected elements stay in their original order so the prompt still
+    lists them the way mark_page_clean.js numbered them.
+
+    Args:
+        bboxes: List of annotated elements from mark_page_clean.js
+        limit: Maximum number of elements to keep
+
+    Returns:
+        Selected elements in page order
+    """
+    if len(bboxes) <= limit:
+        return bboxes
+
+    if NUMBA_AVAILABLE:
+        indices, xywh = bboxes_to_soa(bboxes)
+        distances = _rank_bboxes(indices, xywh, VIEWPORT_CENTER_X, VIEWPORT_CENTER_Y)
+        keep = np.sort(np.argsort(distances, kind="stable")[:limit])
+        return [bboxes[i] for i in keep]
+
+    distances = []
+    for bbox in bboxes:
+        cx, cy = _bbox_center(bbox)
+        distances.append((cx - VIEWPORT_CENTER_X) ** 2 + (cy - VIEWPORT_CENTER_Y) ** 2)
+    keep = sorted(sorted(range(len(bboxes)), key=distances.__getitem__)[:limit])
+    return [bboxes[i] for i in keep]
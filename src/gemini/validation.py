@@ -4,7 +4,8 @@ Task completion validation logic.
 This module contains validation functions for determining when tasks are complete.
 """
 
-from typing import Dict
+from functools import partial
+from typing import Callable, Dict
 from .config import VALIDATION_PATTERNS
 
 
@@ -29,27 +30,56 @@ def validate_task_completion(
     if action['action'] != 'finish':
         return True  # Not a finish action, so validation passes
     
-    task_id = task_config['task_id']
-    
-    # Check if we have validation rules for this task
-    if task_id not in VALIDATION_PATTERNS:
-        return True  # No specific validation, accept finish
-        
-    validation_rule = VALIDATION_PATTERNS[task_id]
-    return _validate_against_pattern(current_url, page_title, validation_rule)
+    # Tasks without validation rules accept the finish
+    validator = _VALIDATORS.get(task_config['task_id'], _always_true)
+    return validator(current_url.lower(), page_title.lower())
+
 
+def completion_evident(task_id: str, current_url: str, page_title: str) -> bool:
+    """
+    Strict check that the URL/title positively match a task's completion pattern
+
+    Unlike validate_task_completion, which only rejects clear failures, this
+    requires every configured pattern to match, so it is safe to use as
+    evidence that the task is done without consulting Gemini. A pattern with
+    only a URL segment count is too weak to count as evidence.
+    """
+    pattern = VALIDATION_PATTERNS.get(task_id)
+    if not pattern or not (pattern.get("url_patterns") or pattern.get("title_patterns")):
+        return False
 
-def _validate_against_pattern(current_url: str, page_title: str, pattern: Dict) -> bool:
-    """Validate URL and title against a pattern"""
     url_lower = current_url.lower()
     title_lower = page_title.lower()
-    
+
+    url_patterns = pattern.get("url_patterns", [])
+    if url_patterns and not any(p in url_lower for p in url_patterns):
+        return False
+
+    title_patterns = pattern.get("title_patterns", [])
+    if title_patterns and not any(p in title_lower for p in title_patterns):
+        return False
+
+    min_segments = pattern.get("min_url_segments")
+    if min_segments and url_lower.count('/') < min_segments - 1:
+        return False
+
+    return True
+
+
+def _validate_against_pattern(url_lower: str, title_lower: str, pattern: Dict) -> bool:
+    """
+    Validate URL and title against a pattern
+
+    Both strings must already be lowercased by the caller. Keyword lists are
+    small enough for plain substring tests; if they grow large, a single
+    Aho-Corasick pass (pyahocorasick) over each string is the scaling path.
+    """
     # Check URL patterns
     url_patterns = pattern.get("url_patterns", [])
     if url_patterns and not any(p in url_lower for p in url_patterns):
-        # Check for minimum URL segments if specified
+        # Check for minimum URL segments if specified (n segments = n - 1 slashes)
         min_segments = pattern.get("min_url_segments")
-        if min_segments and len(current_url.split('/')) < min_segments:
+        if min_segments and url_lower.count('/') < min_segments - 1:
             print("⚠️  Task completion validation failed:")
             print(f"   {pattern['error_message']}")
             return False
@@ -57,9 +87,20 @@ def _validate_against_pattern(current_url: str, page_title: str, pattern: Dict)
     # Check title patterns if specified
     title_patterns = pattern.get("title_patterns", [])
     if title_patterns and not any(p in title_lower for p in title_patterns):
-        if 'filter' in pattern.get("url_patterns", []):  # Special case for filter tasks
+        if 'filter' in url_patterns:  # Special case for filter tasks
             print("⚠️  Task completion validation failed:")
             print(f"   {pattern['error_message']}")
             return False
     
-    return True
\ No newline at end of file
+    return True
+
+
+def _always_true(url_lower: str, title_lower: str) -> bool:
+    return True
+
+
+# One validator per task with rules, bound to its pattern once at import
+_VALIDATORS: Dict[str, Callable[[str, str], bool]] = {
+    task_id: partial(_validate_against_pattern, pattern=rule)
+    for task_id, rule in VALIDATION_PATTERNS.items()
+}
@@ -215,6 +215,7 @@
     
     // Add pulse animation
     const style = document.createElement('style');
+    style.setAttribute('data-agent-mark', 'true');
     style.textContent = `
       @keyframes pulse {
         0%, 100% { opacity: 1; }
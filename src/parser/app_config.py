@@ -5,6 +5,11 @@ Contains application mappings, known task types, and configuration constants
 used throughout the task parsing system.
 """
 
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
 # Known app mappings (extensible)
 APP_MAPPINGS = {
     "linear": {
@@ -91,9 +96,32 @@ STATUS_MAPPINGS = {
 }
 
 # Instruction keywords that should be filtered from names
-INSTRUCTION_KEYWORDS = {
+INSTRUCTION_KEYWORDS = frozenset(sys.intern(k) for k in (
     "change", "set", "update", "switch", "make", "turn", "modify",
     "add", "include", "write", "provide", "generate", "create"
+))
+# Tuple form for str.startswith, which checks every prefix in one C call
+INSTRUCTION_KEYWORDS_TUPLE = tuple(sorted(INSTRUCTION_KEYWORDS))
+# Finds the earliest instruction keyword (as a whole word) in one scan
+INSTRUCTION_SPLIT_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(k) for k in INSTRUCTION_KEYWORDS_TUPLE) + r")\s",
+    re.IGNORECASE
+)
+
+# Vocabularies are read-only: intern the strings and use frozensets so
+# membership checks are O(1). Keyword matching never relied on list order.
+STATUS_MAPPINGS = {sys.intern(k): sys.intern(v) for k, v in STATUS_MAPPINGS.items()}
+for _vocabulary in (LINEAR_TASK_TYPES, NOTION_TASK_TYPES, ASANA_TASK_TYPES, ACTION_KEYWORDS, OBJECT_KEYWORDS):
+    for _key in _vocabulary:
+        _vocabulary[_key] = frozenset(sys.intern(v) for v in _vocabulary[_key])
+del _vocabulary, _key
+
+# Parameter key holding a single item's name, per object type ("name" otherwise)
+OBJECT_TO_NAME_PARAM = {
+    "project": "project_name",
+    "page": "page_name",
+    "database": "database_name",
+    "issue": "issue_title"
 }
 
 # Default configuration values
@@ -145,4 +173,115 @@ DESCRIPTION_PATTERNS = [
     r'(?:add|include|write|set|provide|generate)\s+(?:a\s+)?description(?:\s+for\s+(?:the\s+)?(?:project|it))?\s*(?:called|named|as|to|of)?\s*["\']([^"\']+)["\']',
     r'description\s+(?:is|should be|to|as)\s+["\']([^"\']+)["\']',
     r'description:\s*([^,\n]+)'
-]
\ No newline at end of file
+]
+
+
+# Precompiled forms of the extraction patterns above. They are compiled
+# case-sensitively and must be run against lowercase_view(query); captured
+# values are sliced out of the original query by span to keep their case.
+COMPILED_NAME_PATTERNS = [re.compile(p) for p in NAME_PATTERNS]
+COMPILED_STATUS_PATTERNS = [re.compile(p) for p in STATUS_PATTERNS]
+COMPILED_TARGET_DATE_PATTERNS = [re.compile(p) for p in TARGET_DATE_PATTERNS]
+COMPILED_PRIORITY_PATTERNS = [re.compile(p) for p in PRIORITY_PATTERNS]
+COMPILED_DESCRIPTION_PATTERNS = [re.compile(p) for p in DESCRIPTION_PATTERNS]
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def lowercase_view(query: str) -> str:
+    """Lowercase a query while keeping every character at the same offset"""
+    lower = query.lower()
+    if len(lower) != len(query):
+        # A few non-ASCII characters expand when lowercased; fold ASCII only
+        lower = query.translate(_ASCII_LOWER)
+    return lower
+
+
+# Additional parameter patterns fused into one regex. Each pattern becomes a
+# named group "<param>__<n>" inside a lookahead, so matches never consume text
+# another parameter's pattern might need; its value is the first capture inside.
+_PARAM_PATTERN_GROUPS = (
+    ("status", STATUS_PATTERNS),
+    ("target_date", TARGET_DATE_PATTERNS),
+    ("priority", PRIORITY_PATTERNS),
+    ("description", DESCRIPTION_PATTERNS),
+)
+COMBINED_PARAM_RE = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{param}__{i}>{pattern})"
+        for param, patterns in _PARAM_PATTERN_GROUPS
+        for i, pattern in enumerate(patterns)
+    ) + ")"
+)
+# Every pattern above needs one of these words; queries without any skip the scan
+PARAM_TRIGGERS = (
+    "status", "backlog", "workflow", "target", "due date", "deadline", "priority", "description"
+)
+# Group name -> (parameter key, index of its value group)
+COMBINED_PARAM_GROUPS = {
+    name: (name.rsplit("__", 1)[0], index + 1)
+    for name, index in COMBINED_PARAM_RE.groupindex.items()
+}
+
+
+@lru_cache(maxsize=64)
+def compiled_quantity_re(obj: str):
+    """
+    Compile QUANTITY_PATTERNS for an object type into one alternation
+
+    Matches lowercase text; exactly one of the capture groups holds the count.
+    """
+    escaped = re.escape(obj.lower())
+    return re.compile("|".join(template.format(obj=escaped) for template in QUANTITY_PATTERNS))
+
+
+def build_keyword_scanner(groups: Dict[str, Iterable[str]]) -> Tuple["re.Pattern", Dict[str, str], Tuple[str, ...]]:
+    """
+    Compile keyword groups into one overlapping-substring scanner
+
+    The lookahead reports a match at every position, so one finditer pass
+    sees every keyword occurrence a per-keyword `in` loop would.
+
+    Returns:
+        (pattern, keyword -> group, group priority order)
+    """
+    keyword_to_group: Dict[str, str] = {}
+    for group, keywords in groups.items():
+        for keyword in sorted(keywords):
+            keyword_to_group.setdefault(keyword, group)
+    alternation = "|".join(re.escape(k) for k in sorted(keyword_to_group, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))"), keyword_to_group, tuple(groups)
+
+
+def match_keyword_group(scanner, text_lower: str) -> Optional[str]:
+    """Return the highest-priority group with a keyword in text_lower"""
+    pattern, keyword_to_group, order = scanner
+    found = {keyword_to_group[m.group(1)] for m in pattern.finditer(text_lower)}
+    for group in order:
+        if group in found:
+            return group
+    return None
+
+
+def build_keyword_group_re(groups: Dict[str, Iterable[str]]) -> "re.Pattern":
+    """
+    Compile keyword groups into one regex whose lastgroup is the matched group
+
+    Each group is a lookahead tried in dict order, so .match() returns the
+    highest-priority group with a keyword anywhere in the text - the same
+    answer as looping over the groups, in a single call.
+    """
+    branches = []
+    for group, keywords in groups.items():
+        alternation = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+        branches.append(f"(?=.*?(?:{alternation}))(?P<{group}>)")
+    return re.compile(r"\A(?:" + "|".join(branches) + ")", re.DOTALL)
+
+
+# Whole-word app keywords for a token-set check before the substring scanner
+APP_KEYWORD_SETS = {name: frozenset(info["keywords"]) for name, info in APP_MAPPINGS.items()}
+WORD_TOKEN_RE = re.compile(r"\w+")
+
+APP_KEYWORD_SCANNER = build_keyword_scanner({name: info["keywords"] for name, info in APP_MAPPINGS.items()})
+ACTION_KEYWORD_RE = build_keyword_group_re(ACTION_KEYWORDS)
+OBJECT_KEYWORD_RE = build_keyword_group_re(OBJECT_KEYWORDS)
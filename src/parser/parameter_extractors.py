@@ -8,80 +8,119 @@ from natural language queries.
 import re
 from typing import Dict, List, Optional, Tuple
 from .app_config import (
-    STATUS_MAPPINGS, INSTRUCTION_KEYWORDS, QUANTITY_PATTERNS,
-    NAME_PATTERNS, STATUS_PATTERNS, TARGET_DATE_PATTERNS,
-    PRIORITY_PATTERNS, DESCRIPTION_PATTERNS
+    STATUS_MAPPINGS, INSTRUCTION_KEYWORDS_TUPLE, INSTRUCTION_SPLIT_RE, COMPILED_NAME_PATTERNS,
+    COMBINED_PARAM_RE, COMBINED_PARAM_GROUPS, PARAM_TRIGGERS, compiled_quantity_re,
+    OBJECT_TO_NAME_PARAM, lowercase_view
 )
 
+# Hyphens and underscores in status values read as spaces
+_STATUS_SEPARATORS = str.maketrans({'-': ' ', '_': ' '})
+_CONNECTOR_RE = re.compile(r"\b(?:and|also|then|so|but)\b", re.IGNORECASE)
+_AND_SPLIT_RE = re.compile(r'\s+and\s+', re.IGNORECASE)
+
+
+# Hot helpers live at module level to skip the staticmethod lookup; the
+# regexes are bound as default arguments so calls read them as locals.
+def normalize_status_value(value: str, _separators=_STATUS_SEPARATORS, _mappings=STATUS_MAPPINGS) -> str:
+    """Normalize status/progress strings into a user-facing label."""
+    clean = " ".join(str(value).translate(_separators).split())
+    return _mappings.get(clean.lower()) or clean.title()
+
+
+def clean_value_phrase(text: str, _connector_re=_CONNECTOR_RE) -> str:
+    """Clean value phrases by removing connecting words"""
+    snippet = (text or "").strip()
+    if not snippet:
+        return snippet
+    return _connector_re.split(snippet, maxsplit=1)[0].strip()
+
+
+def split_names_from_instructions(
+    text: str,
+    _and_split_re=_AND_SPLIT_RE,
+    _instruction_re=INSTRUCTION_SPLIT_RE
+) -> Tuple[str, str]:
+    """Split name candidates from instruction text"""
+    # If there's an " and " that likely separates instructions, split once
+    if " and " in text.lower():
+        split_parts = _and_split_re.split(text, maxsplit=1)
+        name_candidate = split_parts[0].strip()
+        instruction_tail = split_parts[1].strip() if len(split_parts) > 1 else ""
+    else:
+        name_candidate = text
+        instruction_tail = ""
+
+    # Remove instruction phrases embedded in the candidate
+    match = _instruction_re.search(name_candidate)
+    if match:
+        embedded_tail = name_candidate[match.start():].strip()
+        name_candidate = name_candidate[:match.start()].strip()
+        instruction_tail = f"{embedded_tail} {'and ' + instruction_tail if instruction_tail else ''}".strip()
+    else:
+        name_candidate = name_candidate.strip()
+
+    return name_candidate, instruction_tail
+
+
+def _offset_aligned_lower(query: str, query_lower: Optional[str]) -> str:
+    """Reuse a caller's lowercased query when its offsets match the original"""
+    if query_lower is not None and len(query_lower) == len(query):
+        return query_lower
+    return lowercase_view(query)
+
+
+def mentions_additional_parameters(query_lower: str, _triggers=PARAM_TRIGGERS) -> bool:
+    """Cheap substring check: could extract_additional_parameters find anything?"""
+    return any(trigger in query_lower for trigger in _triggers)
+
+
+def filter_instruction_keywords(parts: List[str], _keywords=INSTRUCTION_KEYWORDS_TUPLE) -> List[str]:
+    """Filter out parts that look like instructions"""
+    return [part for part in parts if not part.lower().startswith(_keywords)]
+
 
 class ParameterExtractor:
     """Utility class for extracting structured parameters from natural language queries"""
-    
-    @staticmethod
-    def normalize_status_value(value: str) -> str:
-        """Normalize status/progress strings into a user-facing label."""
-        clean = str(value).strip()
-        clean = clean.replace('-', ' ').replace('_', ' ')
-        clean = re.sub(r'\s+', ' ', clean)
-        
-        lower = clean.lower()
-        if lower in STATUS_MAPPINGS:
-            return STATUS_MAPPINGS[lower]
-        return clean.title()
-
-    @staticmethod
-    def clean_value_phrase(text: str) -> str:
-        """Clean value phrases by removing connecting words"""
-        snippet = (text or "").strip()
-        if not snippet:
-            return snippet
-        snippet = re.split(r"\b(?:and|also|then|so|but)\b", snippet, maxsplit=1, flags=re.IGNORECASE)[0]
-        return snippet.strip()
 
+    # Module-level helpers re-exported for API compatibility
+    normalize_status_value = staticmethod(normalize_status_value)
+    clean_value_phrase = staticmethod(clean_value_phrase)
+    _split_names_from_instructions = staticmethod(split_names_from_instructions)
+    _filter_instruction_keywords = staticmethod(filter_instruction_keywords)
+    mentions_additional_parameters = staticmethod(mentions_additional_parameters)
+    
     @staticmethod
-    def extract_additional_parameters(query: str) -> Dict:
+    def extract_additional_parameters(query: str, query_lower: Optional[str] = None) -> Dict:
         """
         Extract structured fields from query text (status, dates, priority, etc.).
+
+        query_lower may be passed when the caller already lowercased the query.
         """
-        params: Dict[str, str] = {}
-        
-        # Status / workflow field changes
-        for pattern in STATUS_PATTERNS:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                status_raw = ParameterExtractor.clean_value_phrase(match.group(1))
-                params["status"] = ParameterExtractor.normalize_status_value(status_raw)
-                break
+        query_lower = _offset_aligned_lower(query, query_lower)
+        if not mentions_additional_parameters(query_lower):
+            return {}
 
-        # Target/Due date extraction
-        for pattern in TARGET_DATE_PATTERNS:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                target_raw = ParameterExtractor.clean_value_phrase(match.group(1)).rstrip('.')
-                params["target_date"] = target_raw.title()
-                break
-        
-        # Priority changes
-        for pattern in PRIORITY_PATTERNS:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                priority_raw = ParameterExtractor.clean_value_phrase(match.group(1))
-                params["priority"] = priority_raw.title()
-                break
+        params: Dict[str, str] = {}
 
-        # Description instructions
-        for pattern in DESCRIPTION_PATTERNS:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                params["description"] = ParameterExtractor.clean_value_phrase(match.group(1)).rstrip(".")
+        # One pass over the query; the first match for each field wins
+        for match in COMBINED_PARAM_RE.finditer(query_lower):
+            key, value_group = COMBINED_PARAM_GROUPS[match.lastgroup]
+            if key in params:
+                continue
+            start, end = match.span(value_group)
+            params[key] = _PARAM_POSTPROCESSORS[key](query[start:end])
+            if len(params) == len(_PARAM_POSTPROCESSORS):
                 break
         
-        return params
+        # Keep the historical field order
+        return {key: params[key] for key in _PARAM_POSTPROCESSORS if key in params}
 
     @staticmethod
-    def extract_quantity_and_names(query: str, obj: str) -> Tuple[int, List[str], bool]:
+    def extract_quantity_and_names(query: str, obj: str, query_lower: Optional[str] = None) -> Tuple[int, List[str], bool]:
         """
         Extract quantity and names from query for multi-task detection
+
+        query_lower may be passed when the caller already lowercased the query.
         
         Returns:
             Tuple of (count, extracted_names, is_multi_task)
@@ -90,24 +129,24 @@ class ParameterExtractor:
         extracted_names = []
         is_multi_task = False
         
+        query_lower = _offset_aligned_lower(query, query_lower)
+
         # Check for quantity patterns (multi-task detection)
-        for pattern_template in QUANTITY_PATTERNS:
-            pattern = pattern_template.format(obj=obj)
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                count = int(match.group(1))
-                if count > 1:
-                    is_multi_task = True
-                break
+        match = compiled_quantity_re(obj).search(query_lower)
+        if match:
+            count = int(next(group for group in match.groups() if group))
+            if count > 1:
+                is_multi_task = True
         
         # Try to extract name patterns
-        for pattern in NAME_PATTERNS:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern in COMPILED_NAME_PATTERNS:
+            match = pattern.search(query_lower)
             if match:
-                extracted_text = match.group(1).strip()
+                start, end = match.span(1)
+                extracted_text = query[start:end].strip()
                 
                 # Process the extracted text for names and instructions
-                name_candidate, instruction_tail = ParameterExtractor._split_names_from_instructions(extracted_text)
+                name_candidate, instruction_tail = split_names_from_instructions(extracted_text)
                 
                 # Check if it's a series (contains commas OR multiple distinct parts)
                 if ',' in name_candidate:
@@ -116,7 +155,7 @@ class ParameterExtractor:
                     parts = [name_candidate]
                 
                 # Filter out parts that look like instructions
-                cleaned_parts = ParameterExtractor._filter_instruction_keywords(parts)
+                cleaned_parts = filter_instruction_keywords(parts)
                 
                 if cleaned_parts:
                     if len(cleaned_parts) > 1:
@@ -129,44 +168,6 @@ class ParameterExtractor:
         
         return count, extracted_names, is_multi_task
 
-    @staticmethod
-    def _split_names_from_instructions(text: str) -> Tuple[str, str]:
-        """Split name candidates from instruction text"""
-        def split_instruction(text: str):
-            lower = text.lower()
-            for kw in INSTRUCTION_KEYWORDS:
-                idx = lower.find(kw + " ")
-                if idx != -1:
-                    return text[:idx].strip(), text[idx:].strip()
-            return text.strip(), ""
-
-        # If there's an " and " that likely separates instructions, split once
-        if " and " in text.lower():
-            split_parts = re.split(r'\s+and\s+', text, maxsplit=1, flags=re.IGNORECASE)
-            name_candidate = split_parts[0].strip()
-            instruction_tail = split_parts[1].strip() if len(split_parts) > 1 else ""
-        else:
-            name_candidate = text
-            instruction_tail = ""
-
-        # Remove instruction phrases embedded in the candidate
-        name_candidate, embedded_tail = split_instruction(name_candidate)
-        if embedded_tail:
-            instruction_tail = f"{embedded_tail} {'and ' + instruction_tail if instruction_tail else ''}".strip()
-
-        return name_candidate, instruction_tail
-
-    @staticmethod
-    def _filter_instruction_keywords(parts: List[str]) -> List[str]:
-        """Filter out parts that look like instructions"""
-        cleaned_parts = []
-        for part in parts:
-            part_lower = part.lower()
-            if any(part_lower.startswith(k) for k in INSTRUCTION_KEYWORDS):
-                continue
-            cleaned_parts.append(part)
-        return cleaned_parts
-
     @staticmethod
     def extract_names_by_object_type(names: List[str], obj: str) -> Dict[str, str]:
         """Extract names and map them to appropriate parameter keys based on object type"""
@@ -174,17 +175,7 @@ class ParameterExtractor:
             return {}
         
         if len(names) == 1:
-            single_name = names[0]
-            if obj == "project":
-                return {"project_name": single_name}
-            elif obj == "page":
-                return {"page_name": single_name}
-            elif obj == "database":
-                return {"database_name": single_name}
-            elif obj == "issue":
-                return {"issue_title": single_name}
-            else:
-                return {"name": single_name}
+            return {OBJECT_TO_NAME_PARAM.get(obj, "name"): names[0]}
         else:
             return {"names": names, "count": len(names)}
 
@@ -213,26 +204,20 @@ class ParameterExtractor:
             if key not in params and heuristic_params.get(key):
                 params[key] = heuristic_params[key]
         
-        # Merge explicit lists of names
+        # Merge explicit lists of names, unique and in order
         if heuristic_params.get("names"):
-            if not params.get("names"):
-                params["names"] = heuristic_params["names"]
+            if params.get("names"):
+                merged = params["names"] + heuristic_params["names"]
             else:
-                # Ensure uniqueness while preserving order
-                existing = params["names"]
-                for name in heuristic_params["names"]:
-                    if name not in existing:
-                        existing.append(name)
-                params["names"] = existing
+                merged = heuristic_params["names"]
+            params["names"] = list(dict.fromkeys(merged))
         
         # Clean name lists to remove instruction-like entries
         if params.get("names"):
-            cleaned_names = []
-            for name in params["names"]:
-                lower_name = name.lower().strip()
-                if any(lower_name.startswith(k) for k in INSTRUCTION_KEYWORDS):
-                    continue
-                cleaned_names.append(name)
+            cleaned_names = [
+                name for name in params["names"]
+                if not name.lower().strip().startswith(INSTRUCTION_KEYWORDS_TUPLE)
+            ]
             if cleaned_names:
                 params["names"] = cleaned_names
             else:
@@ -255,18 +240,18 @@ class ParameterExtractor:
         # Normalize synonymous fields
         if "status" not in params and "progress" in params:
             progress_val = params.pop("progress")
-            params["status"] = ParameterExtractor.normalize_status_value(progress_val) if isinstance(progress_val, str) else progress_val
+            params["status"] = normalize_status_value(progress_val) if isinstance(progress_val, str) else progress_val
         
         if "backlog_progress" in params:
             backlog_val = params.pop("backlog_progress")
-            params["status"] = ParameterExtractor.normalize_status_value(backlog_val)
+            params["status"] = normalize_status_value(backlog_val)
         
         if "backlog_modal" in params:
             backlog_val = params.pop("backlog_modal")
-            params["status"] = ParameterExtractor.normalize_status_value(backlog_val)
+            params["status"] = normalize_status_value(backlog_val)
         
         if "status" in params and isinstance(params["status"], str):
-            params["status"] = ParameterExtractor.normalize_status_value(params["status"])
+            params["status"] = normalize_status_value(params["status"])
         
         if "target_date" in params and isinstance(params["target_date"], str):
             params["target_date"] = params["target_date"].strip().rstrip(".")
@@ -292,4 +277,13 @@ class ParameterExtractor:
         if not params.get("names") and params.get("count", 1) <= 1:
             params.pop("count", None)
         
-        return is_multi
\ No newline at end of file
+        return is_multi
+
+
+# Post-processing applied to each raw value captured by COMBINED_PARAM_RE
+_PARAM_POSTPROCESSORS = {
+    "status": lambda raw: normalize_status_value(clean_value_phrase(raw)),
+    "target_date": lambda raw: clean_value_phrase(raw).rstrip('.').title(),
+    "priority": lambda raw: clean_value_phrase(raw).title(),
+    "description": lambda raw: clean_value_phrase(raw).rstrip("."),
+}
@@ -5,17 +5,59 @@ Orchestrates the parsing of natural language queries into structured task config
 Combines LLM-based intent parsing with heuristic parameter extraction.
 """
 
+import asyncio
+import copy
 import json
-from typing import Dict, Optional, List
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional, List, Tuple
 import google.generativeai as genai
 from dotenv import load_dotenv
 
-from .app_config import APP_MAPPINGS
+from .app_config import (
+    APP_MAPPINGS, APP_KEYWORD_SCANNER, APP_KEYWORD_SETS, OBJECT_TO_NAME_PARAM, WORD_TOKEN_RE,
+    match_keyword_group
+)
 from .parameter_extractors import ParameterExtractor
 from .task_builder import TaskBuilder
+from .rate_limiter import AsyncTokenBucket
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+INTENT_SYSTEM_INSTRUCTION = """Parse web automation queries into task intents.
+
+Each query comes with the app it targets. Extract: ACTION, OBJECT, GOAL, task_name, description, expected_steps, success_criteria, parameters.
+For multi-task: detect QUANTITY/SERIES and set is_multi_task: true.
+
+JSON format:
+SINGLE: {"action": "create", "object": "project", "goal": "Create project 'X' in <app>", "task_name": "Create Project", "description": "Navigate and create project", "expected_steps": 7, "success_criteria": ["Project appears"], "parameters": {"project_name": "X"}, "is_multi_task": false}
+
+MULTI: {"action": "create", "object": "project", "goal": "Create N projects in <app>", "task_name": "Create Projects", "description": "Navigate and create multiple projects", "expected_steps": "N*7", "success_criteria": ["All projects appear"], "parameters": {"count": N, "names": ["X", "Y"]}, "is_multi_task": true}
+
+Rules: Quantity → multi-task. Single names → project_name. Lists → names. Output JSON only."""
+
+# Larger batches start to cost parsing accuracy
+MAX_BATCH_SIZE = 16
+
+# Gemini intents remembered per parser, keyed by normalised (app, query)
+INTENT_CACHE_SIZE = 4096
+INTENT_CACHE_TTL_SECONDS = 3600
+_TRAILING_PUNCTUATION_RE = re.compile(r"[\s.!?]+$")
+_JSON_DECODER = json.JSONDecoder()
+
+# Trailing "in Linear"-style app mentions the heuristic name patterns capture
+_APP_SUFFIX_RE = re.compile(
+    r"\s+(?:in|on|using)\s+(?:"
+    + "|".join(re.escape(k) for info in APP_MAPPINGS.values() for k in info["keywords"])
+    + r")\W*$",
+    re.IGNORECASE
+)
+_NAME_PARAMETER_KEYS = (*OBJECT_TO_NAME_PARAM.values(), "name")
+
 
 class TaskParser:
     """
@@ -30,91 +72,299 @@ class TaskParser:
             gemini_api_key: Gemini API key
         """
         genai.configure(api_key=gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        print("✅ Task Parser initialized with Gemini")
+        # Static instructions live in the system prompt so each call only
+        # sends the query; JSON mode returns the intent without fences
+        self.model = genai.GenerativeModel(
+            'gemini-2.0-flash-exp',
+            system_instruction=INTENT_SYSTEM_INSTRUCTION,
+            generation_config={'response_mime_type': 'application/json', 'temperature': 0.0}
+        )
+        self._intent_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+        logger.debug("✅ Task Parser initialized with Gemini")
     
-    def parse_query(self, query: str) -> Dict:
+    def parse_query(self, query: str, force_llm: bool = False) -> Dict:
         """
         Parse natural language query into task configuration
+
+        Templated queries the heuristics fully cover skip the Gemini call.
         
         Args:
             query: Natural language query (e.g., "How do I create a project in Linear?")
+            force_llm: Always consult Gemini, even for fully covered queries
             
         Returns:
             Task configuration dictionary ready for agent.execute_dynamic_task()
         """
-        print(f"\n{'='*70}")
-        print(f"🔍 PARSING QUERY")
-        print(f"{'='*70}")
-        print(f"Query: {query}")
-        print(f"{'='*70}\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("\n%s\n🔍 PARSING QUERY\n%s\nQuery: %s\n%s\n", "=" * 70, "=" * 70, query, "=" * 70)
         
+        # Lowercase once; every scanner below reuses it
+        query_lower = query.lower()
+
         # Extract app from query
-        app_info = self._identify_app(query)
+        app_info = self._identify_app(query, query_lower)
         
         if not app_info:
-            print("❌ Could not identify app from query")
-            print("Available apps: Linear, Notion, Asana")
+            logger.error("❌ Could not identify app from query (available apps: Linear, Notion, Asana)")
             return None
         
-        print(f"✅ Identified app: {app_info['name'].upper()}")
+        logger.debug("✅ Identified app: %s", app_info['name'].upper())
         
-        # Use Gemini to parse the query intent
-        task_intent = self._parse_intent_with_gemini(query, app_info['name'])
+        task_intent = None if force_llm else self._confident_heuristic_intent(query, app_info['name'], query_lower)
+        if not task_intent:
+            # Use Gemini to parse the query intent
+            task_intent = self._parse_intent_with_gemini(query, app_info['name'])
+
+        return self._finalise_task_config(task_intent, query, app_info, query_lower)
 
+    async def parse_query_async(
+        self,
+        query: str,
+        force_llm: bool = False,
+        rate_limiter: Optional[AsyncTokenBucket] = None
+    ) -> Dict:
+        """
+        Async variant of parse_query
+
+        The Gemini round-trip is awaited instead of blocking, so many queries
+        can be parsed concurrently on one event loop.
+        
+        Args:
+            query: Natural language query
+            force_llm: Always consult Gemini, even for fully covered queries
+            rate_limiter: Token bucket to wait on before an actual Gemini call
+            
+        Returns:
+            Task configuration dictionary, or None if parsing failed
+        """
+        logger.debug("🔍 PARSING QUERY (async): %s", query)
+
+        query_lower = query.lower()
+        app_info = self._identify_app(query, query_lower)
+        if not app_info:
+            logger.error("❌ Could not identify app from query: %s", query)
+            return None
+
+        task_intent = None if force_llm else self._confident_heuristic_intent(query, app_info['name'], query_lower)
         if not task_intent:
-            print("❌ Could not parse task intent")
+            task_intent = await self._parse_intent_with_gemini_async(query, app_info['name'], rate_limiter)
+
+        return self._finalise_task_config(task_intent, query, app_info, query_lower)
+
+    async def parse_queries_parallel(
+        self,
+        queries: List[str],
+        max_concurrency: int = 16,
+        requests_per_minute: int = 60
+    ) -> List[Optional[Dict]]:
+        """
+        Parse queries concurrently with bounded parallelism
+
+        A semaphore caps in-flight Gemini calls and a token bucket keeps the
+        request rate under the per-minute quota to avoid 429 responses.
+        Cache hits and heuristically covered queries never take a token.
+        
+        Args:
+            queries: Natural language queries
+            max_concurrency: Maximum simultaneous Gemini calls
+            requests_per_minute: Request rate allowed by the API quota
+            
+        Returns:
+            Task configurations in input order (None where parsing failed)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        bucket = AsyncTokenBucket(requests_per_minute)
+
+        async def parse_one(query: str) -> Optional[Dict]:
+            async with semaphore:
+                return await self.parse_query_async(query, rate_limiter=bucket)
+
+        results = await asyncio.gather(*(parse_one(q) for q in queries), return_exceptions=True)
+        parsed = []
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                logger.warning("⚠️ Failed to parse query '%s': %s", query, result)
+                result = None
+            parsed.append(result)
+        return parsed
+
+    def parse_queries(
+        self,
+        queries: List[str],
+        batch_size: int = 8,
+        force_llm: bool = False
+    ) -> List[Optional[Dict]]:
+        """
+        Parse several queries, packing up to batch_size into each Gemini call
+
+        The shared instructions are sent once per batch and Gemini answers
+        with a JSON array aligned to the enumerated queries. A batch whose
+        answer cannot be aligned is re-parsed one query at a time. As in
+        parse_query, templated queries the heuristics fully cover skip Gemini.
+        
+        Args:
+            queries: Natural language queries
+            batch_size: Queries per Gemini call (capped at MAX_BATCH_SIZE)
+            force_llm: Always consult Gemini, even for fully covered queries
+            
+        Returns:
+            Task configurations in input order (None where parsing failed)
+        """
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        lowered = [query.lower() for query in queries]
+        app_infos = [self._identify_app(query, query_lower) for query, query_lower in zip(queries, lowered)]
+        intents: List[Optional[Dict]] = [None] * len(queries)
+
+        pending = []
+        for i, app_info in enumerate(app_infos):
+            if app_info:
+                if not force_llm:
+                    intents[i] = self._confident_heuristic_intent(queries[i], app_info['name'], lowered[i])
+                if not intents[i]:
+                    intents[i] = self._get_cached_intent(queries[i], app_info['name'])
+                if not intents[i]:
+                    pending.append(i)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            items = [(queries[i], app_infos[i]['name']) for i in batch]
+            for i, intent in zip(batch, self._parse_intent_batch(items)):
+                intents[i] = intent
+
+        results = []
+        for query, query_lower, app_info, intent in zip(queries, lowered, app_infos, intents):
+            if not app_info:
+                logger.error("❌ Could not identify app from query: %s", query)
+                results.append(None)
+            else:
+                results.append(self._finalise_task_config(intent, query, app_info, query_lower))
+        return results
+
+    def _parse_intent_batch(self, items: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+        """Parse (query, app) pairs with one Gemini call, falling back per query"""
+        if len(items) == 1:
+            return [self._parse_intent_with_gemini(*items[0])]
+
+        try:
+            response = self.model.generate_content(self._build_batch_intent_prompt(items))
+            decoded = self._decode_json_response(response.text)
+        except Exception as e:
+            logger.warning("⚠️ Error parsing batched intents with Gemini: %s", e)
+            decoded = None
+
+        if not isinstance(decoded, list) or len(decoded) != len(items):
+            logger.warning("⚠️ Batched intents did not line up with queries - parsing individually")
+            return [self._parse_intent_with_gemini(query, app) for query, app in items]
+
+        intents = []
+        for (query, app), intent in zip(items, decoded):
+            if isinstance(intent, dict):
+                intent = self._with_intent_defaults(intent)
+                self._store_intent(query, app, intent)
+            else:
+                intent = TaskBuilder.build_fallback_intent(query, app)
+            intents.append(intent)
+        return intents
+
+    @staticmethod
+    def _confident_heuristic_intent(query: str, app: str, query_lower: str) -> Optional[Dict]:
+        """
+        Return the heuristic intent when it fully describes the query
+
+        Confident means a known action, a known object and at least one
+        extracted parameter; anything less goes to Gemini.
+        """
+        heuristic = TaskBuilder.build_fallback_intent(query, app, query_lower)
+        params = heuristic["parameters"]
+        if heuristic["action"] == "navigate" or heuristic["object"] == "item" or not params:
+            return None
+
+        # Name/value patterns run to the end of the query and can swallow an
+        # "in <app>" tail; leave those ambiguous queries to Gemini
+        values = [v for v in params.values() if isinstance(v, str)] + list(params.get("names") or [])
+        if any(_APP_SUFFIX_RE.search(value) for value in values):
+            return None
+        if heuristic["action"] == "create" and not (
+            params.get("names") or params.get("name_pattern")
+            or any(key in params for key in _NAME_PARAMETER_KEYS)
+        ):
             return None
+        if "count" in params and "name_pattern" not in params and len(params.get("names") or []) != params["count"]:
+            return None
+
+        logger.debug("⚡ Query fully covered by heuristics - skipping Gemini")
+        return heuristic
+
+    def _finalise_task_config(
+        self,
+        task_intent: Optional[Dict],
+        query: str,
+        app_info: Dict,
+        query_lower: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Augment a parsed intent and build the task configuration"""
+        if not task_intent:
+            logger.error("❌ Could not parse task intent")
+            return None
+
+        if query_lower is None:
+            query_lower = query.lower()
 
         # Augment with heuristic extraction to ensure parameters are captured
         task_intent = self._augment_intent_with_heuristics(
             task_intent=task_intent,
             query=query,
-            app=app_info['name']
+            app=app_info['name'],
+            query_lower=query_lower
         )
 
         # Reconcile intent so project-centric queries stay in project workflow
         task_intent = TaskBuilder.enforce_project_intent(
             task_intent=task_intent,
             query=query,
-            app=app_info['name']
+            app=app_info['name'],
+            query_lower=query_lower
         )
         
-        print(f"✅ Parsed intent:")
-        print(f"   Goal: {task_intent['goal']}")
-        print(f"   Action: {task_intent['action']}")
-        print(f"   Object: {task_intent['object']}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "✅ Parsed intent:\n   Goal: %s\n   Action: %s\n   Object: %s",
+                task_intent['goal'], task_intent['action'], task_intent['object']
+            )
         
         # Build task configuration
         task_config = TaskBuilder.build_task_config(task_intent, app_info, query)
         
-        print(f"\n✅ Task configuration generated:")
-        print(f"   Task ID: {task_config['task_id']}")
-        print(f"   Start URL: {task_config['start_url']}")
-        print(f"   Max steps: {task_config['max_steps']}")
-        print(f"{'='*70}\n")
+        logger.info("✅ Task configuration generated: %s", task_config['task_id'])
+        logger.debug(
+            "   Start URL: %s\n   Max steps: %s",
+            task_config['start_url'], task_config['max_steps']
+        )
         
         return task_config
     
-    def _identify_app(self, query: str) -> Optional[Dict]:
+    def _identify_app(self, query: str, query_lower: Optional[str] = None) -> Optional[Dict]:
         """
         Identify which app the query is about
         
         Args:
             query: Natural language query
+            query_lower: query.lower(), if the caller already computed it
             
         Returns:
             App info dictionary or None
         """
-        query_lower = query.lower()
-        
-        # Check each app's keywords
-        for app_name, app_info in APP_MAPPINGS.items():
-            for keyword in app_info['keywords']:
-                if keyword in query_lower:
-                    return app_info
-        
-        return None
+        # Whole-word keywords settle it with a set intersection; apps keep
+        # their APP_MAPPINGS priority
+        if query_lower is None:
+            query_lower = query.lower()
+        tokens = set(WORD_TOKEN_RE.findall(query_lower))
+        for app_name, keywords in APP_KEYWORD_SETS.items():
+            if tokens & keywords:
+                return APP_MAPPINGS[app_name]
+
+        # Keywords embedded in longer words still match by substring
+        app_name = match_keyword_group(APP_KEYWORD_SCANNER, query_lower)
+        return APP_MAPPINGS[app_name] if app_name else None
     
     def _parse_intent_with_gemini(self, query: str, app: str) -> Optional[Dict]:
         """
@@ -127,52 +377,134 @@ class TaskParser:
         Returns:
             Intent dictionary with goal, action, object, parameters, etc.
         """
-        prompt = f"""Parse this query for web automation:
-Query: "{query}"
-App: {app}
-
-Extract: ACTION, OBJECT, GOAL, task_name, description, expected_steps, success_criteria, parameters.
-For multi-task: detect QUANTITY/SERIES and set is_multi_task: true.
-
-JSON format:
-SINGLE: {{"action": "create", "object": "project", "goal": "Create project 'X' in {app}", "task_name": "Create Project", "description": "Navigate and create project", "expected_steps": 7, "success_criteria": ["Project appears"], "parameters": {{"project_name": "X"}}, "is_multi_task": false}}
-
-MULTI: {{"action": "create", "object": "project", "goal": "Create N projects in {app}", "task_name": "Create Projects", "description": "Navigate and create multiple projects", "expected_steps": "N*7", "success_criteria": ["All projects appear"], "parameters": {{"count": N, "names": ["X", "Y"]}}, "is_multi_task": true}}
+        cached = self._get_cached_intent(query, app)
+        if cached:
+            return cached
 
-Rules: Quantity → multi-task. Single names → project_name. Lists → names. Output JSON only."""
-        
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Extract JSON from response (handle markdown code blocks)
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = response_text
-            
-            # Parse JSON
-            intent = json.loads(json_str)
-            
-            # Ensure parameters field exists
-            if "parameters" not in intent:
-                intent["parameters"] = {}
-            
-            # Ensure is_multi_task field exists
-            if "is_multi_task" not in intent:
-                intent["is_multi_task"] = False
-            
+            response = self.model.generate_content(self._build_intent_prompt(query, app))
+            intent = self._intent_from_response(response.text, query, app)
+            self._store_intent(query, app, intent)
             return intent
-            
         except Exception as e:
-            print(f"⚠️ Error parsing intent with Gemini: {e}")
+            logger.warning("⚠️ Error parsing intent with Gemini: %s", e)
             
             # Fallback: basic parsing
             return TaskBuilder.build_fallback_intent(query, app)
 
-    def _augment_intent_with_heuristics(self, task_intent: Dict, query: str, app: str) -> Dict:
+    async def _parse_intent_with_gemini_async(
+        self,
+        query: str,
+        app: str,
+        rate_limiter: Optional[AsyncTokenBucket] = None
+    ) -> Optional[Dict]:
+        """Async variant of _parse_intent_with_gemini using generate_content_async"""
+        cached = self._get_cached_intent(query, app)
+        if cached:
+            return cached
+
+        try:
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            response = await self.model.generate_content_async(self._build_intent_prompt(query, app))
+            intent = self._intent_from_response(response.text, query, app)
+            self._store_intent(query, app, intent)
+            return intent
+        except Exception as e:
+            logger.warning("⚠️ Error parsing intent with Gemini: %s", e)
+            return TaskBuilder.build_fallback_intent(query, app)
+
+    @staticmethod
+    def _intent_cache_key(query: str, app: str) -> Tuple[str, str]:
+        """
+        Normalise a query for intent caching
+
+        Whitespace runs and trailing punctuation are ignored. Case is kept
+        because names inside the query ("project Foo") are case-sensitive.
+        """
+        return app.lower(), _TRAILING_PUNCTUATION_RE.sub("", " ".join(query.split()))
+
+    def _get_cached_intent(self, query: str, app: str) -> Optional[Dict]:
+        """Return a copy of a fresh cached Gemini intent, if any"""
+        key = self._intent_cache_key(query, app)
+        entry = self._intent_cache.get(key)
+        if not entry:
+            return None
+        stored_at, intent = entry
+        if time.monotonic() - stored_at > INTENT_CACHE_TTL_SECONDS:
+            del self._intent_cache[key]
+            return None
+        self._intent_cache.move_to_end(key)
+        logger.debug("⚡ Intent cache hit - skipping Gemini")
+        return copy.deepcopy(intent)
+
+    def _store_intent(self, query: str, app: str, intent: Dict) -> None:
+        """Remember a Gemini intent; later stages mutate theirs, so keep a copy"""
+        key = self._intent_cache_key(query, app)
+        self._intent_cache[key] = (time.monotonic(), copy.deepcopy(intent))
+        self._intent_cache.move_to_end(key)
+        if len(self._intent_cache) > INTENT_CACHE_SIZE:
+            self._intent_cache.popitem(last=False)
+
+    @staticmethod
+    def _build_intent_prompt(query: str, app: str) -> str:
+        """Build the intent-parsing prompt for a single query"""
+        return f"""Query: "{query}"
+App: {app}
+
+Output one JSON object."""
+
+    @staticmethod
+    def _build_batch_intent_prompt(items: List[Tuple[str, str]]) -> str:
+        """Build one intent-parsing prompt covering several queries"""
+        numbered = "\n".join(
+            f'{n}. Query: "{query}" (App: {app})' for n, (query, app) in enumerate(items, 1)
+        )
+        return f"""Queries:
+{numbered}
+
+Output a JSON array with exactly {len(items)} objects in query order."""
+
+    @staticmethod
+    def _decode_json_response(response_text: str):
+        """
+        Decode the first JSON object or array in a Gemini response
+
+        Works the same for fenced and bare output and ignores any prose
+        Gemini adds before or after the JSON body.
+        """
+        starts = [i for i in (response_text.find("{"), response_text.find("[")) if i != -1]
+        if not starts:
+            raise ValueError("No JSON found in Gemini response")
+        decoded, _end = _JSON_DECODER.raw_decode(response_text, min(starts))
+        return decoded
+
+    @staticmethod
+    def _intent_from_response(response_text: str, query: str, app: str) -> Dict:
+        """Decode Gemini's JSON intent, filling in required defaults"""
+        intent = TaskParser._decode_json_response(response_text)
+        return TaskParser._with_intent_defaults(intent)
+
+    @staticmethod
+    def _with_intent_defaults(intent: Dict) -> Dict:
+        """Ensure the fields later stages rely on are present"""
+        # Ensure parameters field exists
+        if "parameters" not in intent:
+            intent["parameters"] = {}
+        
+        # Ensure is_multi_task field exists
+        if "is_multi_task" not in intent:
+            intent["is_multi_task"] = False
+        
+        return intent
+
+    def _augment_intent_with_heuristics(
+        self,
+        task_intent: Dict,
+        query: str,
+        app: str,
+        query_lower: Optional[str] = None
+    ) -> Dict:
         """
         Combine LLM intent with heuristic extraction to ensure parameters are captured.
         
@@ -180,16 +512,34 @@ Rules: Quantity → multi-task. Single names → project_name. Lists → names.
             task_intent: Intent parsed by Gemini (may be missing parameters)
             query: Original natural language query
             app: Target application name
+            query_lower: query.lower(), if the caller already computed it
         
         Returns:
             Augmented intent dictionary
         """
+        if query_lower is None:
+            query_lower = query.lower()
+
+        # Gemini already named the item(s), settled a multi-task flag that agrees
+        # with the names/count and the query has no status/date/priority
+        # phrases: nothing left to add
+        params = task_intent.get("parameters") or {}
+        name_key = OBJECT_TO_NAME_PARAM.get(task_intent.get("object"), "name")
+        if (
+            isinstance(task_intent.get("is_multi_task"), bool)
+            and not ParameterExtractor.mentions_additional_parameters(query_lower)
+        ):
+            fast_params = self._settled_parameters(params, name_key, task_intent["is_multi_task"])
+            if fast_params is not None:
+                task_intent["parameters"] = ParameterExtractor.normalize_parameter_synonyms(fast_params)
+                return task_intent
+
         # Ensure required keys exist
         task_intent.setdefault("parameters", {})
         task_intent.setdefault("is_multi_task", False)
         
         # Use fallback parser to extract structured parameters
-        heuristic_intent = TaskBuilder.build_fallback_intent(query, app)
+        heuristic_intent = TaskBuilder.build_fallback_intent(query, app, query_lower)
         if not heuristic_intent:
             return task_intent
         
@@ -207,7 +557,7 @@ Rules: Quantity → multi-task. Single names → project_name. Lists → names.
         task_intent["is_multi_task"] = is_multi
         
         # Merge additional structured parameters (status, dates, etc.)
-        additional_params = ParameterExtractor.extract_additional_parameters(query)
+        additional_params = ParameterExtractor.extract_additional_parameters(query, query_lower)
         for key, value in additional_params.items():
             if key not in params:
                 params[key] = value
@@ -220,6 +570,32 @@ Rules: Quantity → multi-task. Single names → project_name. Lists → names.
         
         return task_intent
 
+    @staticmethod
+    def _settled_parameters(params: Dict, name_key: str, is_multi: bool) -> Optional[Dict]:
+        """
+        Return Gemini's parameters when they need no heuristic merge, else None.
+
+        A single-item ``names`` list is folded into ``name_key``; a multi-item
+        list must come with a matching ``count`` and a multi-task flag.
+        """
+        names = params.get("names")
+        if names:
+            if len(names) == 1:
+                if is_multi or (params.get(name_key) and params[name_key] != names[0]):
+                    return None
+                params = {k: v for k, v in params.items() if k not in ("names", "count")}
+                params[name_key] = names[0]
+                return params
+            if is_multi and params.get("count") == len(names):
+                return params
+            return None
+        if not params.get(name_key):
+            return None
+        count = params.get("count", 1)
+        if not isinstance(count, int) or (count > 1) != is_multi:
+            return None
+        return params
+
     def validate_task_config(self, task_config: Dict) -> bool:
         """
         Validate that a task config has all required fields
@@ -242,4 +618,16 @@ Rules: Quantity → multi-task. Single names → project_name. Lists → names.
         Returns:
             List of individual task configurations
         """
-        return TaskBuilder.expand_multi_task(task_config)
\ No newline at end of file
+        return TaskBuilder.expand_multi_task(task_config)
+    
+    def expand_multi_task_iter(self, task_config: Dict) -> Iterator[Dict]:
+        """
+        Lazily yield individual task configurations from a multi-task config
+        
+        Args:
+            task_config: Multi-task configuration
+            
+        Yields:
+            Individual task configurations
+        """
+        return TaskBuilder.expand_multi_task_iter(task_config)
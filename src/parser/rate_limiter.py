@@ -0,0 +1,37 @@
+"""
+Async Rate Limiting
+
+Token bucket used to keep concurrent Gemini calls under a
+requests-per-minute quota.
+"""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """Token bucket that refills continuously at a requests-per-minute rate"""
+
+    def __init__(self, requests_per_minute: int, burst: int = None):
+        """
+        Args:
+            requests_per_minute: Sustained request rate to allow
+            burst: Maximum tokens held at once (defaults to one second's worth, min 1)
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst or max(1, int(self.rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
@@ -5,10 +5,20 @@ Contains task building logic for creating structured task configurations
 from parsed intents and parameters.
 """
 
+import copy
+import logging
 import re
-from datetime import datetime
-from typing import Dict, List, Optional
-from .app_config import APP_MAPPINGS, ACTION_KEYWORDS, OBJECT_KEYWORDS, DEFAULT_CONFIG
+import time
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+from .app_config import (
+    APP_MAPPINGS, DEFAULT_CONFIG, OBJECT_TO_NAME_PARAM, ACTION_KEYWORD_RE, OBJECT_KEYWORD_RE
+)
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_INTENT_CACHE_SIZE = 1024
+_ID_SANITIZE_RE = re.compile(r'[^a-z0-9]')
 
 
 class TaskBuilder:
@@ -61,115 +71,58 @@ class TaskBuilder:
         """
         action = intent['action']
         obj = intent['object']
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # Local wall-clock seconds plus a nanosecond suffix, so IDs generated
+        # within the same second stay unique
+        ts_ns = time.time_ns()
+        lt = time.localtime(ts_ns // 1_000_000_000)
+        timestamp = (
+            f"{lt.tm_year:04d}{lt.tm_mon:02d}{lt.tm_mday:02d}_"
+            f"{lt.tm_hour:02d}{lt.tm_min:02d}{lt.tm_sec:02d}_{ts_ns % 1_000_000_000:09d}"
+        )
         
         # Clean strings for ID
-        action_clean = re.sub(r'[^a-z0-9]', '_', action.lower())
-        obj_clean = re.sub(r'[^a-z0-9]', '_', obj.lower())
+        action_clean = _ID_SANITIZE_RE.sub('_', action.lower())
+        obj_clean = _ID_SANITIZE_RE.sub('_', obj.lower())
         
         return f"{app}_{action_clean}_{obj_clean}_{timestamp}"
 
     @staticmethod
-    def build_fallback_intent(query: str, app: str) -> Dict:
+    def build_fallback_intent(query: str, app: str, query_lower: Optional[str] = None) -> Dict:
         """
         Build fallback intent when LLM parsing fails
         
         Args:
             query: Natural language query
             app: App name
+            query_lower: query.lower(), if the caller already computed it
             
         Returns:
             Basic intent dictionary with extracted parameters
         """
-        from .parameter_extractors import ParameterExtractor
-        
-        query_lower = query.lower()
-        
-        # Detect action
-        action = TaskBuilder._detect_action(query_lower)
-        
-        # Detect object
-        obj = TaskBuilder._detect_object(query_lower)
-        
-        # Extract parameters with multi-task support
-        count, extracted_names, is_multi_task = ParameterExtractor.extract_quantity_and_names(query, obj)
-        
-        parameters = {}
-        
-        # Set count if multi-task
-        if is_multi_task and count > 1:
-            parameters["count"] = count
-        
-        # Set names based on extraction
-        if extracted_names:
-            if len(extracted_names) > 1:
-                is_multi_task = True
-                parameters["names"] = extracted_names
-                parameters["count"] = len(extracted_names)
-            else:
-                # Single name - map to appropriate parameter
-                name_params = ParameterExtractor.extract_names_by_object_type(extracted_names, obj)
-                parameters.update(name_params)
-        
-        # If we detected count but no names, generate pattern
-        if is_multi_task and "names" not in parameters and count > 1:
-            name_pattern = ParameterExtractor.generate_name_pattern_if_needed(query, obj, count, bool(extracted_names))
-            if name_pattern:
-                parameters["names"] = [name_pattern.replace('{i}', str(i)) for i in range(1, count + 1)]
-                parameters["name_pattern"] = name_pattern
-        
-        # Extract additional parameters like status or dates
-        additional_params = ParameterExtractor.extract_additional_parameters(query)
-        for key, value in additional_params.items():
-            if value:
-                parameters[key] = value
-
-        # Build goal and description
-        if is_multi_task:
-            goal = f"{action.title()} {count} {obj}s in {app}"
-            description = f"Navigate to {app} and {action} {count} {obj}s"
-            expected_steps = 8 * count  # Multiply by count
-        else:
-            goal = f"{action.title()} {obj} in {app}"
-            description = f"Navigate to {app} and {action} a {obj}"
-            expected_steps = 8
-        
-        return {
-            "action": action,
-            "object": obj,
-            "goal": goal,
-            "task_name": f"{action.title()} {obj.title()} in {app.title()}",
-            "description": description,
-            "expected_steps": expected_steps,
-            "success_criteria": [
-                f"{obj.title()} {action} completed successfully"
-            ],
-            "parameters": parameters,
-            "is_multi_task": is_multi_task
-        }
+        # Memoized per query: the parser asks for the same fallback several
+        # times per parse. Copy so callers can mutate their intent freely.
+        if query_lower is None:
+            query_lower = query.lower()
+        return copy.deepcopy(_build_fallback_intent_cached(query, app, query_lower))
 
     @staticmethod
     def _detect_action(query_lower: str) -> str:
         """Detect action from query text"""
-        for action, keywords in ACTION_KEYWORDS.items():
-            if any(keyword in query_lower for keyword in keywords):
-                return action
-        return "navigate"
+        match = ACTION_KEYWORD_RE.match(query_lower)
+        return match.lastgroup if match else "navigate"
 
     @staticmethod
     def _detect_object(query_lower: str) -> str:
         """Detect object from query text"""
-        for obj, keywords in OBJECT_KEYWORDS.items():
-            if any(keyword in query_lower for keyword in keywords):
-                return obj
-        return "item"
+        match = OBJECT_KEYWORD_RE.match(query_lower)
+        return match.lastgroup if match else "item"
 
     @staticmethod
-    def enforce_project_intent(task_intent: Dict, query: str, app: str) -> Dict:
+    def enforce_project_intent(task_intent: Dict, query: str, app: str, query_lower: Optional[str] = None) -> Dict:
         """Ensure project queries stay in project workflow."""
-        from .parameter_extractors import ParameterExtractor
-        
-        query_lower = query.lower()
+        if query_lower is None:
+            query_lower = query.lower()
         mentions_project = "project" in query_lower or "projects" in query_lower
         if not mentions_project:
             return task_intent
@@ -191,7 +144,7 @@ class TaskBuilder:
 
         if should_create:
             if not project_name:
-                extracted = TaskBuilder.build_fallback_intent(query, app)
+                extracted = TaskBuilder.build_fallback_intent(query, app, query_lower)
                 if extracted and extracted.get("parameters", {}).get("project_name"):
                     project_name = extracted["parameters"]["project_name"]
                     params["project_name"] = project_name
@@ -224,58 +177,62 @@ class TaskBuilder:
         Returns:
             List of individual task configurations
         """
-        if not task_config.get('is_multi_task', False):
-            return [task_config]
+        return list(TaskBuilder.expand_multi_task_iter(task_config))
+
+    @staticmethod
+    def expand_multi_task_iter(task_config: Dict) -> Iterator[Dict]:
+        """
+        Lazily yield the individual task configurations of a multi-task config
         
+        Args:
+            task_config: Multi-task configuration
+            
+        Yields:
+            Individual task configurations, one per requested item
+        """
         parameters = task_config.get('parameters', {})
         count = parameters.get('count', 1)
-        names = parameters.get('names', [])
         
-        if count <= 1:
-            return [task_config]
+        if not task_config.get('is_multi_task', False) or count <= 1:
+            yield task_config
+            return
         
-        individual_tasks = []
+        names = parameters.get('names', [])
+        name_pattern = parameters.get('name_pattern')
+        
+        # Invariant across items
+        base_id = task_config['task_id']
+        app = task_config['app']
+        obj = task_config['object']
+        obj_title = obj.title()
+        name_key = OBJECT_TO_NAME_PARAM.get(obj, "name")
+        expected_steps = task_config['expected_steps'] // count
         
         for i in range(count):
-            individual_task = task_config.copy()
-            individual_task['is_multi_task'] = False
-            individual_task['task_id'] = f"{task_config['task_id']}_part_{i+1}"
-            
-            individual_params = {}
-            
             if names and i < len(names):
                 task_name = names[i]
-            elif 'name_pattern' in parameters:
-                task_name = parameters['name_pattern'].replace('{i}', str(i+1))
-            else:
-                obj = task_config['object']
-                task_name = f"{obj.title()} {i+1}"
-            
-            obj = task_config['object']
-            if obj == "project":
-                individual_params["project_name"] = task_name
-            elif obj == "page":
-                individual_params["page_name"] = task_name
-            elif obj == "database":
-                individual_params["database_name"] = task_name
-            elif obj == "issue":
-                individual_params["issue_title"] = task_name
+            elif name_pattern is not None:
+                task_name = name_pattern.replace('{i}', str(i+1))
             else:
-                individual_params["name"] = task_name
+                task_name = f"{obj_title} {i+1}"
             
-            individual_task['parameters'] = individual_params
-            individual_task['goal'] = f"Create {obj} named '{task_name}' in {task_config['app']}"
-            individual_task['description'] = f"Navigate to {task_config['app']} and create {obj} named '{task_name}'"
-            individual_task['name'] = f"Create {obj.title()}: {task_name}"
-            individual_task['expected_steps'] = task_config['expected_steps'] // count
-            individual_task['success_criteria'] = [
-                f"{obj.title()} appears in list",
-                f"{obj.title()} name is '{task_name}'"
-            ]
+            individual_params = {name_key: task_name}
             
-            individual_tasks.append(individual_task)
-        
-        return individual_tasks
+            # One dict per item, built directly over the shared fields
+            yield {
+                **task_config,
+                'is_multi_task': False,
+                'task_id': f"{base_id}_part_{i+1}",
+                'parameters': individual_params,
+                'goal': f"Create {obj} named '{task_name}' in {app}",
+                'description': f"Navigate to {app} and create {obj} named '{task_name}'",
+                'name': f"Create {obj_title}: {task_name}",
+                'expected_steps': expected_steps,
+                'success_criteria': [
+                    f"{obj_title} appears in list",
+                    f"{obj_title} name is '{task_name}'"
+                ],
+            }
 
     @staticmethod
     def validate_task_config(task_config: Dict) -> bool:
@@ -298,7 +255,76 @@ class TaskBuilder:
         
         for field in required_fields:
             if field not in task_config:
-                print(f"❌ Missing required field: {field}")
+                logger.error("❌ Missing required field: %s", field)
                 return False
         
-        return True
\ No newline at end of file
+        return True
+
+
+@lru_cache(maxsize=FALLBACK_INTENT_CACHE_SIZE)
+def _build_fallback_intent_cached(query: str, app: str, query_lower: str) -> Dict:
+    """Heuristic intent behind TaskBuilder.build_fallback_intent; never mutate the result"""
+    from .parameter_extractors import ParameterExtractor
+    
+    # Detect action
+    action = TaskBuilder._detect_action(query_lower)
+    
+    # Detect object
+    obj = TaskBuilder._detect_object(query_lower)
+    
+    # Extract parameters with multi-task support
+    count, extracted_names, is_multi_task = ParameterExtractor.extract_quantity_and_names(query, obj, query_lower)
+    
+    parameters = {}
+    
+    # Set count if multi-task
+    if is_multi_task and count > 1:
+        parameters["count"] = count
+    
+    # Set names based on extraction
+    if extracted_names:
+        if len(extracted_names) > 1:
+            is_multi_task = True
+            parameters["names"] = extracted_names
+            parameters["count"] = len(extracted_names)
+        else:
+            # Single name - map to appropriate parameter
+            name_params = ParameterExtractor.extract_names_by_object_type(extracted_names, obj)
+            parameters.update(name_params)
+    
+    # If we detected count but no names, generate pattern
+    if is_multi_task and "names" not in parameters and count > 1:
+        name_pattern = ParameterExtractor.generate_name_pattern_if_needed(query, obj, count, bool(extracted_names))
+        if name_pattern:
+            # expand_multi_task_iter fills in {i} per item
+            parameters["name_pattern"] = name_pattern
+    
+    # Extract additional parameters like status or dates
+    additional_params = ParameterExtractor.extract_additional_parameters(query, query_lower)
+    for key, value in additional_params.items():
+        if value:
+            parameters[key] = value
+
+    # Build goal and description
+    if is_multi_task:
+        goal = f"{action.title()} {count} {obj}s in {app}"
+        description = f"Navigate to {app} and {action} {count} {obj}s"
+        expected_steps = 8 * count  # Multiply by count
+    else:
+        goal = f"{action.title()} {obj} in {app}"
+        description = f"Navigate to {app} and {action} a {obj}"
+        expected_steps = 8
+    
+    return {
+        "action": action,
+        "object": obj,
+        "goal": goal,
+        "task_name": f"{action.title()} {obj.title()} in {app.title()}",
+        "description": description,
+        "expected_steps": expected_steps,
+        "success_criteria": [
+            f"{obj.title()} {action} completed successfully"
+        ],
+        "parameters": parameters,
+        "is_multi_task": is_multi_task
+    }
@@ -6,26 +6,134 @@ Usage:
     python src/setup_auth.py
 """
 
+import asyncio
+import hashlib
+import json
+from contextlib import nullcontext
+from playwright.async_api import async_playwright, TimeoutError as AsyncPlaywrightTimeoutError
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 import os
+import re
+import shutil
+import socket
 import sys
+from typing import Optional
 
+VIEWPORT = {"width": 1920, "height": 1080}
 
-def _launch_manual_context(p, profile_name: str):
+# Chrome flags shared by the setup and verification launches
+LAUNCH_ARGS = (
+    "--start-maximized",
+    "--disable-blink-features=AutomationControlled",
+)
+IGNORE_DEFAULT_ARGS = ("--enable-automation",)
+
+# Profiles live on tmpfs during setup to keep Chrome's disk churn off the SSD
+PROFILE_RAM_ROOT = "/dev/shm/webagent"
+# Regenerable profile caches not worth copying back to auth/
+PROFILE_SYNC_IGNORE = shutil.ignore_patterns("Cache", "Code Cache", "GPUCache", "Service Worker", "*.tmp")
+
+# Session files and profiles all live under auth/
+os.makedirs("auth", exist_ok=True)
+
+# Elements that only render once the logged-in workspace shell is up
+LINEAR_READY_SELECTOR = 'nav, aside, [data-testid="sidebar"]'
+NOTION_READY_SELECTOR = '.notion-sidebar, nav, aside'
+
+# Both apps bounce logged-out visitors to a /login path
+LOGIN_URL_RE = re.compile(r"/login(\b|[/?#]|$)", re.IGNORECASE)
+
+
+def _launch_manual_context(p, profile_name: str, extra_args=()):
     """Launch Chrome with reduced automation fingerprints using a persistent profile."""
-    os.makedirs("auth", exist_ok=True)
-    profile_dir = os.path.join("auth", profile_name)
+    profile_dir = _working_profile_dir(profile_name)
     context = p.chromium.launch_persistent_context(
         user_data_dir=profile_dir,
         headless=False,
         channel="chrome",
-        viewport={"width": 1920, "height": 1080},
-        args=[
-            "--start-maximized",
-            "--disable-blink-features=AutomationControlled",
-        ],
-        ignore_default_args=["--enable-automation"],
+        viewport=VIEWPORT,
+        args=[*LAUNCH_ARGS, *extra_args],
+        ignore_default_args=list(IGNORE_DEFAULT_ARGS),
     )
+    _reduce_automation_fingerprints(context)
+    return context
+
+
+def _working_profile_dir(profile_name: str) -> str:
+    """
+    Return the user_data_dir Chrome should run from during setup.
+
+    On hosts with /dev/shm the profile lives in RAM, freshly seeded from the
+    copy under auth/ (any leftover from a crashed run is discarded, since it
+    may be older); _persist_profile writes it back once Chrome exits.
+    """
+    disk_dir = os.path.join("auth", profile_name)
+    if not os.path.isdir("/dev/shm"):
+        return disk_dir
+
+    ram_dir = os.path.join(PROFILE_RAM_ROOT, profile_name)
+    shutil.rmtree(ram_dir, ignore_errors=True)
+    if os.path.isdir(disk_dir):
+        shutil.copytree(disk_dir, ram_dir, ignore=PROFILE_SYNC_IGNORE)
+    return ram_dir
+
+
+def _persist_profile(profile_name: str) -> None:
+    """
+    Mirror a RAM-backed profile back to auth/ so the agent can reuse it
+
+    The copy goes to a temporary sibling that is swapped in whole, so files
+    Chrome deleted don't linger on disk and a failed copy leaves the old
+    profile intact.
+    """
+    ram_dir = os.path.join(PROFILE_RAM_ROOT, profile_name)
+    if not os.path.isdir(ram_dir):
+        return
+    disk_dir = os.path.join("auth", profile_name)
+    new_dir = disk_dir + ".new"
+    old_dir = disk_dir + ".old"
+    try:
+        shutil.rmtree(new_dir, ignore_errors=True)
+        shutil.copytree(ram_dir, new_dir, ignore=PROFILE_SYNC_IGNORE)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if os.path.isdir(disk_dir):
+            os.replace(disk_dir, old_dir)
+        os.replace(new_dir, disk_dir)
+    except (OSError, shutil.Error) as e:
+        print(f"⚠️  Could not persist {profile_name} to auth/: {e}")
+        return
+    shutil.rmtree(old_dir, ignore_errors=True)
+    shutil.rmtree(ram_dir, ignore_errors=True)
+
+
+def _free_port() -> int:
+    """Ask the OS for a TCP port nothing is listening on"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _retire_profile(profile_name: str) -> None:
+    """
+    Move auth/<profile> aside so the agent uses the fresh session file.
+
+    BrowserController prefers a persistent profile whenever one exists, so a
+    logged-out profile left from an earlier run would shadow the new session.
+    """
+    disk_dir = os.path.join("auth", profile_name)
+    if not os.path.isdir(disk_dir):
+        return
+    stale_dir = disk_dir + ".stale"
+    try:
+        shutil.rmtree(stale_dir, ignore_errors=True)
+        os.replace(disk_dir, stale_dir)
+        print(f"ℹ️  Moved old {profile_name} to {stale_dir}; the saved session will be used instead")
+    except OSError as e:
+        print(f"⚠️  Could not move aside {disk_dir}: {e}")
+
+
+def _reduce_automation_fingerprints(context) -> None:
+    """Hide the navigator.webdriver flag and stub window.chrome.runtime."""
     context.add_init_script(
         """
         Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
@@ -33,18 +141,108 @@ def _launch_manual_context(p, profile_name: str):
         window.chrome.runtime = window.chrome.runtime || {};
         """
     )
-    return context
 
 
-def setup_linear_auth():
-    """Login to Linear manually and save session"""
+def _save_storage_state(context, path: str) -> bool:
+    """
+    Write the context's storage state to `path` unless it is unchanged.
+
+    A `.sha1` sidecar holds the digest of the last write, so re-running setup
+    with the same session skips rewriting a potentially multi-MB file.
+
+    Returns:
+        True if the file was written
+    """
+    state = context.storage_state()
+    payload = json.dumps(state, sort_keys=True, indent=2)
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    sidecar = path + ".sha1"
+
+    try:
+        with open(sidecar) as handle:
+            if handle.read().strip() == digest and os.path.exists(path):
+                return False
+    except OSError:
+        pass
+
+    with open(path, "w") as handle:
+        handle.write(payload)
+    with open(sidecar, "w") as handle:
+        handle.write(digest)
+    return True
+
+
+class SharedChrome:
+    """
+    One Chrome instance for a whole setup run.
+
+    The first profile gets a persistent context launched with remote
+    debugging on a free port; later profiles attach over CDP and get a fresh
+    context in the same browser instead of booting another Chrome. Those
+    contexts don't write their profile directory, so session_saved() moves
+    any old one aside.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._primary = None
+        self._primary_profile = None
+        self._cdp_port = None
+        self._browser = None
+        self._attached_profiles = {}
+
+    def __enter__(self):
+        self._playwright = sync_playwright().start()
+        return self
+
+    def new_context(self, profile_name: str):
+        """Return a browser context for one app's login"""
+        if self._primary is None:
+            self._cdp_port = _free_port()
+            self._primary = _launch_manual_context(
+                self._playwright, profile_name, (f"--remote-debugging-port={self._cdp_port}",)
+            )
+            self._primary_profile = profile_name
+            return self._primary
+
+        if self._browser is None:
+            self._browser = self._playwright.chromium.connect_over_cdp(f"http://127.0.0.1:{self._cdp_port}")
+        context = self._browser.new_context(viewport=VIEWPORT)
+        _reduce_automation_fingerprints(context)
+        self._attached_profiles[id(context)] = profile_name
+        return context
+
+    def session_saved(self, context) -> None:
+        """Note that `context`'s session file was written"""
+        profile_name = self._attached_profiles.get(id(context))
+        if profile_name:
+            _retire_profile(profile_name)
+
+    def close_context(self, context) -> None:
+        """Close an attached context; the primary one lives until exit"""
+        if context is not self._primary:
+            self._attached_profiles.pop(id(context), None)
+            context.close()
+
+    def __exit__(self, *exc_info):
+        if self._browser is not None:
+            self._browser.close()
+        if self._primary is not None:
+            self._primary.close()
+            _persist_profile(self._primary_profile)
+        self._playwright.stop()
+        return False
+
+
+def setup_linear_auth(shared: Optional[SharedChrome] = None):
+    """Login to Linear manually and save session (in `shared` Chrome if given)"""
     print("\n" + "=" * 70)
     print("🔐 LINEAR AUTHENTICATION SETUP")
     print("=" * 70)
 
-    with sync_playwright() as p:
+    with nullcontext(shared) if shared else SharedChrome() as chrome:
         # Launch visible Chrome browser
-        context = _launch_manual_context(p, "linear_profile")
+        context = chrome.new_context("linear_profile")
         page = context.new_page()
 
         try:
@@ -67,22 +265,21 @@ def setup_linear_auth():
 
             # Verify login successful
             print("\n🔍 Verifying login...")
-            page.goto("https://linear.app", timeout=30000)
+            page.goto("https://linear.app", wait_until="domcontentloaded", timeout=15000)
             try:
-                page.wait_for_load_state("networkidle", timeout=30000)
+                # The app shell renders its sidebar once the session is live;
+                # networkidle never settles on these SPAs
+                page.wait_for_selector(LINEAR_READY_SELECTOR, timeout=8000)
             except PlaywrightTimeoutError:
-                print("⚠️  Linear page took too long to fully load; checking URL anyway.")
+                print("⚠️  Linear workspace did not render in time; checking URL anyway.")
 
             # Check if actually logged in (look for sidebar or workspace elements)
             try:
-                # Wait for any element that indicates we're logged in
-                page.wait_for_timeout(2000)  # Give page time to load
-
                 # Check current URL - if still on login page, failed
                 current_url = page.url
-                if "login" in current_url.lower():
+                if LOGIN_URL_RE.search(current_url):
                     print("\n❌ Still on login page - please try again")
-                    context.close()
+                    chrome.close_context(context)
                     return False
 
                 print("✅ Login verified!")
@@ -92,31 +289,31 @@ def setup_linear_auth():
                 print("Continuing anyway - if you're logged in, this should work")
 
             # Save authenticated state
-            os.makedirs("auth", exist_ok=True)
-            context.storage_state(path="auth/linear_session.json")
+            _save_storage_state(context, "auth/linear_session.json")
+            chrome.session_saved(context)
 
             print("\n" + "=" * 70)
             print("✅ LINEAR SESSION SAVED: auth/linear_session.json")
             print("=" * 70)
 
-            context.close()
+            chrome.close_context(context)
             return True
 
         except Exception as e:
             print(f"\n❌ Error during Linear setup: {e}")
-            context.close()
+            chrome.close_context(context)
             return False
 
 
-def setup_notion_auth():
-    """Login to Notion manually and save session"""
+def setup_notion_auth(shared: Optional[SharedChrome] = None):
+    """Login to Notion manually and save session (in `shared` Chrome if given)"""
     print("\n" + "=" * 70)
     print("🔐 NOTION AUTHENTICATION SETUP")
     print("=" * 70)
 
-    with sync_playwright() as p:
+    with nullcontext(shared) if shared else SharedChrome() as chrome:
         # Launch visible Chrome browser
-        context = _launch_manual_context(p, "notion_profile")
+        context = chrome.new_context("notion_profile")
         page = context.new_page()
 
         try:
@@ -139,21 +336,20 @@ def setup_notion_auth():
 
             # Verify login
             print("\n🔍 Verifying login...")
-            page.goto("https://www.notion.so", timeout=30000)
+            page.goto("https://www.notion.so", wait_until="domcontentloaded", timeout=15000)
             try:
-                page.wait_for_load_state("networkidle", timeout=30000)
+                # The app shell renders its sidebar once the session is live;
+                # networkidle never settles on these SPAs
+                page.wait_for_selector(NOTION_READY_SELECTOR, timeout=8000)
             except PlaywrightTimeoutError:
-                print("⚠️  Notion page took too long to fully load; checking URL anyway.")
+                print("⚠️  Notion workspace did not render in time; checking URL anyway.")
 
             try:
-                # Give page time to load
-                page.wait_for_timeout(2000)
-
                 # Check if still on login page
                 current_url = page.url
-                if "login" in current_url.lower():
+                if LOGIN_URL_RE.search(current_url):
                     print("\n❌ Still on login page - please try again")
-                    context.close()
+                    chrome.close_context(context)
                     return False
 
                 print("✅ Login verified!")
@@ -163,19 +359,19 @@ def setup_notion_auth():
                 print("Continuing anyway - if you're logged in, this should work")
 
             # Save authenticated state
-            os.makedirs("auth", exist_ok=True)
-            context.storage_state(path="auth/notion_session.json")
+            _save_storage_state(context, "auth/notion_session.json")
+            chrome.session_saved(context)
 
             print("\n" + "=" * 70)
             print("✅ NOTION SESSION SAVED: auth/notion_session.json")
             print("=" * 70)
 
-            context.close()
+            chrome.close_context(context)
             return True
 
         except Exception as e:
             print(f"\n❌ Error during Notion setup: {e}")
-            context.close()
+            chrome.close_context(context)
             return False
 
 
@@ -192,54 +388,86 @@ def verify_sessions():
         print("\n❌ No sessions found. Please run the setup first.")
         return False
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False, channel="chrome")
-
-        # Test Linear
-        if linear_exists:
-            print("\n📍 Testing Linear session...")
-            try:
-                context = browser.new_context(storage_state="auth/linear_session.json")
-                page = context.new_page()
-                page.goto("https://linear.app", timeout=30000)
-                page.wait_for_load_state("networkidle", timeout=10000)
+    sessions = []
+    if linear_exists:
+        sessions.append(("Linear", "https://linear.app", "auth/linear_session.json", LINEAR_READY_SELECTOR))
+    if notion_exists:
+        sessions.append(("Notion", "https://www.notion.so", "auth/notion_session.json", NOTION_READY_SELECTOR))
 
-                # Check if still logged in
-                current_url = page.url
-                if "login" in current_url.lower():
-                    print("❌ Linear session expired - please run setup again")
-                else:
-                    print("✅ Linear session works!")
+    asyncio.run(_verify_sessions_async(sessions))
+    return True
 
-                context.close()
 
-            except Exception as e:
-                print(f"❌ Linear session test failed: {e}")
+async def _verify_sessions_async(sessions):
+    """Check every saved session concurrently, one context each in a shared browser"""
+    async with async_playwright() as p:
+        # Headless is enough for a liveness probe; anything that fails there
+        # is retried headed in case the site is rejecting headless Chrome
+        results = await _run_session_checks(p, sessions, headless=True)
+        retry = [i for i, (works, _message) in enumerate(results) if not works]
+        if retry:
+            retried = await _run_session_checks(p, [sessions[i] for i in retry], headless=False)
+            for i, result in zip(retry, retried):
+                results[i] = result
 
-        # Test Notion
-        if notion_exists:
-            print("\n📍 Testing Notion session...")
-            try:
-                context = browser.new_context(storage_state="auth/notion_session.json")
-                page = context.new_page()
-                page.goto("https://www.notion.so", timeout=30000)
-                page.wait_for_load_state("networkidle", timeout=10000)
+    for (name, *_), (_works, message) in zip(sessions, results):
+        print(f"\n📍 Testing {name} session...")
+        print(message)
 
-                # Check if still logged in
-                current_url = page.url
-                if "login" in current_url.lower():
-                    print("❌ Notion session expired - please run setup again")
-                else:
-                    print("✅ Notion session works!")
 
-                context.close()
+async def _run_session_checks(p, sessions, headless: bool):
+    """Launch one Chrome and test the given sessions in parallel contexts"""
+    browser = await p.chromium.launch(
+        headless=headless,
+        channel="chrome",
+        args=list(LAUNCH_ARGS),
+        ignore_default_args=list(IGNORE_DEFAULT_ARGS),
+    )
+    try:
+        user_agent = None
+        if headless:
+            # Present the same UA the sessions were created with
+            probe = await browser.new_page()
+            user_agent = (await probe.evaluate("navigator.userAgent")).replace("HeadlessChrome", "Chrome")
+            await probe.close()
+
+        return list(await asyncio.gather(
+            *(_test_session(browser, *session, user_agent=user_agent) for session in sessions)
+        ))
+    finally:
+        await browser.close()
+
+
+async def _test_session(
+    browser,
+    name: str,
+    url: str,
+    storage_path: str,
+    ready_selector: str,
+    user_agent: Optional[str] = None,
+):
+    """Load `url` with a saved session; return (still logged in, one-line verdict)"""
+    try:
+        context = await browser.new_context(storage_state=storage_path, user_agent=user_agent)
+        page = await context.new_page()
+        await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        try:
+            await page.wait_for_selector(ready_selector, timeout=8000)
+        except AsyncPlaywrightTimeoutError:
+            pass  # Logged-out pages never render the shell; the URL check decides
 
-            except Exception as e:
-                print(f"❌ Notion session test failed: {e}")
+        # Check if still logged in
+        current_url = page.url
+        if LOGIN_URL_RE.search(current_url):
+            result = (False, f"❌ {name} session expired - please run setup again")
+        else:
+            result = (True, f"✅ {name} session works!")
 
-        browser.close()
+        await context.close()
+        return result
 
-    return True
+    except Exception as e:
+        return False, f"❌ {name} session test failed: {e}"
 
 
 def main():
@@ -269,28 +497,30 @@ def main():
             print("\n✅ Keeping existing sessions. Use --verify to test them.")
             return
 
-    # Setup Linear
-    print("\n" + "=" * 70)
-    print("STEP 1 OF 2: LINEAR")
-    print("=" * 70)
-    linear_success = setup_linear_auth()
-
-    if not linear_success:
-        print("\n❌ Linear setup failed. Please try again.")
-        sys.exit(1)
-
-    # Small pause between setups
-    input("\n✅ Linear done! Press ENTER to continue to Notion setup...")
-
-    # Setup Notion
-    print("\n" + "=" * 70)
-    print("STEP 2 OF 2: NOTION")
-    print("=" * 70)
-    notion_success = setup_notion_auth()
-
-    if not notion_success:
-        print("\n❌ Notion setup failed. Please try again.")
-        sys.exit(1)
+    # One Chrome serves both logins; Notion attaches to it over CDP
+    with SharedChrome() as chrome:
+        # Setup Linear
+        print("\n" + "=" * 70)
+        print("STEP 1 OF 2: LINEAR")
+        print("=" * 70)
+        linear_success = setup_linear_auth(chrome)
+
+        if not linear_success:
+            print("\n❌ Linear setup failed. Please try again.")
+            sys.exit(1)
+
+        # Small pause between setups
+        input("\n✅ Linear done! Press ENTER to continue to Notion setup...")
+
+        # Setup Notion
+        print("\n" + "=" * 70)
+        print("STEP 2 OF 2: NOTION")
+        print("=" * 70)
+        notion_success = setup_notion_auth(chrome)
+
+        if not notion_success:
+            print("\n❌ Notion setup failed. Please try again.")
+            sys.exit(1)
 
     # Verify both work
     print("\n" + "=" * 70)
@@ -1,13 +1,57 @@
+from enum import IntEnum
+from functools import lru_cache
 from typing import Dict, List, Optional
 from .element_finders import (
     find_status_control, find_priority_control, find_description_bbox, 
     find_project_name_bbox, find_submit_control, find_option_element, 
-    find_search_field, action_targets, extract_modal_bbox
+    find_search_field, action_targets, extract_modal_bbox, normalize_bboxes, scan_bboxes,
+    BBoxSource, NormalizedBBoxes
 )
 from .goal_checkers import normalize_text, dropdown_open, collect_bbox_text
+from .goal_setup import all_goals_completed, index_goals
+from .constants import CANCEL_RE, DECOR_CLICK_GOALS, OPTIONAL_DECOR_RE, TYPING_GOALS, cached_keyword_pattern
 
 
-def guide_status_action(action: Dict, ui_state: Dict, bboxes: List[Dict], value: str, goals: List[Dict]) -> Optional[Dict]:
+class _FrozenAction(dict):
+    """Read-only action shared across ticks; copies and pickles come back as plain dicts."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared wait action is read-only; copy it before editing")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+@lru_cache(maxsize=128)
+def _wait(reasoning: str) -> Dict:
+    """Wait action for `reasoning`, interned so repeated ticks share one dict."""
+    return _FrozenAction(action="wait", reasoning=reasoning)
+
+
+class Decision(IntEnum):
+    """Verdict of the should_* checks; ALLOW is falsy, every block is truthy."""
+    ALLOW = 0
+    BLOCK_CANCEL = 1
+    BLOCK_OPTIONAL = 2
+    BLOCK_TYPING = 3
+
+
+_WAIT_PROJECTS_NAV = _wait("Waiting for Projects navigation element")
+
+# Wait action returned for each blocking Decision
+_WAIT_FOR_DECISION = {
+    Decision.BLOCK_CANCEL: _wait("Blocked cancel/close while modal is open"),
+    Decision.BLOCK_OPTIONAL: _wait("Ignoring optional decoration controls"),
+    Decision.BLOCK_TYPING: _wait("Focus on pending sub-goal instead of typing"),
+}
+
+
+def guide_status_action(action: Dict, ui_state: Dict, bboxes: BBoxSource, value: str, goals: List[Dict]) -> Optional[Dict]:
     """Guide action for setting status/backlog value."""
     target_norm = normalize_text(value)
     if dropdown_open(ui_state):
@@ -44,13 +88,10 @@ def guide_status_action(action: Dict, ui_state: Dict, bboxes: List[Dict], value:
         }
 
     pass
-    return {
-        "action": "wait",
-        "reasoning": f"Waiting for backlog chip or options matching '{value}' to appear.",
-    }
+    return _wait(f"Waiting for backlog chip or options matching '{value}' to appear.")
 
 
-def guide_priority_action(action: Dict, ui_state: Dict, bboxes: List[Dict], value: str, goals: List[Dict]) -> Optional[Dict]:
+def guide_priority_action(action: Dict, ui_state: Dict, bboxes: BBoxSource, value: str, goals: List[Dict]) -> Optional[Dict]:
     """Guide action for setting priority value."""
     target_norm = normalize_text(value)
     if dropdown_open(ui_state):
@@ -86,13 +127,10 @@ def guide_priority_action(action: Dict, ui_state: Dict, bboxes: List[Dict], valu
         }
 
     pass
-    return {
-        "action": "wait",
-        "reasoning": f"Waiting for priority chip or options matching '{value}' to appear.",
-    }
+    return _wait(f"Waiting for priority chip or options matching '{value}' to appear.")
 
 
-def guide_description_action(action: Dict, bboxes: List[Dict], value: str, modal_bbox: Optional[Dict], goals: List[Dict], task_config: Dict) -> Optional[Dict]:
+def guide_description_action(action: Dict, bboxes: BBoxSource, value: str, modal_bbox: Optional[Dict], goals: List[Dict], task_config: Dict, goals_by_key: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
     """Guide action for filling description field."""
     def _auto_description_text() -> str:
         parameters = task_config.get("parameters", {}) or {}
@@ -104,8 +142,11 @@ def guide_description_action(action: Dict, bboxes: List[Dict], value: str, modal
         return None
     
     if action.get("action") == "type" and action_targets(action, field["index"]):
-        typed_text = (action.get("text") or "").strip().lower()
-        project_name = next((g["value"] for g in goals if g["key"] in ["project_name", "issue_name"]), "")
+        typed_text = normalize_text(action.get("text"))
+        if goals_by_key is None:
+            goals_by_key = index_goals(goals)
+        name_goal = goals_by_key.get("project_name") or goals_by_key.get("issue_name") or {}
+        project_name = name_goal.get("value") or ""
         if typed_text == project_name.lower():
             return {
                 "action": "type",
@@ -127,7 +168,7 @@ def guide_description_action(action: Dict, bboxes: List[Dict], value: str, modal
     }
 
 
-def guide_project_name_action(action: Dict, bboxes: List[Dict], value: str, modal_bbox: Optional[Dict], goals: List[Dict]) -> Optional[Dict]:
+def guide_project_name_action(action: Dict, bboxes: BBoxSource, value: str, modal_bbox: Optional[Dict], goals: List[Dict]) -> Optional[Dict]:
     """Guide action for filling project name field."""
     field = find_project_name_bbox(bboxes, modal_bbox=modal_bbox)
     if not field:
@@ -145,7 +186,7 @@ def guide_project_name_action(action: Dict, bboxes: List[Dict], value: str, moda
     }
 
 
-def guide_submit_action(action: Dict, bboxes: List[Dict], modal_bbox: Optional[Dict], goals: List[Dict]) -> Optional[Dict]:
+def guide_submit_action(action: Dict, bboxes: BBoxSource, modal_bbox: Optional[Dict], goals: List[Dict]) -> Optional[Dict]:
     """Guide action for submitting the form."""
     button = find_submit_control(bboxes, modal_bbox=modal_bbox)
     if button:
@@ -161,51 +202,52 @@ def guide_submit_action(action: Dict, bboxes: List[Dict], modal_bbox: Optional[D
     return None
 
 
-def should_block_optional_click(action: Dict, element_text: str, pending_goal: Optional[Dict]) -> bool:
+def should_block_optional_click(action: Dict, element_text: str, pending_goal: Optional[Dict]) -> Decision:
     """Check if an optional click should be blocked."""
-    OPTIONAL_CLICK_KEYWORDS = ["icon", "emoji", "avatar", "color", "image"]
-    
     if action["action"] == "click" and element_text:
-        if any(keyword in element_text for keyword in OPTIONAL_CLICK_KEYWORDS):
-            if not pending_goal or pending_goal["key"] not in ["target_date", "priority"]:
-                return True
-    return False
+        if OPTIONAL_DECOR_RE.search(element_text):
+            if not pending_goal or pending_goal["key"] not in DECOR_CLICK_GOALS:
+                return Decision.BLOCK_OPTIONAL
+    return Decision.ALLOW
 
 
-def should_block_cancel_close(action: Dict, element_text: str, ui_state: Dict) -> bool:
+def should_block_cancel_close(action: Dict, element_text: str, ui_state: Dict) -> Decision:
     """Check if cancel/close actions should be blocked while modal is open."""
     if (
         action["action"] == "click"
         and element_text
-        and any(keyword in element_text for keyword in ["cancel", "close", "discard"])
+        and CANCEL_RE.search(element_text)
         and ui_state.get("modals")
     ):
-        return True
-    return False
+        return Decision.BLOCK_CANCEL
+    return Decision.ALLOW
 
 
-def should_guide_typing(action: Dict, pending_goal: Optional[Dict]) -> bool:
+def should_guide_typing(action: Dict, pending_goal: Optional[Dict]) -> Decision:
     """Check if typing action should be guided based on pending goal."""
     if action["action"] == "type" and pending_goal:
-        if pending_goal["key"] in ["project_name", "issue_name", "filter", "description"]:
-            return False  # Allow typing for these fields
+        if pending_goal["key"] in TYPING_GOALS:
+            return Decision.ALLOW  # Allow typing for these fields
         else:
-            return True  # Block typing for other pending goals
-    return False
+            return Decision.BLOCK_TYPING  # Block typing for other pending goals
+    return Decision.ALLOW
 
 
-def adjust_action(action: Dict, ui_state: Dict, bboxes: List[Dict], pending_goal: Optional[Dict], goals: List[Dict], modal_bbox: Optional[Dict], task_config: Optional[Dict] = None) -> Dict:
-    """Adjust Gemini's action to avoid loops and optional distractions."""
+def adjust_action(action: Dict, ui_state: Dict, bboxes: List[Dict], pending_goal: Optional[Dict], goals: List[Dict], modal_bbox: Optional[Dict], task_config: Optional[Dict] = None, view: Optional[NormalizedBBoxes] = None) -> Dict:
+    """Adjust Gemini's action to avoid loops and optional distractions.
+
+    `view` is the normalized form of `bboxes` if the caller already built it;
+    every finder below then works from that one view.
+    """
     if not action:
         return action
 
-    def _all_completed() -> bool:
-        return not goals or all(goal["completed"] for goal in goals)
+    all_completed = all_goals_completed(goals)
 
     if (
         action["action"] not in ("finish", "wait")
         and not pending_goal
-        and _all_completed()
+        and all_completed
         and not ui_state.get("modals")
     ):
         return {"action": "finish", "reasoning": "All required steps completed"}
@@ -213,29 +255,16 @@ def adjust_action(action: Dict, ui_state: Dict, bboxes: List[Dict], pending_goal
     if action["action"] == "wait":
         return action
 
-    element = None
+    if view is None:
+        view = normalize_bboxes(bboxes)
     element_text = ""
     element_id = action.get("element_id")
-    if element_id is not None and element_id < len(bboxes):
-        element = bboxes[element_id]
-        if element:
-            text = element.get("text") or ""
-            aria = element.get("ariaLabel") or ""
-            element_text = f"{text} {aria}".strip().lower()
+    if element_id is not None and element_id < len(view.bboxes):
+        element_text = f"{view.text[element_id]} {view.aria[element_id]}".strip()
 
     # Handle specific pending goals
     if pending_goal and pending_goal["key"] == "open_projects":
-        project_candidate = None
-        for bbox in bboxes:
-            text_parts = []
-            if bbox.get("text"):
-                text_parts.append(bbox["text"])
-            if bbox.get("ariaLabel"):
-                text_parts.append(bbox["ariaLabel"])
-            combined = " ".join(text_parts).lower()
-            if "project" in combined:
-                project_candidate = bbox
-                break
+        project_candidate = scan_bboxes(view, project=True).project_hit
         if project_candidate:
             target_index = project_candidate["index"]
             if action["action"] != "click" or action.get("element_id") != target_index:
@@ -247,7 +276,7 @@ def adjust_action(action: Dict, ui_state: Dict, bboxes: List[Dict], pending_goal
                 }
         elif action["action"] != "click":
             pass
-            return {"action": "wait", "reasoning": "Waiting for Projects navigation element"}
+            return _WAIT_PROJECTS_NAV
 
     # Handle filter goal with modal open
     if (
@@ -255,23 +284,13 @@ def adjust_action(action: Dict, ui_state: Dict, bboxes: List[Dict], pending_goal
         and pending_goal["key"] == "filter"
         and ui_state.get("modals")
     ):
-        target_value = (pending_goal.get("value") or "").strip().lower()
-        
-        # First priority: Look for exact match of target value (e.g., "Backlog")
-        target_bbox = None
-        for bbox in bboxes:
-            combined_parts = []
-            if bbox.get("text"):
-                combined_parts.append(bbox["text"])
-            if bbox.get("ariaLabel"):
-                combined_parts.append(bbox["ariaLabel"])
-            combined = " ".join(combined_parts).strip().lower()
-            if not combined:
-                continue
-            if target_value and target_value in combined:
-                target_bbox = bbox
-                break
+        target_value = normalize_text(pending_goal.get("value"))
         
+        # First priority: Look for exact match of target value (e.g., "Backlog"),
+        # found in the same walk as the "Status" option fallback
+        scan = scan_bboxes(view, filter_target=target_value)
+        target_bbox = scan.filter_hit
+
         if target_bbox:
             # Found the target value - click it
             if action["action"] != "click" or action.get("element_id") != target_bbox["index"]:
@@ -283,15 +302,8 @@ def adjust_action(action: Dict, ui_state: Dict, bboxes: List[Dict], pending_goal
         else:
             # Target not visible yet - check if we need to click "Status" first
             # Look for Status option in the filter panel (has low index, not a column header)
-            status_option = None
-            for bbox in bboxes:
-                text = (bbox.get("text") or "").strip().lower()
-                aria = (bbox.get("ariaLabel") or "").strip().lower()
-                # Must be "Status" text, NOT "Order by Status" aria-label, and low index (in modal)
-                if text == "status" and "order" not in aria and bbox["index"] < 150:
-                    status_option = bbox
-                    break
-            
+            status_option = scan.status_option_hit
+
             if status_option:
                 # Click "Status" to reveal status options
                 if action["action"] != "click" or action.get("element_id") != status_option["index"]:
@@ -303,59 +315,61 @@ def adjust_action(action: Dict, ui_state: Dict, bboxes: List[Dict], pending_goal
             
             # Allow relevant clicks to proceed
             if action["action"] == "click" and element_text:
-                relevant_tokens = ["status", "workflow", "filter", target_value]
-                if any(token for token in relevant_tokens if token and token in element_text):
+                relevant_tokens = cached_keyword_pattern(("status", "workflow", "filter", target_value))
+                if relevant_tokens.search(element_text):
                     return action
             
             # Otherwise wait briefly
             return action
 
-    # Block cancel/close actions while modal is open
-    if should_block_cancel_close(action, element_text, ui_state):
-        pass
-        return {"action": "wait", "reasoning": "Blocked cancel/close while modal is open"}
-
-    # Guide typing actions based on pending goal
-    if should_guide_typing(action, pending_goal):
-        return {"action": "wait", "reasoning": "Focus on pending sub-goal instead of typing"}
+    # Block cancel/close actions while modal is open, and typing that
+    # isn't for the pending goal
+    decision = (
+        should_block_cancel_close(action, element_text, ui_state)
+        or should_guide_typing(action, pending_goal)
+    )
+    if decision:
+        return _WAIT_FOR_DECISION[decision]
 
     # Guide specific pending goal actions
     if pending_goal:
         goal_key = pending_goal.get("key")
         goal_value = pending_goal.get("value") or ""
         if goal_key == "project_name" or goal_key == "issue_name":
-            guided = guide_project_name_action(action, bboxes, goal_value, modal_bbox, goals)
+            guided = guide_project_name_action(action, view, goal_value, modal_bbox, goals)
             if guided:
                 return guided
         elif goal_key == "status":
-            guided = guide_status_action(action, ui_state, bboxes, goal_value, goals)
+            guided = guide_status_action(action, ui_state, view, goal_value, goals)
             if guided:
                 return guided
         elif goal_key == "priority":
-            guided = guide_priority_action(action, ui_state, bboxes, goal_value, goals)
+            guided = guide_priority_action(action, ui_state, view, goal_value, goals)
             if guided:
                 return guided
         elif goal_key == "description":
-            guided = guide_description_action(action, bboxes, goal_value, modal_bbox, goals, task_config or {})
+            guided = guide_description_action(
+                action, view, goal_value, modal_bbox, goals, task_config or {}, index_goals(goals)
+            )
             if guided:
                 return guided
         elif goal_key == "submit":
-            guided = guide_submit_action(action, bboxes, modal_bbox, goals)
+            guided = guide_submit_action(action, view, modal_bbox, goals)
             if guided:
                 return guided
 
     # Block optional decoration clicks
-    if should_block_optional_click(action, element_text, pending_goal):
-        pass
-        return {"action": "wait", "reasoning": "Ignoring optional decoration controls"}
+    decision = should_block_optional_click(action, element_text, pending_goal)
+    if decision:
+        return _WAIT_FOR_DECISION[decision]
 
     # Auto-submit if all goals complete
     if (
         not pending_goal
-        and _all_completed()
+        and all_completed
         and action["action"] != "finish"
     ):
-        control = find_submit_control(bboxes)
+        control = find_submit_control(view)
         if control:
             return {
                 "action": "click",
@@ -1,5 +1,52 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from .goal_checkers import normalize_text
+from .constants import FILTER_COMPLETION_RE, SUBMIT_CLICKED_RE
+from .goal_setup import get_pending_goal, set_goal_completed
+
+
+def _clicked_filter(target: str, element_text: str) -> bool:
+    target = target.rstrip("s")
+    return bool(target) and target in element_text and bool(FILTER_COMPLETION_RE.search(element_text))
+
+
+def _clicked_projects(target: str, element_text: str) -> bool:
+    return "project" in element_text
+
+
+def _clicked_option(target: str, element_text: str) -> bool:
+    return bool(target) and target in element_text and "order" not in element_text
+
+
+def _clicked_submit(target: str, element_text: str) -> bool:
+    return bool(SUBMIT_CLICKED_RE.search(element_text))
+
+
+def _typed_name(target: str, typed_norm: str) -> bool:
+    return bool(target) and target == typed_norm
+
+
+def _typed_value(target: str, typed_norm: str) -> bool:
+    return bool(target) and target in typed_norm
+
+
+def _typed_description(target: str, typed_norm: str) -> bool:
+    return target in typed_norm if target else bool(typed_norm)
+
+
+# Goal key -> completion check of (normalized goal value, clicked element text / typed text)
+_CLICK_CHECKERS: Dict[str, Callable[[str, str], bool]] = {
+    "filter": _clicked_filter,
+    "open_projects": _clicked_projects,
+    "status": _clicked_option,
+    "priority": _clicked_option,
+    "submit": _clicked_submit,
+}
+_TYPE_CHECKERS: Dict[str, Callable[[str, str], bool]] = {
+    "project_name": _typed_name,
+    "issue_name": _typed_name,
+    "priority": _typed_value,
+    "description": _typed_description,
+}
 
 
 def record_action(action: Dict, goals: List[Dict]) -> Optional[Dict]:
@@ -9,60 +56,27 @@ def record_action(action: Dict, goals: List[Dict]) -> Optional[Dict]:
     action_type = action.get("action")
 
     if action_type == "click":
-        element_text = (action.get("element_text") or "").lower()
-        if not element_text:
-            return None
-        for goal in goals:
-            if goal["completed"]:
-                continue
-            if goal["key"] == "filter" and goal.get("value"):
-                target = goal["value"].lower().rstrip("s")
-                if target and target in element_text:
-                    if any(keyword in element_text for keyword in ["filter", "status", "workflow", "showing", "chip", "project"]):
-                        goal["completed"] = True
-            if goal["key"] == "open_projects" and "project" in element_text:
-                goal["completed"] = True
-            if goal["key"] == "status":
-                target = normalize_text(goal.get("value"))
-                if target and target in element_text and "order" not in element_text:
-                    goal["completed"] = True
-            if goal["key"] == "priority":
-                target = normalize_text(goal.get("value"))
-                if target and target in element_text and "order" not in element_text:
-                    goal["completed"] = True
-            if goal["key"] == "submit":
-                if any(
-                    keyword in element_text
-                    for keyword in ["create project", "create", "submit", "finish", "done"]
-                ):
-                    goal["completed"] = True
-
+        checkers = _CLICK_CHECKERS
+        observed = (action.get("element_text") or "").lower()
     elif action_type == "type":
-        typed = (action.get("text") or "")
-        typed_norm = normalize_text(typed)
-        if not typed_norm:
+        checkers = _TYPE_CHECKERS
+        observed = normalize_text(action.get("text") or "")
+    else:
+        checkers = None
+        observed = ""
+
+    if checkers is not None:
+        if not observed:
             return None
-        for goal in goals:
-            if goal["completed"]:
-                continue
-            if goal["key"] == "project_name" or goal["key"] == "issue_name":
-                target = (goal.get("value") or "").strip().lower()
-                if target and target == typed_norm:
-                    goal["completed"] = True
-            if goal["key"] == "priority":
-                target = normalize_text(goal.get("value"))
-                if target and target in typed_norm:
-                    goal["completed"] = True
-            if goal["key"] == "description":
-                target = normalize_text(goal.get("value"))
-                if target:
-                    if target in typed_norm:
-                        goal["completed"] = True
-                elif typed_norm:
-                    goal["completed"] = True
+        # Normalize each pending goal's value once, ahead of the checks
+        pending = [
+            (goal, checkers[goal["key"]], normalize_text(goal.get("value")))
+            for goal in goals
+            if not goal["completed"] and goal["key"] in checkers
+        ]
+        for goal, check, target in pending:
+            if check(target, observed):
+                set_goal_completed(goals, goal)
 
     # Return pending goal (find first non-completed goal)
-    for goal in goals:
-        if not goal["completed"]:
-            return goal
-    return None
\ No newline at end of file
+    return get_pending_goal(goals)
@@ -1,7 +1,58 @@
 """
 Constants and configuration for sub-goal management.
+
+Keyword lists are compiled into matchers exposing `.search(text)` (truthy on
+a hit). Long lists use a pyahocorasick automaton when it is installed and
+a regex alternation otherwise.
 """
 
+import re
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+
+# Below this many keywords one regex alternation is as fast as an automaton
+AHOCORASICK_MIN_KEYWORDS = 5
+
+
+class _AhoCorasickMatcher:
+    """Aho-Corasick automaton with the .search() contract of a compiled pattern."""
+
+    __slots__ = ("_automaton",)
+
+    def __init__(self, keywords: Iterable[str]):
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        self._automaton = automaton
+
+    def search(self, text: str):
+        return next(self._automaton.iter(text), None)
+
+
+def keyword_pattern(keywords: Iterable[str]):
+    """Compile keywords into one matcher that hits on any as a substring."""
+    keywords = [keyword for keyword in keywords if keyword]
+    if not keywords:
+        return re.compile(r"(?!)")
+    if AHOCORASICK_AVAILABLE and len(keywords) >= AHOCORASICK_MIN_KEYWORDS:
+        return _AhoCorasickMatcher(keywords)
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+@lru_cache(maxsize=64)
+def cached_keyword_pattern(keywords: Tuple[str, ...]):
+    """keyword_pattern for per-goal lists that repeat across ticks."""
+    return keyword_pattern(keywords)
+
+
 # Month synonyms for date parsing
 MONTH_SYNONYMS = {
     "january": ["jan", "january"],
@@ -49,7 +100,22 @@ PRIORITY_TOKENS = [
 ]
 
 # ARIA label keywords for description fields
-DESCRIPTION_ARIA_KEYWORDS = ["description", "details", "summary", "notes"]
+DESCRIPTION_ARIA_KEYWORDS = ("description", "details", "summary", "notes")
+
+# ARIA label keywords and default texts of the project name field
+PROJECT_NAME_ARIA_KEYWORDS = ("project name", "name field", "title")
+PROJECT_NAME_PLACEHOLDER_SET = frozenset({"untitled", "new project"})
+
+# Exact chip texts of the status control
+STATUS_TEXT_SET = frozenset({"backlog", "todo", "planned", "in progress", "done", "canceled"})
+
+# Rank of a status/priority chip whose text is a known value; only an
+# explicit "change status/priority" aria-label outranks it
+CONTROL_MAX_SCORE = 4
+
+# Element types that accept typed text
+NAME_FIELD_TYPES = frozenset({"div", "input"})
+SEARCH_FIELD_TYPES = frozenset({"input", "textbox"})
 
 # Keywords for filter detection
 FILTER_KEYWORDS = {
@@ -64,5 +130,40 @@ FILTER_KEYWORDS = {
     "project",
 }
 
+FILTER_KEYWORDS_RE = keyword_pattern(FILTER_KEYWORDS)
+
 # Keywords for filter completion detection in clicked elements
 FILTER_COMPLETION_KEYWORDS = ["filter", "status", "workflow", "showing", "chip", "project"]
+
+FILTER_COMPLETION_RE = keyword_pattern(FILTER_COMPLETION_KEYWORDS)
+
+OPTIONAL_DECOR_RE = keyword_pattern(OPTIONAL_CLICK_KEYWORDS)
+
+# Clicks on these while a modal is open would throw away the form
+CANCEL_RE = keyword_pattern(["cancel", "close", "discard"])
+
+# Buttons that submit a create form, and look-alikes that open a new one instead
+SUBMIT_RE = keyword_pattern([
+    "create project",
+    "create new project",
+    "create",
+    "submit",
+    "finish",
+    "done",
+    "save project",
+    "confirm",
+])
+SUBMIT_EXCLUDE_RE = keyword_pattern(["create new issue", "new view"])
+
+# Clicked element texts that count as having submitted
+SUBMIT_CLICKED_RE = keyword_pattern(["create project", "create", "submit", "finish", "done"])
+
+# Column headers and sort menus that mention status/priority but are not the chip
+SORT_CONTROL_RE = keyword_pattern(["order by", "sort"])
+STATUS_CONTROL_ARIA_RE = keyword_pattern(["change project status", "change status"])
+PRIORITY_CONTROL_ARIA_RE = keyword_pattern(["change project priority", "change priority"])
+PRIORITY_TEXT_RE = keyword_pattern(["no priority", "urgent", "high", "medium", "low"])
+
+# Pending goals that still allow optional-decoration clicks, and free typing
+DECOR_CLICK_GOALS = frozenset({"target_date", "priority"})
+TYPING_GOALS = frozenset({"project_name", "issue_name", "filter", "description"})
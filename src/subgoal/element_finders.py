@@ -1,40 +1,199 @@
 import re
-from typing import Dict, List, Optional, Iterable
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from typing import Dict, List, NamedTuple, Optional, Iterable, Tuple, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from .goal_checkers import normalize_text
+from .constants import (
+    CONTROL_MAX_SCORE, DESCRIPTION_ARIA_KEYWORDS, NAME_FIELD_TYPES,
+    PRIORITY_CONTROL_ARIA_RE, PRIORITY_TEXT_RE, PROJECT_NAME_ARIA_KEYWORDS,
+    PROJECT_NAME_PLACEHOLDER_SET, SEARCH_FIELD_TYPES, SORT_CONTROL_RE,
+    STATUS_CONTROL_ARIA_RE, STATUS_TEXT_SET, SUBMIT_EXCLUDE_RE, SUBMIT_RE
+)
+
+
+# Below this many bboxes the plain loops beat building coordinate arrays / text blobs
+VECTORIZE_MIN_BBOXES = 64
+
+
+@lru_cache(maxsize=256)
+def _vocabulary_word(value: str) -> str:
+    """Lowercased, interned form of a small-vocabulary field (element type, role)."""
+    return sys.intern(value.lower())
+
+
+class BBox(NamedTuple):
+    """One bbox's matched fields, normalized; a fixed-slot row instead of a dict."""
+    text: str
+    aria: str
+    type: str
+    role: str
+    placeholder: str
+    x: Optional[float]
+    y: Optional[float]
+
+    @classmethod
+    def from_dict(cls, bbox: Dict) -> "BBox":
+        """Read and normalize the fields of an annotation bbox dict in one go."""
+        get = bbox.get
+        return cls(
+            (get("text") or "").strip().lower(),
+            (get("ariaLabel") or "").strip().lower(),
+            _vocabulary_word(get("type") or ""),
+            _vocabulary_word(get("role") or ""),
+            (get("placeholder") or "").lower(),
+            get("x"),
+            get("y"),
+        )
+
+
+@dataclass(frozen=True)
+class NormalizedBBoxes:
+    """Column view of a bbox list with every matched field lowercased once.
+
+    Text and aria label stay separate columns; keyword checks test each
+    instead of allocating a joined "text aria" string per bbox.
+    """
+    bboxes: Tuple[Dict, ...]
+    text: Tuple[str, ...]
+    aria: Tuple[str, ...]
+    type: Tuple[str, ...]
+    role: Tuple[str, ...]
+    placeholder: Tuple[str, ...]
+    x: Tuple[Optional[float], ...]
+    y: Tuple[Optional[float], ...]
+    _modal_flags: Dict[Tuple, Tuple[bool, ...]] = field(default_factory=dict, compare=False, repr=False)
+
+    def in_modal(self, modal_bbox: Optional[Dict]) -> Tuple[bool, ...]:
+        """Per-bbox "inside modal_bbox" flags (all True without a modal), memoized per modal."""
+        if not modal_bbox:
+            return (True,) * len(self.bboxes)
+        key = tuple(modal_bbox.get(edge, 0) for edge in ("x", "y", "width", "height"))
+        flags = self._modal_flags.get(key)
+        if flags is None:
+            if NUMPY_AVAILABLE and len(self.bboxes) >= VECTORIZE_MIN_BBOXES:
+                left, top = key[0], key[1]
+                xs, ys = self._points
+                inside = (xs >= left) & (xs <= left + key[2]) & (ys >= top) & (ys <= top + key[3])
+                flags = tuple(inside.tolist())
+            else:
+                flags = tuple(within_modal(bbox, modal_bbox) for bbox in self.bboxes)
+            self._modal_flags[key] = flags
+        return flags
+
+    @cached_property
+    def _text_blob(self) -> Tuple[str, List[int]]:
+        """All texts joined by NUL, plus each text's start offset in the blob."""
+        starts, offset = [], 0
+        for text in self.text:
+            starts.append(offset)
+            offset += len(text) + 1
+        return "\0".join(self.text), starts
+
+    def first_text_containing(self, needle: str) -> Optional[int]:
+        """Index of the first text containing `needle`, via one str.find over the joined blob."""
+        if not needle or "\0" in needle:
+            return next((i for i, text in enumerate(self.text) if needle in text), None)
+        blob, starts = self._text_blob
+        position = blob.find(needle)
+        if position < 0:
+            return None
+        return bisect_right(starts, position) - 1
+
+    @cached_property
+    def _points(self):
+        """(xs, ys) float64 arrays; a missing coordinate is NaN, which no rect contains."""
+        xs = np.array(self.x, dtype=np.float64)
+        ys = np.array(self.y, dtype=np.float64)
+        return xs, ys
+
+
+# Finders take the raw bbox list or a view the caller already built for this tick
+BBoxSource = Union[List[Dict], NormalizedBBoxes]
+
+
+def normalize_bboxes(bboxes: BBoxSource) -> NormalizedBBoxes:
+    """Build the normalized view of `bboxes`; an existing view is returned as is."""
+    if isinstance(bboxes, NormalizedBBoxes):
+        return bboxes
+
+    # One dict read per field per bbox, then a C-level transpose into columns
+    rows = [BBox.from_dict(bbox) for bbox in bboxes]
+    columns = tuple(zip(*rows)) if rows else ((),) * len(BBox._fields)
+    return NormalizedBBoxes(tuple(bboxes), *columns)
+
+
+def label_contains(needle: str, text: str, aria: str) -> bool:
+    """Check `needle in f"{text} {aria}".strip()`, joining only if it could span both."""
+    if needle in text or needle in aria:
+        return True
+    return bool(text and aria and " " in needle and needle in f"{text} {aria}")
+
+
+@dataclass
+class ScanResult:
+    """First hits of adjust_action's inline candidates, found in one bbox walk."""
+    project_hit: Optional[Dict] = None
+    filter_hit: Optional[Dict] = None
+    status_option_hit: Optional[Dict] = None
+
+
+def scan_bboxes(bboxes: BBoxSource, *, project: bool = False, filter_target: Optional[str] = None) -> ScanResult:
+    """
+    Walk the normalized bboxes once, filling every requested candidate.
+
+    project: first element mentioning "project" (sidebar Projects link)
+    filter_target: first element containing the target text, plus the
+        panel's "Status" option as a fallback (pass "" to only want the
+        fallback); the walk ends early once the target itself is found
+    """
+    view = normalize_bboxes(bboxes)
+    result = ScanResult()
+    want_filter = filter_target is not None
+
+    for bbox, text, aria in zip(view.bboxes, view.text, view.aria):
+        if project and result.project_hit is None and ("project" in text or "project" in aria):
+            result.project_hit = bbox
+        if want_filter:
+            if filter_target and label_contains(filter_target, text, aria):
+                result.filter_hit = bbox
+                want_filter = False
+            # "Status" in the filter panel (low index), not an "Order by Status" header
+            elif (
+                result.status_option_hit is None
+                and text == "status"
+                and "order" not in aria
+                and bbox["index"] < 150
+            ):
+                result.status_option_hit = bbox
+        if not want_filter and (not project or result.project_hit is not None):
+            break
+    return result
 
 
 def find_modal_button(
-    bboxes: List[Dict],
+    bboxes: BBoxSource,
     *,
     aria_keywords: Optional[List[str]] = None,
     text_tokens: Optional[Iterable[str]] = None,
     modal_bbox: Optional[Dict] = None,
 ) -> Optional[Dict]:
     """Find a modal button based on aria keywords or text tokens."""
-    def _normalize_text(text: str) -> str:
-        return (text or "").strip().lower()
-
-    def _within_modal(bbox: Dict, modal_bbox: Dict) -> bool:
-        if not modal_bbox:
-            return False
-        x = bbox.get("x")
-        y = bbox.get("y")
-        if x is None or y is None:
-            return False
-        left = modal_bbox.get("x", 0)
-        top = modal_bbox.get("y", 0)
-        right = left + modal_bbox.get("width", 0)
-        bottom = top + modal_bbox.get("height", 0)
-        return left <= x <= right and top <= y <= bottom
-
     aria_keywords = [kw.lower() for kw in (aria_keywords or [])]
-    normalized_tokens = [_normalize_text(token) for token in (text_tokens or []) if token]
+    normalized_tokens = [normalize_text(token) for token in (text_tokens or []) if token]
 
-    for bbox in bboxes:
-        if bbox.get("type") != "button":
-            continue
-        aria = (bbox.get("ariaLabel") or "").lower()
-        text = (bbox.get("text") or "").strip().lower()
-        if modal_bbox and not _within_modal(bbox, modal_bbox):
+    view = normalize_bboxes(bboxes)
+    for bbox, aria, text, inside in zip(view.bboxes, view.aria, view.text, view.in_modal(modal_bbox)):
+        if bbox.get("type") != "button" or not inside:
             continue
         if aria_keywords and any(keyword in aria for keyword in aria_keywords):
             return bbox
@@ -43,187 +202,138 @@ def find_modal_button(
     return None
 
 
-def find_option_element(bboxes: List[Dict], target_norm: str) -> Optional[Dict]:
+def find_option_element(bboxes: BBoxSource, target_norm: str) -> Optional[Dict]:
     """Find an option element in a dropdown that matches the target text."""
-    def _normalize_text(text: str) -> str:
-        return (text or "").strip().lower()
-
     if not target_norm:
         return None
-    for bbox in bboxes:
-        text = (bbox.get("text") or "").strip()
-        if not text:
-            continue
-        normalized = _normalize_text(text)
-        if normalized == target_norm or target_norm in normalized:
+    view = normalize_bboxes(bboxes)
+    if len(view.bboxes) >= VECTORIZE_MIN_BBOXES:
+        index = view.first_text_containing(target_norm)
+        return None if index is None else view.bboxes[index]
+    for bbox, normalized in zip(view.bboxes, view.text):
+        if normalized and target_norm in normalized:
             return bbox
     return None
 
 
-def find_description_bbox(bboxes: List[Dict], modal_bbox: Optional[Dict] = None) -> Optional[Dict]:
+def find_description_bbox(bboxes: BBoxSource, modal_bbox: Optional[Dict] = None) -> Optional[Dict]:
     """Find the description text area or input field."""
-    DESCRIPTION_ARIA_KEYWORDS = ["description", "details", "summary", "notes"]
-    
-    def _within_modal(bbox: Dict, modal_bbox: Dict) -> bool:
-        if not modal_bbox:
-            return False
-        x = bbox.get("x")
-        y = bbox.get("y")
-        if x is None or y is None:
-            return False
-        left = modal_bbox.get("x", 0)
-        top = modal_bbox.get("y", 0)
-        right = left + modal_bbox.get("width", 0)
-        bottom = top + modal_bbox.get("height", 0)
-        return left <= x <= right and top <= y <= bottom
-
-    aria_keywords = [kw.lower() for kw in DESCRIPTION_ARIA_KEYWORDS]
-    for bbox in bboxes:
-        element_type = (bbox.get("type") or "").lower()
-        role = (bbox.get("role") or "").lower()
-        aria = (bbox.get("ariaLabel") or "").lower()
-        if modal_bbox and not _within_modal(bbox, modal_bbox):
+    view = normalize_bboxes(bboxes)
+    for bbox, element_type, role, aria, inside in zip(
+        view.bboxes, view.type, view.role, view.aria, view.in_modal(modal_bbox)
+    ):
+        if not inside:
             continue
         if element_type == "textarea":
             return bbox
-        if role == "textbox" and any(keyword in aria for keyword in aria_keywords):
+        if role == "textbox" and any(keyword in aria for keyword in DESCRIPTION_ARIA_KEYWORDS):
             return bbox
-        if any(keyword in aria for keyword in aria_keywords):
+        if any(keyword in aria for keyword in DESCRIPTION_ARIA_KEYWORDS):
             return bbox
     return None
 
 
-def find_project_name_bbox(bboxes: List[Dict], modal_bbox: Optional[Dict] = None) -> Optional[Dict]:
+def find_project_name_bbox(bboxes: BBoxSource, modal_bbox: Optional[Dict] = None) -> Optional[Dict]:
     """Find the project name input field."""
-    def _within_modal(bbox: Dict, modal_bbox: Dict) -> bool:
-        if not modal_bbox:
-            return False
-        x = bbox.get("x")
-        y = bbox.get("y")
-        if x is None or y is None:
-            return False
-        left = modal_bbox.get("x", 0)
-        top = modal_bbox.get("y", 0)
-        right = left + modal_bbox.get("width", 0)
-        bottom = top + modal_bbox.get("height", 0)
-        return left <= x <= right and top <= y <= bottom
-
-    aria_keywords = ["project name", "name field", "title"]
-    for bbox in bboxes:
-        element_type = (bbox.get("type") or "").lower()
-        role = (bbox.get("role") or "").lower()
-        aria = (bbox.get("ariaLabel") or "").lower()
-        text = (bbox.get("text") or "").strip().lower()
-        if modal_bbox and not _within_modal(bbox, modal_bbox):
+    view = normalize_bboxes(bboxes)
+    for bbox, element_type, role, aria, text, inside in zip(
+        view.bboxes, view.type, view.role, view.aria, view.text, view.in_modal(modal_bbox)
+    ):
+        if not inside:
             continue
-        if role == "textbox" or element_type in {"div", "input"}:
-            if any(keyword in aria for keyword in aria_keywords):
+        if role == "textbox" or element_type in NAME_FIELD_TYPES:
+            if any(keyword in aria for keyword in PROJECT_NAME_ARIA_KEYWORDS):
                 return bbox
-            if text in {"untitled", "new project"}:
+            if text in PROJECT_NAME_PLACEHOLDER_SET:
                 return bbox
     return None
 
 
-def find_status_control(bboxes: List[Dict]) -> Optional[Dict]:
+def find_status_control(bboxes: BBoxSource) -> Optional[Dict]:
     """Find the status control element (button or chip)."""
-    candidates = []
-    
-    for bbox in bboxes:
-        aria = (bbox.get("ariaLabel") or "").lower()
-        text = (bbox.get("text") or "").strip().lower()
-        
-        if "order by" in aria or "sort" in aria:
+    best, best_score = None, 0
+
+    view = normalize_bboxes(bboxes)
+    for bbox, aria, text in zip(view.bboxes, view.aria, view.text):
+        if SORT_CONTROL_RE.search(aria):
             continue
         
         # Check aria-label first (most reliable)
-        if "change project status" in aria or "change status" in aria:
+        if STATUS_CONTROL_ARIA_RE.search(aria):
             return bbox
-        if "status" in aria and "order by" not in aria:
-            candidates.append((bbox, 3))
+        # Nothing but a later aria-label hit can beat a top-ranked chip
+        if best_score == CONTROL_MAX_SCORE:
+            continue
+        score = 3 if "status" in aria else 0
         
         # Check text (works for any element type)
         if len(text) < 100 and text:
-            if text in {"backlog", "todo", "planned", "in progress", "done", "canceled"}:
-                candidates.append((bbox, 4))
-            if text in {"backlog", "todo", "planned", "in progress"}:
-                candidates.append((bbox, 2))
-            if "status" in text and len(text) < 30:
-                candidates.append((bbox, 1))
-    
-    if candidates:
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        return candidates[0][0]
-    return None
+            if text in STATUS_TEXT_SET:
+                score = CONTROL_MAX_SCORE
+            elif "status" in text and len(text) < 30:
+                score = max(score, 1)
+
+        # Strict > keeps the first of equally ranked candidates
+        if score > best_score:
+            best, best_score = bbox, score
+
+    return best
 
 
-def find_priority_control(bboxes: List[Dict]) -> Optional[Dict]:
+def find_priority_control(bboxes: BBoxSource) -> Optional[Dict]:
     """Find the priority control element (button or chip)."""
-    candidates = []
-    for bbox in bboxes:
-        aria = (bbox.get("ariaLabel") or "").lower()
-        text = (bbox.get("text") or "").strip().lower()
-        
-        if "order by" in aria or "sort" in aria:
+    best, best_score = None, 0
+
+    view = normalize_bboxes(bboxes)
+    for bbox, aria, text in zip(view.bboxes, view.aria, view.text):
+        if SORT_CONTROL_RE.search(aria):
             continue
         
         # Check aria-label first
-        if "change project priority" in aria or "change priority" in aria:
+        if PRIORITY_CONTROL_ARIA_RE.search(aria):
             return bbox
-        if "priority" in aria and "order by" not in aria:
-            candidates.append((bbox, 3))
+        if best_score == CONTROL_MAX_SCORE:
+            continue
+        score = 3 if "priority" in aria else 0
         
         # Check text (works for any element type)
         if len(text) < 100 and text:
-            if any(keyword in text for keyword in {"no priority", "urgent", "high", "medium", "low"}):
-                candidates.append((bbox, 4))
-            if text in {"no priority", "urgent", "high", "medium", "low"}:
-                candidates.append((bbox, 2))
-            if "priority" in text and len(text) < 30:
-                candidates.append((bbox, 1))
-    
-    if candidates:
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        return candidates[0][0]
-    return None
+            if PRIORITY_TEXT_RE.search(text):
+                score = CONTROL_MAX_SCORE
+            elif "priority" in text and len(text) < 30:
+                score = max(score, 1)
+
+        if score > best_score:
+            best, best_score = bbox, score
+
+    return best
 
 
-def find_submit_control(bboxes: List[Dict], modal_bbox: Optional[Dict] = None) -> Optional[Dict]:
+def find_submit_control(bboxes: BBoxSource, modal_bbox: Optional[Dict] = None) -> Optional[Dict]:
     """Find the submit/create button."""
-    submit_keywords = [
-        "create project",
-        "create new project",
-        "create",
-        "submit",
-        "finish",
-        "done",
-        "save project",
-        "confirm",
-    ]
-    for bbox in bboxes:
-        element_type = (bbox.get("type") or "").lower()
-        role = (bbox.get("role") or "").lower()
-        if element_type not in {"button"} and role != "button":
+    view = normalize_bboxes(bboxes)
+    for bbox, element_type, role, text, aria in zip(view.bboxes, view.type, view.role, view.text, view.aria):
+        if element_type != "button" and role != "button":
             continue
-        text = (bbox.get("text") or "").strip().lower()
-        aria = (bbox.get("ariaLabel") or "").strip().lower()
-        combined = f"{text} {aria}".strip()
-        if any(keyword in combined for keyword in submit_keywords):
-            if "create new issue" in combined or "new view" in combined:
-                continue
-            return bbox
+        # Keywords like "save project" can span text and aria, as in the joined label
+        if (
+            SUBMIT_RE.search(text)
+            or SUBMIT_RE.search(aria)
+            or (text and aria and SUBMIT_RE.search(f"{text} {aria}"))
+        ):
+            if not SUBMIT_EXCLUDE_RE.search(f"{text} {aria}"):
+                return bbox
     return None
 
 
-def find_search_field(bboxes: List[Dict], placeholder_keywords: Iterable[str]) -> Optional[Dict]:
+def find_search_field(bboxes: BBoxSource, placeholder_keywords: Iterable[str]) -> Optional[Dict]:
     """Find a dropdown search field based on placeholder keywords."""
     keywords = [kw.lower() for kw in placeholder_keywords]
-    for bbox in bboxes:
-        element_type = (bbox.get("type") or "").lower()
-        role = (bbox.get("role") or "").lower()
-        aria = (bbox.get("ariaLabel") or "").lower()
-        placeholder = (bbox.get("placeholder") or "").lower()
-
-        if element_type in {"input", "textbox"} or role == "textbox":
+    view = normalize_bboxes(bboxes)
+    for bbox, element_type, role, aria, placeholder in zip(
+        view.bboxes, view.type, view.role, view.aria, view.placeholder
+    ):
+        if element_type in SEARCH_FIELD_TYPES or role == "textbox":
             if any(keyword in aria for keyword in keywords) or any(
                 keyword in placeholder for keyword in keywords
             ):
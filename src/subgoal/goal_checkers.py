@@ -1,7 +1,22 @@
 import re
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+from .constants import DESCRIPTION_ARIA_KEYWORDS, FILTER_KEYWORDS_RE
 
 
+# Distinct goal values / form and bbox texts kept normalized across ticks
+NORMALIZE_CACHE_SIZE = 4096
+SEARCH_NORMALIZE_CACHE_SIZE = 8192
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+# ASCII fast path of _NON_ALNUM_RE: delete every ASCII char outside [a-z0-9]
+_ASCII_NON_ALNUM_TABLE = str.maketrans("", "", "".join(
+    chr(code) for code in range(128) if not ("a" <= chr(code) <= "z" or "0" <= chr(code) <= "9")
+))
+# Applied to lowercased text, so date tokens are always bare alphanumerics
+_DATE_SPLIT_RE = re.compile(r"[^0-9a-z]+")
+_ORDINAL_SUFFIXES = frozenset({"st", "nd", "rd", "th"})
+
 # Month synonyms for date checking
 MONTH_SYNONYMS = {
     "january": ["jan", "january"],
@@ -17,16 +32,37 @@ MONTH_SYNONYMS = {
     "november": ["nov", "november"],
     "december": ["dec", "december"],
 }
+# Any month spelling -> every accepted spelling of that month
+_MONTH_VARIANTS = {
+    variant: frozenset(variants)
+    for variants in MONTH_SYNONYMS.values()
+    for variant in variants
+}
 
 
 def normalize_text(text: str) -> str:
     """Normalize text by trimming and converting to lowercase."""
-    return (text or "").strip().lower()
+    return _normalize_text_cached(text or "")
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_text_cached(text: str) -> str:
+    """Memoized normalize; goal values repeat every tick, so keep this pure"""
+    return text.strip().lower()
 
 
 def normalize_for_search(text: str) -> str:
     """Normalize text for search by removing non-alphanumeric characters."""
-    return re.sub(r"[^a-z0-9]", "", (text or "").lower())
+    return _normalize_for_search_cached(text or "")
+
+
+@lru_cache(maxsize=SEARCH_NORMALIZE_CACHE_SIZE)
+def _normalize_for_search_cached(text: str) -> str:
+    """Memoized search normalize; the same UI strings come back every update"""
+    lowered = text.lower()
+    if lowered.isascii():
+        return lowered.translate(_ASCII_NON_ALNUM_TABLE)
+    return _NON_ALNUM_RE.sub("", lowered)
 
 
 def is_value_in_forms(value: str, forms: List[Dict]) -> bool:
@@ -52,31 +88,36 @@ def control_matches(control: Optional[Dict], value: Optional[str]) -> bool:
 
 def is_status_selected(value: str, texts: List[str]) -> bool:
     """Check if a status value is selected/visible in the UI texts."""
-    target_norm = normalize_for_search(value)
+    return is_status_selected_norm(
+        normalize_for_search(value), [normalize_for_search(text) for text in texts]
+    )
+
+
+def is_status_selected_norm(target_norm: str, texts_norm: Sequence[str]) -> bool:
+    """is_status_selected over an already normalize_for_search'd target and texts."""
     if not target_norm:
         return False
-    for text in texts:
-        if target_norm in normalize_for_search(text):
-            return True
-    return False
+    return any(target_norm in norm_text for norm_text in texts_norm)
 
 
 def is_priority_selected(value: str, texts: List[str]) -> bool:
     """Check if a priority value is selected/visible in the UI texts."""
-    target_norm = normalize_for_search(value)
+    return is_priority_selected_norm(
+        normalize_for_search(value), [normalize_for_search(text) for text in texts]
+    )
+
+
+def is_priority_selected_norm(target_norm: str, texts_norm: Sequence[str]) -> bool:
+    """is_priority_selected over an already normalize_for_search'd target and texts."""
     if not target_norm:
         return False
-    for text in texts:
-        norm_text = normalize_for_search(text)
-        if "priority" in norm_text and target_norm in norm_text:
-            return True
-    return False
+    return any(
+        "priority" in norm_text and target_norm in norm_text for norm_text in texts_norm
+    )
 
 
 def is_description_filled(value: Optional[str], forms: List[Dict]) -> bool:
     """Check if the description field is filled with the target value."""
-    DESCRIPTION_ARIA_KEYWORDS = ["description", "details", "summary", "notes"]
-    
     target_norm = normalize_text(value)
     for field in forms:
         field_type = (field.get("type") or "").lower()
@@ -91,51 +132,61 @@ def is_description_filled(value: Optional[str], forms: List[Dict]) -> bool:
     return False
 
 
+def _date_token(token: str) -> str:
+    if token[-2:] in _ORDINAL_SUFFIXES and token[:-2].isdigit():
+        token = token[:-2]
+    return (token.lstrip("0") or "0") if token.isdigit() else token
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def date_tokens(text: str) -> FrozenSet[str]:
+    """Whole date tokens of a UI text, lowercased, numbers without leading zeros."""
+    return frozenset(_date_token(tok) for tok in _DATE_SPLIT_RE.split(text.lower()) if tok)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _date_token_sets(value: str) -> Tuple[FrozenSet[str], ...]:
+    """Accepted spellings for each token of a date value."""
+    token_sets = []
+    for tok in _DATE_SPLIT_RE.split(value.lower()):
+        if tok:
+            token = _date_token(tok)
+            token_sets.append(_MONTH_VARIANTS.get(token) or frozenset((token,)))
+    return tuple(token_sets)
+
+
 def is_date_visible(value: str, texts: List[str]) -> bool:
     """Check if a date value is visible in the UI texts."""
-    def _date_token_sets(value: str) -> List[List[str]]:
-        raw_tokens = [tok for tok in re.split(r"[\s,/-]+", value.lower()) if tok]
-        token_sets: List[List[str]] = []
-        for token in raw_tokens:
-            if token.isdigit():
-                trimmed = token.lstrip("0") or "0"
-                token_sets.append([trimmed, token])
-            else:
-                matched = False
-                for variants in MONTH_SYNONYMS.values():
-                    if token in variants:
-                        token_sets.append(variants)
-                        matched = True
-                        break
-                if not matched:
-                    token_sets.append([token])
-        return token_sets
-    
+    return is_date_visible_tokens(value, [date_tokens(text) for text in texts])
+
+
+def is_date_visible_tokens(value: str, texts_tokens: Sequence[FrozenSet[str]]) -> bool:
+    """is_date_visible over UI texts already split by date_tokens."""
     token_sets = _date_token_sets(value)
     if not token_sets:
         return False
-    for text in texts:
-        lower = text.lower()
-        if all(any(token_variant in lower for token_variant in options) for options in token_sets):
-            return True
-    return False
+    return any(
+        all(not variants.isdisjoint(tokens) for variants in token_sets)
+        for tokens in texts_tokens
+    )
 
 
 def is_filter_applied(value: str, texts: List[str]) -> bool:
     """Check if a filter is applied based on UI text content."""
-    target_norm = normalize_for_search(value)
-    targets = {target_norm}
-    if target_norm.endswith("s"):
-        targets.add(target_norm[:-1])
-    keywords = {"filter", "filters", "filtered", "showing", "statusis", "status:", "workflow", "state:", "project"}
-    for text in texts:
-        norm_text = normalize_for_search(text)
-        if any(token in norm_text for token in targets):
-            if any(key in norm_text for key in keywords):
-                return True
-            if f"statusis{target_norm}" in norm_text:
-                return True
-    return False
+    return is_filter_applied_norm(
+        normalize_for_search(value), [normalize_for_search(text) for text in texts]
+    )
+
+
+def is_filter_applied_norm(target_norm: str, texts_norm: Sequence[str]) -> bool:
+    """is_filter_applied over an already normalize_for_search'd target and texts."""
+    # A plural target also matches its singular, which is a prefix of it
+    stem = target_norm[:-1] if target_norm.endswith("s") else target_norm
+    # "statusis<target>" is already covered by the "statusis" keyword
+    return any(
+        stem in norm_text and FILTER_KEYWORDS_RE.search(norm_text)
+        for norm_text in texts_norm
+    )
 
 
 def collect_bbox_text(bboxes: List[Dict]) -> List[str]:
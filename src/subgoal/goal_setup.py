@@ -1,7 +1,81 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 
-def setup_goals(task_config: Dict) -> List[Dict]:
+class GoalList(list):
+    """
+    Ordered goal dicts plus a bitmask of the ones still pending.
+
+    Bit i of pending_mask is set while goal i is incomplete, so "all done"
+    and "first pending" are integer operations. The list is fixed once
+    setup_goals builds it; completion changes go through set_completed.
+    """
+
+    def __init__(self, goals: Iterable[Dict] = ()):
+        super().__init__(goals)
+        self._positions = {id(goal): index for index, goal in enumerate(self)}
+        self.pending_mask = 0
+        for index, goal in enumerate(self):
+            if not goal["completed"]:
+                self.pending_mask |= 1 << index
+        self.by_key = _first_goal_per_key(self)
+
+    @property
+    def pending(self) -> int:
+        """Number of goals still pending."""
+        return bin(self.pending_mask).count("1")
+
+    def set_completed(self, goal: Dict, completed: bool = True) -> None:
+        """Flip a goal's completion flag, keeping the pending mask in step."""
+        completed = bool(completed)
+        bit = 1 << self._positions[id(goal)]
+        if completed:
+            self.pending_mask &= ~bit
+        else:
+            self.pending_mask |= bit
+        goal["completed"] = completed
+
+    def first_pending(self) -> Optional[Dict]:
+        """The earliest incomplete goal, from the mask's lowest set bit."""
+        mask = self.pending_mask
+        if not mask:
+            return None
+        return self[(mask & -mask).bit_length() - 1]
+
+    def pending_before(self, index: int) -> bool:
+        """Whether any goal ahead of position `index` is still pending."""
+        return bool(self.pending_mask & ((1 << index) - 1))
+
+
+def _first_goal_per_key(goals: Iterable[Dict]) -> Dict[str, Dict]:
+    by_key: Dict[str, Dict] = {}
+    for goal in goals:
+        by_key.setdefault(goal["key"], goal)
+    return by_key
+
+
+def index_goals(goals: List[Dict]) -> Dict[str, Dict]:
+    """Map each goal key to its first goal; precomputed on a GoalList."""
+    if isinstance(goals, GoalList):
+        return goals.by_key
+    return _first_goal_per_key(goals)
+
+
+def set_goal_completed(goals: List[Dict], goal: Dict, completed: bool = True) -> None:
+    """Set a goal's completion flag on a GoalList or a plain goal list."""
+    if isinstance(goals, GoalList):
+        goals.set_completed(goal, completed)
+    else:
+        goal["completed"] = completed
+
+
+def all_goals_completed(goals: List[Dict]) -> bool:
+    """Check whether no goal is pending; O(1) for a GoalList."""
+    if isinstance(goals, GoalList):
+        return goals.pending_mask == 0
+    return all(goal["completed"] for goal in goals)
+
+
+def setup_goals(task_config: Dict) -> GoalList:
     """Extract and setup ordered sub-goals from a task configuration."""
     goals = []
     params = task_config.get("parameters", {}) or {}
@@ -92,11 +166,13 @@ def setup_goals(task_config: Dict) -> List[Dict]:
     if goals:
         goals.append({"key": "submit", "value": None, "completed": False})
 
-    return goals
+    return GoalList(goals)
 
 
 def get_pending_goal(goals: List[Dict]) -> Optional[Dict]:
     """Find the first incomplete goal."""
+    if isinstance(goals, GoalList):
+        return goals.first_pending()
     for goal in goals:
         if not goal["completed"]:
             return goal
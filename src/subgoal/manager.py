@@ -1,12 +1,14 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 from .element_finders import (
     find_status_control, find_priority_control, find_submit_control,
-    extract_modal_bbox
+    extract_modal_bbox, normalize_bboxes, NormalizedBBoxes
 )
 from .goal_checkers import (
     is_value_in_forms, control_matches, is_status_selected, 
     is_priority_selected, is_description_filled, is_date_visible,
-    is_filter_applied, collect_bbox_text, normalize_text
+    is_date_visible_tokens, date_tokens,
+    is_filter_applied, is_filter_applied_norm, collect_bbox_text,
+    normalize_for_search, normalize_text
 )
 from .action_guides import (
     guide_status_action, guide_priority_action, guide_description_action,
@@ -14,7 +16,33 @@ from .action_guides import (
     should_block_cancel_close, should_guide_typing, adjust_action
 )
 from .action_recorder import record_action
-from .goal_setup import setup_goals
+from .goal_setup import GoalList, all_goals_completed, set_goal_completed, setup_goals
+
+
+
+class _UpdateContext(NamedTuple):
+    """Page facts gathered once per update and shared by every goal check"""
+    forms: List[Dict]
+    texts: List[str]
+    texts_norm: Tuple[str, ...]
+    texts_tokens: Tuple[FrozenSet[str], ...]
+    url: str
+    status_control: Optional[Dict]
+    priority_control: Optional[Dict]
+
+
+# Goal key -> completion check of (goal value, update context); "submit"
+# depends on the goals ahead of it and is handled in update itself
+_GOAL_CHECKS: Dict[str, Callable[[Optional[str], _UpdateContext], bool]] = {
+    "open_projects": lambda value, ctx: "/project" in ctx.url,
+    "project_name": lambda value, ctx: is_value_in_forms(value, ctx.forms),
+    "issue_name": lambda value, ctx: is_value_in_forms(value, ctx.forms),
+    "status": lambda value, ctx: control_matches(ctx.status_control, value),
+    "priority": lambda value, ctx: control_matches(ctx.priority_control, value),
+    "target_date": lambda value, ctx: is_date_visible_tokens(value, ctx.texts_tokens),
+    "filter": lambda value, ctx: is_filter_applied_norm(normalize_for_search(value), ctx.texts_norm),
+    "description": lambda value, ctx: is_description_filled(value, ctx.forms),
+}
 
 
 class SubGoalManager:
@@ -48,60 +76,57 @@ class SubGoalManager:
 
     def __init__(self, task_config: Dict):
         self.task_config = task_config
-        self.goals: List[Dict] = []
+        self.goals: GoalList = GoalList()
         self.pending_goal: Optional[Dict] = None
         self._loading_finish_blocks = 0
         self._modal_bbox: Optional[Dict] = None
+        # Bbox list seen by the last update and its normalized view, reused by
+        # adjust_action on the same tick
+        self._bboxes: Optional[List[Dict]] = None
+        self._bbox_view: Optional[NormalizedBBoxes] = None
         self.goals = setup_goals(task_config)
         print(f"[SubGoalManager] Initialized goals: {self.goals}")
 
     def update(self, ui_state: Dict, bboxes: List[Dict]):
         """Update completion status for each sub-goal based on the current UI."""
+        self._bboxes, self._bbox_view = None, None
         if not self.goals:
             self.pending_goal = None
             return
 
-        forms = ui_state.get("forms", []) or []
-        texts = collect_bbox_text(bboxes)
-
-        url = ui_state.get("url") or ""
+        view = normalize_bboxes(bboxes)
+        self._bboxes, self._bbox_view = bboxes, view
         self._modal_bbox = extract_modal_bbox(ui_state)
-
-        status_control = find_status_control(bboxes)
-        priority_control = find_priority_control(bboxes)
+        texts = collect_bbox_text(bboxes)
+        ctx = _UpdateContext(
+            forms=ui_state.get("forms", []) or [],
+            texts=texts,
+            # Normalized once here; the text-scanning checks then do plain substring tests
+            texts_norm=tuple(normalize_for_search(text) for text in texts),
+            texts_tokens=tuple(date_tokens(text) for text in texts),
+            url=ui_state.get("url") or "",
+            status_control=find_status_control(view),
+            priority_control=find_priority_control(view),
+        )
 
         for index, goal in enumerate(self.goals):
             if goal["completed"]:
                 continue
 
             key = goal["key"]
-            value = goal.get("value")
-
-            if key == "open_projects":
-                goal["completed"] = "/project" in url
-            elif key == "project_name" or key == "issue_name":
-                goal["completed"] = is_value_in_forms(value, forms)
-            elif key == "status":
-                goal["completed"] = control_matches(status_control, value)
-            elif key == "priority":
-                goal["completed"] = control_matches(priority_control, value)
-            elif key == "target_date":
-                goal["completed"] = is_date_visible(value, texts)
-            elif key == "filter":
-                goal["completed"] = is_filter_applied(value, texts)
-            elif key == "description":
-                goal["completed"] = is_description_filled(value, forms)
-            elif key == "submit":
-                prior_complete = all(g["completed"] for g in self.goals[:index])
-                if prior_complete and ui_state.get("modals"):
-                    goal["completed"] = False
-                elif prior_complete and not ui_state.get("modals"):
-                    goal["completed"] = True
+            if key == "submit":
+                prior_complete = not self.goals.pending_before(index)
+                completed = prior_complete and not ui_state.get("modals")
+            else:
+                check = _GOAL_CHECKS.get(key)
+                completed = check(goal.get("value"), ctx) if check else False
+
+            set_goal_completed(self.goals, goal, completed)
 
         self.pending_goal = self._get_pending_goal()
 
     def all_completed(self) -> bool:
-        return not self.goals or all(goal["completed"] for goal in self.goals)
+        return all_goals_completed(self.goals)
 
     def build_hint(self, submit_hint: Optional[Dict], ui_state: Dict) -> Optional[Dict]:
         """Build a combined guidance hint for Gemini."""
@@ -157,7 +182,11 @@ class SubGoalManager:
 
     def adjust_action(self, action: Dict, ui_state: Dict, bboxes: List[Dict]) -> Dict:
         """Adjust Gemini's action to avoid loops and optional distractions."""
-        return adjust_action(action, ui_state, bboxes, self.pending_goal, self.goals, self._modal_bbox, self.task_config)
+        # Reuse update's view only for the very list it was built from
+        view = self._bbox_view if bboxes is self._bboxes else None
+        return adjust_action(
+            action, ui_state, bboxes, self.pending_goal, self.goals, self._modal_bbox, self.task_config, view
+        )
 
     def record_action(self, action: Dict):
         """Infers goal completion from the most recent action (post-execution)."""
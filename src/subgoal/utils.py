@@ -2,18 +2,10 @@
 Utility functions for sub-goal management.
 """
 
-import re
 from typing import Dict, List, Optional
 
-
-def normalize_text(text: str) -> str:
-    """Normalize text to lowercase and strip whitespace."""
-    return (text or "").strip().lower()
-
-
-def normalize_for_search(text: str) -> str:
-    """Normalize text for search by removing non-alphanumeric characters."""
-    return re.sub(r"[^a-z0-9]", "", (text or "").lower())
+# Memoized implementations shared with the goal checkers
+from .goal_checkers import normalize_for_search, normalize_text
 
 
 def collect_bbox_text(bboxes: List[Dict]) -> List[str]:
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test GeminiClient's shortcuts on an unchanged page
+
+Drives get_next_action with a fake model over the same screenshot and
+elements and checks that repeated states still go back to Gemini.
+
+Usage:
+    python -m pytest test_gemini_client.py
+"""
+
+import sys
+import types
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+SCREENSHOT = "iVBORw0KGgo="
+BBOXES = [
+    {"index": 0, "type": "button", "role": "", "text": "New project", "ariaLabel": ""},
+    {"index": 1, "type": "a", "role": "", "text": "Issues", "ariaLabel": ""},
+]
+
+
+class FakeModel:
+    """Stands in for GenerativeModel, always answering with one action line"""
+
+    def __init__(self, answer: str):
+        self.answer = answer
+        self.calls = 0
+
+    def generate_content(self, contents, stream=False):
+        self.calls += 1
+        return [types.SimpleNamespace(text=f"Reasoning.\nACTION: {self.answer}\n")]
+
+
+def make_client(monkeypatch, answer: str):
+    """Build a GeminiClient whose SDK is replaced by FakeModel"""
+    model = FakeModel(answer)
+    fake_genai = types.ModuleType("google.generativeai")
+    fake_genai.configure = lambda **kwargs: None
+    fake_genai.GenerativeModel = lambda name: model
+    fake_google = types.ModuleType("google")
+    fake_google.generativeai = fake_genai
+    monkeypatch.setitem(sys.modules, "google", fake_google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", fake_genai)
+
+    from gemini.client import GeminiClient
+    return GeminiClient(api_key="test-key"), model
+
+
+def run_steps(client, steps: int):
+    """Ask for `steps` actions on an unchanged page, recording each in history"""
+    history = []
+    actions = []
+    for step in range(steps):
+        action = client.get_next_action("Open issues", SCREENSHOT, BBOXES, "https://linear.app/team", history)
+        actions.append(action)
+        history.append({"step": step, "action": action["action"], "observation": "Nothing changed"})
+    return actions
+
+
+def test_repeated_click_is_requeried(monkeypatch):
+    """A replayed click and a forced wait are followed by a fresh Gemini call"""
+    client, model = make_client(monkeypatch, "click [1]")
+    actions = run_steps(client, 9)
+
+    # Gemini, replay, forced wait - then Gemini again
+    assert model.calls == 3
+    assert [a["action"] for a in actions[:4]] == ["click", "click", "wait", "click"]
+    assert "cached" not in actions[3]
+
+
+def test_repeated_wait_is_requeried(monkeypatch):
+    """A skipped repeat of Gemini's wait is followed by a fresh Gemini call"""
+    client, model = make_client(monkeypatch, "wait")
+    actions = run_steps(client, 9)
+
+    assert all(a["action"] == "wait" for a in actions)
+    # Skipped and answered waits alternate; once the history tail repeats,
+    # the response cache may stand in for a call
+    assert model.calls >= 4
+    reasons = [a.get("reasoning") for a in actions]
+    assert all(r != "Page unchanged since the previous wait" for r in reasons[::2])